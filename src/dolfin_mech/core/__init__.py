@@ -1,14 +1,27 @@
 """Core elements of module `dolfin_mech`."""
 
+from .arclengthsolver import ArcLengthSolver
+from .assembler import Assembler
+from .asyncwriter import AsyncWriter
+from .checkpoint import read_checkpoint, write_checkpoint
+from .compactxdmffile import CompactXDMFFile
 from .compute_error import compute_error
 from .constraint import Constraint
 from .expression_meshfunction_cpp import get_ExprMeshFunction_cpp_pybind
 from .foi import FOI
+from .foibatch import FOIBatch
 from .mesh2ugrid import add_function_to_ugrid, add_functions_to_ugrid, mesh2ugrid
+from .meshgeometry import get_boundary_area, get_mesh_geometry, get_volume
+from .multiprocessingcontext import get_multiprocessing_context
 from .nonlinearsolver import NonlinearSolver
+from .outputschedule import OutputSchedule
+from .periodicdofmap import PeriodicDofMap
+from .precompile import precompile
 from .qoi import QOI
+from .solverstatistics import SolverStatistics
 from .step import Step
 from .subdomain_periodic import PeriodicSubDomain
+from .subdomain_periodic_cpp import get_PeriodicSubDomain, get_PeriodicSubDomain_cpp_pybind
 from .subdomain_pinpoint import PinpointSubDomain
 from .subsol import SubSol
 from .timeintegrator import TimeIntegrator
@@ -34,4 +47,21 @@ __all__ = [
 	"PeriodicSubDomain",
 	"PinpointSubDomain",
 	"SubSol",
+	"Assembler",
+	"precompile",
+	"FOIBatch",
+	"OutputSchedule",
+	"AsyncWriter",
+	"CompactXDMFFile",
+	"read_checkpoint",
+	"write_checkpoint",
+	"ArcLengthSolver",
+	"SolverStatistics",
+	"get_PeriodicSubDomain",
+	"get_PeriodicSubDomain_cpp_pybind",
+	"PeriodicDofMap",
+	"get_mesh_geometry",
+	"get_volume",
+	"get_boundary_area",
+	"get_multiprocessing_context",
 ]
@@ -0,0 +1,316 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Defines the ArcLengthSolver class.
+
+Load-path continuation, where the load factor of the step is an additional
+unknown, controlled by an arc-length constraint (Riks/Crisfield method).
+"""
+
+import time
+
+import dolfin
+import numpy
+
+from .compute_error import compute_error
+from .nonlinearsolver import NonlinearSolver
+
+################################################################################
+
+
+class ArcLengthSolver(NonlinearSolver):
+	r"""Nonlinear solver with arc-length control of the load factor.
+
+	The load factor :math:`\lambda` is the normalized time of the step,
+	:math:`\lambda = (t - t_{ini}) / (t_{fin} - t_{ini})`, which is applied to the
+	operators of the step through ``operator.set_value_at_t_step``. Instead of
+	prescribing :math:`\lambda`, each increment solves for the solution *and* the
+	load factor, under the constraint
+
+	.. math::
+	    \frac{\Delta\mathbf{u} \cdot \Delta\mathbf{u}}{u_{ref}^2} + \psi^2 \Delta\lambda^2 = \Delta l^2,
+
+	where :math:`u_{ref}` is the norm of the tangent solution per unit load factor at
+	the beginning of the step, so that the arc-length :math:`\Delta l` is expressed in
+	load factor units (in the linear regime and with :math:`\psi = 0`, :math:`\Delta\lambda = \Delta l`).
+	:math:`\psi = 0` (default) gives the cylindrical method of Crisfield, :math:`\psi = 1` the spherical one.
+
+	At each iteration, the tangent system :math:`\mathbf{K}` is assembled and factorized once,
+	and solved for both :math:`\delta\mathbf{u}_R = -\mathbf{K}^{-1} \mathbf{R}` and
+	:math:`\delta\mathbf{u}_t = \mathbf{K}^{-1} \mathbf{q}`, with :math:`\mathbf{q} = -\partial_\lambda \mathbf{R}`
+	the load vector, computed by finite difference of the residual (exactly if the loads enter the residual linearly).
+	The load factor correction :math:`\delta\lambda` is the root of the quadratic arc-length constraint
+	giving the smallest change of direction; if there is no real root, the solve fails, and the
+	time integrator cuts the arc-length. The sign of the predictor follows the previous increment,
+	so that the path can go through limit points (snap-through, buckling).
+
+	Only the operators of the step are controlled by the load factor: the constraints of the step
+	must be constant (val_ini = val_fin). It is used through the ``continuation`` parameter of
+	:py:class:`dolfin_mech.TimeIntegrator`, for quasi-static problems.
+
+	:param problem: The mechanical problem instance.
+	:type problem: dolfin_mech.problem.Problem
+	:param parameters: Solver parameters, cf. :py:class:`dolfin_mech.NonlinearSolver`, plus
+	    'arc_length_psi' (the load factor weight in the arc-length constraint, defaults to 0.)
+	    and 'arc_length_load_perturbation' (the load factor perturbation used to compute the
+	    load vector, defaults to 1e-3).
+	:type parameters: dict
+	:param print_out: Output destination, cf. :py:class:`dolfin_mech.NonlinearSolver`.
+	:type print_out: bool or str, optional
+	"""
+
+	def __init__(self, problem, parameters, print_out=True):
+		"""Initializes the ArcLengthSolver."""
+		NonlinearSolver.__init__(self, problem=problem, parameters=parameters, print_out=print_out)
+
+		self.psi = parameters.get("arc_length_psi", 0.0)
+		self.load_perturbation = parameters.get("arc_length_load_perturbation", 1e-3)
+
+		self.reset_arc_length()
+
+	def reset_arc_length(self):
+		"""Resets the path history, at the beginning of a step."""
+		self.u_ref = None
+		self.dsol_old_vec = None
+		self.dt_step_old = None
+
+	def set_load(self, operators, t_step):
+		"""Applies a load factor to the operators of the step."""
+		for operator in operators:
+			operator.set_value_at_t_step(t_step)
+
+	def assemble_arc_length_system(self):
+		"""Assembles the Jacobian matrix and residual vector, with homogeneous constraints.
+
+		:return: False if the residual is not finite.
+		:rtype: bool
+		"""
+		self.update_jac = True
+		self.printer.print_str("Assembly…", newline=False)
+		timer = time.time()
+		self.get_assembler().assemble_system(self.jac_mat, self.res_vec)
+		timer = time.time() - timer
+		self.iter_timers["assembly"] += timer
+		self.printer.print_str(" " + str(timer) + " s", tab=False)
+
+		if (self.linear_solver_type == "petsc") and (self.reuse_symbolic_factorization):
+			self.freeze_jac_mat_pattern()
+
+		if (self.linear_solver_type == "krylov") and (self.linear_solver_near_nullspace):
+			self.set_near_nullspace()
+
+		if not (numpy.isfinite(self.res_vec).all()):
+			self.printer.print_str("Warning! Residual is NaN!")
+			return False
+
+		self.res_norm = self.res_vec.norm("l2")
+		self.printer.print_sci("res_norm", self.res_norm)
+
+		if self.k_iter == 1:
+			self.res_norm0 = self.res_norm
+		elif self.k_iter > 1:
+			self.res_err = compute_error(val=self.res_norm, ref=self.res_norm0)
+			self.printer.print_sci("res_err", self.res_err)
+		return True
+
+	def assemble_load_vector(self, operators, t_step):
+		r"""Assembles the load vector :math:`\mathbf{q} = -\partial_\lambda \mathbf{R}`, by finite difference.
+
+		``res_vec`` must contain the (negated) residual at ``t_step``.
+		"""
+		if not hasattr(self, "load_vec"):
+			self.load_vec = self.res_vec.copy()
+		self.set_load(operators, t_step + self.load_perturbation)
+		self.assemble_residual(self.load_vec)
+		self.set_load(operators, t_step)
+		self.load_vec.axpy(-1.0, self.res_vec)
+		self.load_vec *= 1.0 / self.load_perturbation
+
+	def solve_linear_system(self, x_vec, b_vec, reuse_matrix=False):
+		"""Solves the tangent system for a given right-hand side, with the current factorization.
+
+		With a periodic dof map, the system is solved on the periodic space, cf.
+		:py:meth:`dolfin_mech.PeriodicDofMap.solve`.
+
+		:param reuse_matrix: If True, the tangent system was already solved since its assembly.
+		:return: True if the linear solve was successful.
+		:rtype: bool
+		"""
+		try:
+			self.printer.print_str("Solve…", newline=False)
+			timer = time.time()
+			if self.problem.periodic_dof_map is not None:
+				if not (reuse_matrix):
+					self.constraints_dofs = numpy.array(
+						[dof for constraint in self.constraints for dof in constraint.bc.get_boundary_values().keys()],
+						dtype=int,
+					)
+				self.problem.periodic_dof_map.solve(
+					self.jac_mat, x_vec, b_vec, bc_dofs=self.constraints_dofs, reuse_matrix=reuse_matrix
+				)
+			else:
+				self.linear_solver.solve(x_vec, b_vec)
+			timer = time.time() - timer
+			self.iter_timers["solve"] += timer
+			self.printer.print_str(" " + str(timer) + " s", tab=False)
+		except Exception:
+			self.printer.print_str("Warning! Linear solver failed!", tab=False)
+			return False
+
+		if not (numpy.isfinite(x_vec).all()):
+			self.printer.print_str("Warning! Solution increment is NaN!")
+			return False
+		return True
+
+	def add_increment(self, dsol_vec, dt_step):
+		"""Adds an increment to the solution, and updates the step increment."""
+		self.problem.dsol_func.vector()[:] = dsol_vec[:]
+		if len(self.problem.subsols) > 1:
+			dolfin.assign(self.problem.get_subsols_dfunc_lst(), self.problem.dsol_func)
+		self.relax = 1.0
+		self.update_sol()
+		self.dsol_vec.axpy(1.0, dsol_vec)
+		self.dt_step += dt_step
+
+	def solve_arc_length(self, k_step, k_t, operators, t_step, dl):
+		"""Executes the arc-length controlled solve of an increment, from a converged state.
+
+		:param k_step: Current load step index.
+		:param k_t: Current time step index.
+		:param operators: The operators controlled by the load factor.
+		:param t_step: Load factor (normalized time) of the converged state.
+		:param dl: The arc-length, in load factor units.
+		:return: (success, k_iter, t_step), t_step being the load factor reached by the increment.
+		:rtype: tuple(bool, int, float)
+		"""
+		self.invalidate_jac()
+
+		# the (incremental) values of the constraints are imposed once, and then homogeneous
+		self.impose_constraints_increment()
+
+		if not hasattr(self, "dsol_vec"):
+			self.dsol_vec = self.problem.sol_func.vector().copy()
+			self.dsol_t_vec = self.problem.sol_func.vector().copy()
+			self.dsol_R_vec = self.problem.sol_func.vector().copy()
+			self.dsol_iter_vec = self.problem.sol_func.vector().copy()
+		self.dsol_vec[:] = self.problem.sol_func.vector()[:] - self.problem.sol_old_func.vector()[:]
+		self.dt_step = 0.0
+
+		self.k_iter = 0
+		self.success = False
+		self.printer.inc()
+
+		# predictor
+		self.printer.print_str("Predictor…")
+		self.reset_iter_timers()
+		self.set_load(operators, t_step)
+		if not (self.assemble_arc_length_system()):
+			return self.exit_arc_length(t_step)
+		self.assemble_load_vector(operators, t_step)
+		if not (self.solve_linear_system(self.dsol_t_vec, self.load_vec)):
+			return self.exit_arc_length(t_step)
+
+		if self.u_ref is None:
+			self.u_ref = self.dsol_t_vec.norm("l2")
+			if self.u_ref == 0.0:
+				self.printer.print_str("Warning! Load vector is null!")
+				return self.exit_arc_length(t_step)
+		dsol_t_norm = self.dsol_t_vec.norm("l2") / self.u_ref
+		sign = 1.0
+		if self.dsol_old_vec is not None:
+			if (self.dsol_old_vec.inner(self.dsol_t_vec) / self.u_ref**2 + self.psi**2 * self.dt_step_old) < 0.0:
+				sign = -1.0
+		dt_step = sign * dl / (dsol_t_norm**2 + self.psi**2) ** 0.5
+		self.printer.print_sci("dt_step", dt_step)
+		self.dsol_iter_vec[:] = dt_step * self.dsol_t_vec[:]
+		self.add_increment(self.dsol_iter_vec, dt_step)
+
+		# corrector
+		while True:
+			self.k_iter += 1
+			self.printer.print_var("k_iter", self.k_iter, -1)
+			if self.k_iter > 1:
+				self.reset_iter_timers()
+
+			self.set_load(operators, t_step + self.dt_step)
+			if not (self.assemble_arc_length_system()):
+				self.record_iteration(k_step, k_t, None, None, complete=False)
+				break
+			self.assemble_load_vector(operators, t_step + self.dt_step)
+			if not (self.solve_linear_system(self.dsol_R_vec, self.res_vec)):
+				self.record_iteration(k_step, k_t, None, None, complete=False)
+				break
+			if not (self.solve_linear_system(self.dsol_t_vec, self.load_vec, reuse_matrix=True)):
+				self.record_iteration(k_step, k_t, None, None, complete=False)
+				break
+
+			# arc-length constraint
+			self.dsol_iter_vec[:] = self.dsol_vec[:] + self.dsol_R_vec[:]
+			a1 = self.dsol_t_vec.inner(self.dsol_t_vec) / self.u_ref**2 + self.psi**2
+			a2 = 2 * (self.dsol_iter_vec.inner(self.dsol_t_vec) / self.u_ref**2 + self.psi**2 * self.dt_step)
+			a3 = self.dsol_iter_vec.inner(self.dsol_iter_vec) / self.u_ref**2 + self.psi**2 * self.dt_step**2 - dl**2
+			delta = a2**2 - 4 * a1 * a3
+			if delta < 0.0:
+				self.printer.print_str("Warning! Arc-length constraint has no real root!")
+				self.record_iteration(k_step, k_t, None, None, complete=False)
+				break
+			ddt_step_lst = [(-a2 - delta**0.5) / (2 * a1), (-a2 + delta**0.5) / (2 * a1)]
+			cos_lst = [
+				(
+					(self.dsol_iter_vec.inner(self.dsol_vec) + ddt_step * self.dsol_t_vec.inner(self.dsol_vec))
+					/ self.u_ref**2
+					+ self.psi**2 * (self.dt_step + ddt_step) * self.dt_step
+				)
+				for ddt_step in ddt_step_lst
+			]
+			ddt_step = ddt_step_lst[numpy.argmax(cos_lst)]
+			self.printer.print_sci("ddt_step", ddt_step)
+
+			# solution update
+			self.dsol_iter_vec[:] = self.dsol_R_vec[:] + ddt_step * self.dsol_t_vec[:]
+			self.add_increment(self.dsol_iter_vec, ddt_step)
+			self.printer.print_sci("t_step", t_step + self.dt_step)
+			self.compute_dsol_norm()
+			self.compute_sol_norm()
+
+			# error
+			self.compute_sol_err()
+
+			# exit test
+			self.exit_test()
+
+			self.record_iteration(k_step, k_t, None, None)
+
+			if self.success:
+				self.printer.print_str("Arc-length solver converged…")
+				break
+
+			if self.k_iter == self.n_iter_max:
+				self.printer.print_str("Warning! Arc-length solver failed to converge!")
+				break
+
+		return self.exit_arc_length(t_step)
+
+	def exit_arc_length(self, t_step):
+		"""Ends an arc-length solve, and stores the converged increment for the next predictor."""
+		self.printer.dec()
+
+		# The Jacobian was assembled at load factors unknown to the load-controlled solve
+		self.invalidate_jac()
+
+		if self.success:
+			if self.dsol_old_vec is None:
+				self.dsol_old_vec = self.dsol_vec.copy()
+			else:
+				self.dsol_old_vec[:] = self.dsol_vec[:]
+			self.dt_step_old = self.dt_step
+			return self.success, self.k_iter, t_step + self.dt_step
+		else:
+			return self.success, self.k_iter, t_step
@@ -0,0 +1,140 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Defines the Assembler class.
+
+Provides a persistent assembly engine for the nonlinear solver, built once
+per step around compiled forms and a ``dolfin.SystemAssembler``.
+"""
+
+import dolfin
+
+################################################################################
+
+
+class Assembler:
+	r"""Persistent assembler of the linearized system :math:`\mathbf{K} \delta \mathbf{u} = -\mathbf{R}`.
+
+	The residual and Jacobian forms of the problem are compiled once, and wrapped,
+	together with the Dirichlet boundary conditions, into a ``dolfin.SystemAssembler``,
+	which applies the boundary conditions symmetrically, cell by cell. Assembling into
+	already initialized tensors reuses their sparsity pattern and layout, so that only
+	the values are recomputed at each Newton iteration.
+
+	Vertex-based integrals, which cannot be handled by the system assembler
+	(cf. :py:meth:`dolfin_mech.Problem.set_variational_formulation`), are
+	assembled separately and added to the tensors.
+
+	The assembler must be rebuilt whenever the variational formulation or the list
+	of constraints changes, which :py:meth:`is_outdated` detects.
+
+	:param problem: The mechanical problem instance.
+	:type problem: dolfin_mech.problem.Problem
+	:param constraints: The constraints to apply.
+	:type constraints: list of dolfin_mech.Constraint
+	"""
+
+	def __init__(self, problem, constraints):
+		"""Initializes the Assembler."""
+		self.problem = problem
+		self.constraints = list(constraints)
+		self.bcs = [constraint.bc for constraint in self.constraints]
+
+		self.res_form = self.problem.res_form
+		self.jac_form = self.problem.jac_form
+
+		self.system_assembler = dolfin.SystemAssembler(
+			self.compile_form(self.jac_form), self.compile_form(-self.res_form), self.bcs
+		)
+
+		self.vertex_res_forms = []
+		self.vertex_jac_forms = []
+		for operator in self.problem.operators:
+			if operator.measure.integral_type() == "vertex":
+				self.vertex_res_forms += [self.compile_form(-operator.res_form)]
+				self.vertex_jac_forms += [
+					self.compile_form(
+						dolfin.derivative(operator.res_form, self.problem.sol_func, self.problem.dsol_tria)
+					)
+				]
+
+		# MG20190513: However, vertex integrals only work if solution only has dofs on vertices…
+		self.system_assembler.finalize_tensor = len(self.vertex_res_forms) == 0
+
+		self.energy_form = None
+
+	def compile_form(self, form):
+		"""Compiles a UFL form with the problem form compiler parameters.
+
+		:param form: The UFL form.
+		:return: The compiled form.
+		:rtype: dolfin.Form
+		"""
+		return dolfin.Form(form, form_compiler_parameters=self.problem.form_compiler_parameters)
+
+	def is_outdated(self, constraints):
+		"""Checks whether the variational formulation or the constraints changed since the assembler was built.
+
+		:param constraints: The constraints currently used by the solver.
+		:type constraints: list of dolfin_mech.Constraint
+		:rtype: bool
+		"""
+		return (
+			(self.res_form is not self.problem.res_form)
+			or (self.jac_form is not self.problem.jac_form)
+			or (len(constraints) != len(self.constraints))
+			or any(
+				[
+					constraint is not self_constraint
+					for constraint, self_constraint in zip(constraints, self.constraints)
+				]
+			)
+		)
+
+	def add_vertex_forms(self, forms, tensor):
+		"""Adds the vertex-based integrals to an assembled tensor."""
+		for form in forms:
+			dolfin.assemble(form, tensor=tensor, add_values=True, finalize_tensor=True)
+
+	def assemble_system(self, jac_mat, res_vec):
+		"""Assembles the Jacobian matrix and the residual vector, with constraints applied.
+
+		:param jac_mat: The Jacobian matrix to assemble into.
+		:param res_vec: The residual vector to assemble into.
+		"""
+		self.system_assembler.assemble(jac_mat, res_vec)
+		self.add_vertex_forms(self.vertex_res_forms, res_vec)
+		self.add_vertex_forms(self.vertex_jac_forms, jac_mat)
+
+	def assemble_residual(self, res_vec):
+		"""Assembles the residual vector only, with constraints applied.
+
+		:param res_vec: The residual vector to assemble into.
+		"""
+		self.system_assembler.assemble(res_vec)
+		self.add_vertex_forms(self.vertex_res_forms, res_vec)
+
+	def assemble_jacobian(self, jac_mat):
+		"""Assembles the Jacobian matrix only, with constraints applied.
+
+		:param jac_mat: The Jacobian matrix to assemble into.
+		"""
+		self.system_assembler.assemble(jac_mat)
+		self.add_vertex_forms(self.vertex_jac_forms, jac_mat)
+
+	def assemble_energy(self):
+		"""Assembles the potential energy ``problem.Pi_expr``, compiled on first call.
+
+		:return: The potential energy.
+		:rtype: float
+		"""
+		if self.energy_form is None:
+			self.energy_form = self.compile_form(self.problem.Pi_expr)
+		return dolfin.assemble(self.energy_form)
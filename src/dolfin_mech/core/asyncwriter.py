@@ -0,0 +1,158 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Defines the AsyncWriter class.
+
+Moves XDMF and VTU writing out of the time loop: solution snapshots are
+gathered as numpy arrays (or VTK grids), and written to disk by a background worker.
+"""
+
+import queue
+import threading
+
+import dolfin
+import myVTKPythonLibrary as myvtk
+
+from .compactxdmffile import CompactXDMFFile
+from .write_vtu_file import get_VTU_filename, get_VTU_ugrid, write_VTU_file
+from .xdmffile import XDMFFile
+
+################################################################################
+
+
+class AsyncWriter:
+	"""Background writer for XDMF and VTU outputs.
+
+	It has the same interface as :py:class:`dolfin_mech.XDMFFile`, plus
+	:py:meth:`write_vtu`. Each call gathers the values to write in the calling
+	thread, as numpy arrays or VTK grids owning their data (so that snapshots are
+	consistent, even though the solver keeps modifying the functions), and sends
+	them to a worker, which only writes them to disk. dolfin is not thread safe, so
+	the worker never calls it; hence, only the outputs that can be written without
+	dolfin are written in the background: the XDMF file if compact (cf.
+	:py:class:`dolfin_mech.CompactXDMFFile`, written through h5py), and the VTU files
+	with preserved connectivity (written through VTK). The others (dolfin XDMF & VTU
+	writers) are written immediately.
+
+	Modes:
+
+	- ``"thread"`` (default): the worker is a thread, which overlaps with the parts
+	  of the computation releasing the GIL (file I/O, PETSc solves); errors raised
+	  by the worker are reported at the next call;
+	- ``"sync"``: no worker, the outputs are written immediately.
+
+	There is no process-based worker: forking a process with MPI & PETSc initialized
+	is unsafe, cf. :py:func:`dolfin_mech.get_multiprocessing_context`. In parallel,
+	the mode is always ``"sync"``.
+
+	:param filename: Path to the XDMF file, or None to only write VTU files.
+	:type filename: str or None
+	:param functions: Functions to write to the XDMF file.
+	:type functions: list of dolfin.Function
+	:param mode: ``"thread"`` or ``"sync"``.
+	:type mode: str
+	:param max_queue_size: Maximum number of pending snapshots; writing blocks beyond.
+	:type max_queue_size: int
+	:param compact: If True (or a dict of its parameters), writes a :py:class:`dolfin_mech.CompactXDMFFile`.
+	:type compact: bool or dict
+	"""
+
+	def __init__(self, filename, functions, mode="thread", max_queue_size=4, compact=False):
+		"""Initializes the AsyncWriter, and starts its worker."""
+		assert mode in ("thread", "sync"), "mode (=" + str(mode) + ") should be thread or sync. Aborting."
+		if dolfin.MPI.size(dolfin.MPI.comm_world) > 1:
+			mode = "sync"
+		self.mode = mode
+
+		self.filename = filename
+		self.compact = compact
+		self.xdmf_file = self.get_xdmf_file(functions) if self.filename else None
+
+		if self.mode == "sync":
+			return
+
+		self.queue = queue.Queue(maxsize=max_queue_size)
+		self.worker = threading.Thread(target=self.run, daemon=True)
+		self.worker_error = None
+		self.worker.start()
+
+	def get_xdmf_file(self, functions):
+		"""Opens the XDMF file, compact or not."""
+		if self.compact:
+			return CompactXDMFFile(
+				filename=self.filename, functions=functions, **(self.compact if (type(self.compact) is dict) else {})
+			)
+		else:
+			return XDMFFile(filename=self.filename, functions=functions)
+
+	def run(self):
+		"""Worker loop: writes snapshots until the None sentinel is received; it does not call dolfin."""
+		try:
+			while True:
+				task = self.queue.get()
+				if task is None:
+					break
+				if task[0] == "xdmf":
+					_, time, values = task
+					self.xdmf_file.write_values(time, values)
+				elif task[0] == "vtu":
+					_, ugrid, filename = task
+					myvtk.writeUGrid(ugrid=ugrid, filename=filename)
+		except Exception as error:
+			self.worker_error = error
+			# Unblocks the producer, which then reports the error
+			while not (self.queue.empty()):
+				self.queue.get_nowait()
+
+	def check_worker(self):
+		"""Checks that the worker did not fail, and reports its error otherwise."""
+		assert self.worker_error is None, "AsyncWriter worker failed (" + repr(self.worker_error) + "). Aborting."
+
+	def write(self, time=0):
+		"""Snapshots the functions, and writes them to the XDMF file, in the background if compact.
+
+		:param time: The current simulation time.
+		:type time: float
+		"""
+		if (self.mode == "sync") or not (self.compact):
+			self.xdmf_file.write(time)
+			return
+
+		self.check_worker()
+		self.queue.put(("xdmf", float(time), self.xdmf_file.get_values()))
+
+	def write_vtu(self, filebasename, function=None, time=None, zfill=3, preserve_connectivity=False, functions=None):
+		"""Snapshots some functions, and writes them to a VTU file, in the background if ``preserve_connectivity``.
+
+		Parameters are those of :py:func:`dolfin_mech.write_VTU_file`.
+		"""
+		if (self.mode == "sync") or not (preserve_connectivity):
+			write_VTU_file(
+				filebasename=filebasename,
+				function=function,
+				time=time,
+				zfill=zfill,
+				preserve_connectivity=preserve_connectivity,
+				functions=functions,
+			)
+			return
+
+		self.check_worker()
+		self.queue.put(("vtu", get_VTU_ugrid(functions or [function]), get_VTU_filename(filebasename, time, zfill)))
+
+	def close(self):
+		"""Waits for all pending snapshots to be written, stops the worker, and closes the XDMF file."""
+		if self.mode == "thread":
+			self.queue.put(None)
+			self.worker.join()
+			self.check_worker()
+
+		if self.xdmf_file is not None:
+			self.xdmf_file.close()
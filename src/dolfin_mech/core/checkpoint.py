@@ -0,0 +1,154 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Checkpointing of the state of a time integration, to restart it after an interruption."""
+
+import os
+
+import dolfin
+import numpy
+
+from .timevaryingconstant import TimeVaryingConstant
+
+################################################################################
+
+
+def get_checkpoint_objects(problem):
+	"""Collects the objects whose state must be checkpointed, besides the solution.
+
+	These are the time-varying constants of the constraints & operators (of the
+	problem and of all steps), and the functions held by the inelastic behaviors
+	with internal variables. Objects are identified by their position in the
+	problem, so that the problem must be rebuilt identically before restarting.
+
+	:param problem: The problem.
+	:type problem: dolfin_mech.problem.Problem
+	:return: (tvcs, funcs), lists of (name, TimeVaryingConstant) & (name, dolfin.Function) tuples.
+	:rtype: tuple
+	"""
+	containers = []
+	containers += [
+		("constraint" + str(k_constraint), constraint) for k_constraint, constraint in enumerate(problem.constraints)
+	]
+	for k_step, step in enumerate(problem.steps):
+		containers += [
+			("step" + str(k_step) + "-constraint" + str(k_constraint), constraint)
+			for k_constraint, constraint in enumerate(step.constraints)
+		]
+		containers += [
+			("step" + str(k_step) + "-operator" + str(k_operator), operator)
+			for k_operator, operator in enumerate(step.operators)
+		]
+
+	tvcs = []
+	for name, container in containers:
+		for attr_name, attr in sorted(vars(container).items()):
+			if isinstance(attr, TimeVaryingConstant):
+				tvcs += [(name + "-" + attr_name, attr)]
+
+	funcs = []
+	for k_behavior, inelastic_behavior in enumerate(problem.inelastic_behaviors_internal):
+		for attr_name, attr in sorted(vars(inelastic_behavior).items()):
+			if isinstance(attr, dolfin.Function):
+				funcs += [("/internal/behavior" + str(k_behavior) + "-" + attr_name, attr)]
+
+	return tvcs, funcs
+
+
+def write_checkpoint(filename, problem, state, sol_history=[]):
+	"""Writes a checkpoint, atomically.
+
+	The checkpoint is first written to a temporary file, which then replaces the
+	previous checkpoint, so that an interruption while writing never corrupts it.
+
+	:param filename: Path to the HDF5 checkpoint file (e.g., "run-checkpoint.h5").
+	:type filename: str
+	:param problem: The problem.
+	:type problem: dolfin_mech.problem.Problem
+	:param state: The time integrator state, a dict of floats (e.g., k_step, k_t, t, dt).
+	:type state: dict
+	:param sol_history: The converged solutions of the time integrator (used by the predictor and
+	    the error estimate), a list of (t, local solution array) tuples.
+	:type sol_history: list
+	"""
+	comm = problem.mesh.mpi_comm()
+	tmp_filename = filename[:-3] + "-tmp.h5"
+
+	tvcs, funcs = get_checkpoint_objects(problem)
+
+	hdf5_file = dolfin.HDF5File(comm, tmp_filename, "w")
+	hdf5_file.write(problem.sol_func, "/sol")
+	hdf5_file.write(problem.sol_old_func, "/sol_old")
+	for name, func in funcs:
+		hdf5_file.write(func, name)
+	sol_history_func = dolfin.Function(problem.sol_fs)
+	for k_sol, (_, sol_local) in enumerate(sol_history):
+		sol_history_func.vector().set_local(sol_local)
+		sol_history_func.vector().apply("insert")
+		hdf5_file.write(sol_history_func, "/sol_history/sol" + str(k_sol))
+	attributes = hdf5_file.attributes("/sol")
+	for key, value in state.items():
+		attributes[key] = float(value)
+	attributes["sol_history-n"] = len(sol_history)
+	for k_sol, (t, _) in enumerate(sol_history):
+		attributes["sol_history-t" + str(k_sol)] = float(t)
+	for name, tvc in tvcs:
+		attributes[name + "-val_cur"] = numpy.array(tvc.val_cur, dtype=float)
+		attributes[name + "-val_old"] = numpy.array(tvc.val_old, dtype=float)
+		attributes[name + "-val"] = numpy.array(tvc.val.values(), dtype=float)
+	hdf5_file.close()
+
+	dolfin.MPI.barrier(comm)
+	if dolfin.MPI.rank(comm) == 0:
+		os.replace(tmp_filename, filename)
+	dolfin.MPI.barrier(comm)
+
+
+def read_checkpoint(filename, problem, state_keys):
+	"""Reads a checkpoint, and restores the state of the problem.
+
+	:param filename: Path to the HDF5 checkpoint file.
+	:type filename: str
+	:param problem: The problem, rebuilt as for the checkpointed run.
+	:type problem: dolfin_mech.problem.Problem
+	:param state_keys: Keys of the time integrator state to read.
+	:type state_keys: list of str
+	:return: The time integrator state, with the converged solutions of the time integrator, if any,
+	    as a list of (t, local solution array) tuples, under the "sol_history" key.
+	:rtype: dict
+	"""
+	assert os.path.exists(filename), "Checkpoint file (=" + filename + ") does not exist. Aborting."
+
+	tvcs, funcs = get_checkpoint_objects(problem)
+
+	hdf5_file = dolfin.HDF5File(problem.mesh.mpi_comm(), filename, "r")
+	hdf5_file.read(problem.sol_func, "/sol")
+	hdf5_file.read(problem.sol_old_func, "/sol_old")
+	for name, func in funcs:
+		hdf5_file.read(func, name)
+	attributes = hdf5_file.attributes("/sol")
+	state = {key: attributes[key] for key in state_keys}
+	state["sol_history"] = []
+	sol_history_func = dolfin.Function(problem.sol_fs)
+	for k_sol in range(int(attributes["sol_history-n"])):
+		hdf5_file.read(sol_history_func, "/sol_history/sol" + str(k_sol))
+		state["sol_history"] += [(attributes["sol_history-t" + str(k_sol)], sol_history_func.vector().get_local())]
+	for name, tvc in tvcs:
+		tvc.val_cur[:] = attributes[name + "-val_cur"]
+		tvc.val_old[:] = attributes[name + "-val_old"]
+		tvc.set_value(numpy.array(attributes[name + "-val"], dtype=float))
+	hdf5_file.close()
+
+	if len(problem.subsols) > 1:
+		dolfin.assign(problem.get_subsols_func_lst(), problem.sol_func)
+		dolfin.assign(problem.get_subsols_func_old_lst(), problem.sol_old_func)
+	problem.set_fois_outdated()
+
+	return state
@@ -0,0 +1,312 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Compact XDMF output, with the mesh written once and one HDF5 dataset per field."""
+
+import os
+
+import dolfin
+import numpy
+
+################################################################################
+
+
+class CompactXDMFFile:
+	"""Compact alternative to :py:class:`dolfin_mech.XDMFFile`.
+
+	The mesh geometry and topology are written once to an HDF5 file, and each
+	field is stored in a single chunked, extendable HDF5 dataset of shape
+	``(n_times, n_entities, n_components)``, one chunk per time. At each write,
+	only the raw values of the fields are appended. The light XDMF index
+	(referencing the mesh and hyperslabs of the field datasets) is rewritten
+	every ``index_interval`` writes and when closing, so that the file can be
+	opened in ParaView while the simulation runs without rewriting the whole
+	index at each time.
+
+	Fields are stored depending on their element:
+
+	- continuous Lagrange of degree 1: node-centered, from the dof values;
+	- discontinuous Lagrange of degree 0: cell-centered, from the dof values;
+	- other elements: node-centered, from the values interpolated at the vertices.
+
+	As for dolfin, 2D vectors and tensors are padded to 3D.
+
+	Requires h5py (``pip install dolfin_mech[compact]``), and only works in serial.
+
+	:param filename: Path to the XDMF file (e.g., "results.xdmf"); the HDF5 file has the same name with ".h5".
+	:type filename: str
+	:param functions: List of FEniCS Function objects to be saved; they must be defined on the same mesh.
+	:type functions: list
+	:param compression: HDF5 compression filter (e.g., "gzip"), or None.
+	:type compression: str, optional
+	:param compression_opts: Options of the compression filter (e.g., gzip level).
+	:param index_interval: Number of writes between two rewrites of the XDMF index (0 to only write it when closing).
+	:type index_interval: int, optional
+	"""
+
+	cell_types = {
+		"interval": ("Polyline", None),
+		"triangle": ("Triangle", None),
+		"tetrahedron": ("Tetrahedron", None),
+		"quadrilateral": ("Quadrilateral", [0, 1, 3, 2]),
+		"hexahedron": ("Hexahedron", [0, 1, 3, 2, 4, 5, 7, 6]),
+	}
+
+	# Positions of the function components in the padded 3D components
+	padding_indices = {1: [0], 2: [0, 1], 3: [0, 1, 2], 4: [0, 1, 3, 4], 9: list(range(9))}
+
+	def __init__(self, filename, functions, compression=None, compression_opts=None, index_interval=10):
+		"""Initializes the CompactXDMFFile, and writes the mesh."""
+		import h5py
+
+		self.mesh = functions[0].function_space().mesh()
+		assert dolfin.MPI.size(self.mesh.mpi_comm()) == 1, "CompactXDMFFile only works in serial. Aborting."
+		for function in functions:
+			assert function.function_space().mesh().id() == self.mesh.id(), (
+				"CompactXDMFFile functions must be defined on the same mesh. Aborting."
+			)
+
+		self.filename = filename
+		self.h5_filename = os.path.splitext(filename)[0] + ".h5"
+		self.h5_file = h5py.File(self.h5_filename, "w")
+		self.compression = compression
+		self.compression_opts = compression_opts
+		self.index_interval = index_interval
+
+		self.functions = functions
+		self.times = []
+		self.index_grids = []
+		self.index_is_outdated = False
+
+		self.write_mesh()
+
+		self.fields = []
+		for function in self.functions:
+			self.fields += [self.get_field(function)]
+			_, center, n_entities, n_components, _ = self.fields[-1]
+			self.h5_file.create_dataset(
+				"/fields/" + function.name(),
+				shape=(0, n_entities, n_components),
+				maxshape=(None, n_entities, n_components),
+				chunks=(1, n_entities, n_components),
+				dtype="float64",
+				compression=self.compression,
+				compression_opts=self.compression_opts,
+			)
+		self.h5_file.create_dataset("/times", shape=(0,), maxshape=(None,), dtype="float64")
+
+	def write_mesh(self):
+		"""Writes the mesh geometry (padded to 3D) and topology, once."""
+		cell_name = self.mesh.ufl_cell().cellname()
+		assert cell_name in self.cell_types, "Cell type (=" + cell_name + ") is not supported. Aborting."
+		self.topology_type, permutation = self.cell_types[cell_name]
+
+		coordinates = self.mesh.coordinates()
+		geometry = numpy.zeros((coordinates.shape[0], 3))
+		geometry[:, : coordinates.shape[1]] = coordinates
+		topology = self.mesh.cells()
+		if permutation is not None:
+			topology = topology[:, permutation]
+
+		self.n_vertices = geometry.shape[0]
+		self.n_cells = topology.shape[0]
+		self.n_vertices_per_cell = topology.shape[1]
+		self.h5_file.create_dataset("/mesh/geometry", data=geometry)
+		self.h5_file.create_dataset("/mesh/topology", data=topology.astype("int64"))
+
+	def get_field(self, function):
+		"""Precomputes how a function is stored.
+
+		:return: (attribute_type, center, n_entities, n_components, dofs), dofs being the
+		    (n_entities, n_function_components) array of dof indices, or None for interpolated fields.
+		:rtype: tuple
+		"""
+		fs = function.function_space()
+		fe = function.ufl_element()
+		value_shape = function.ufl_shape
+		n_function_components = max(1, int(numpy.prod(value_shape)))
+		if len(value_shape) == 0:
+			attribute_type, n_components = "Scalar", 1
+		elif len(value_shape) == 1:
+			attribute_type, n_components = "Vector", 3
+		elif len(value_shape) == 2:
+			attribute_type, n_components = "Tensor", 9
+		else:
+			assert 0, "Function " + function.name() + " has unsupported shape. Aborting."
+
+		if (fe.family() in ("Lagrange", "Q")) and (fe.degree() == 1):
+			v2d = dolfin.vertex_to_dof_map(fs)
+			dofs = v2d.reshape((self.n_vertices, n_function_components))
+			return (attribute_type, "Node", self.n_vertices, n_components, dofs)
+		elif (fe.family() in ("Discontinuous Lagrange", "DQ")) and (fe.degree() == 0):
+			dofmap = fs.dofmap()
+			dofs = numpy.array([dofmap.cell_dofs(k_cell) for k_cell in range(self.n_cells)])
+			return (attribute_type, "Cell", self.n_cells, n_components, dofs)
+		else:
+			return (attribute_type, "Node", self.n_vertices, n_components, None)
+
+	def get_field_values(self, function, field):
+		"""Returns the (n_entities, n_components) values of a function."""
+		_, _, n_entities, n_components, dofs = field
+		if dofs is not None:
+			values = function.vector().get_local()[dofs]
+		else:
+			values = function.compute_vertex_values(self.mesh).reshape((-1, n_entities)).T
+		if values.shape[1] == n_components:
+			return values
+		padded_values = numpy.zeros((n_entities, n_components))
+		padded_values[:, self.padding_indices[values.shape[1]]] = values
+		return padded_values
+
+	def write(self, time=0):
+		"""Appends the current values of all registered functions, and rewrites the XDMF index if due.
+
+		:param time: The current simulation time.
+		:type time: float
+		"""
+		self.write_values(time, self.get_values())
+
+	def get_values(self):
+		"""Returns the current values of all registered functions, as numpy arrays.
+
+		This is the only part of :py:meth:`write` calling dolfin.
+		"""
+		return [self.get_field_values(function, field) for function, field in zip(self.functions, self.fields)]
+
+	def write_values(self, time, values):
+		"""Appends some values of all registered functions, and rewrites the XDMF index if due.
+
+		This part of :py:meth:`write` does not call dolfin, so that it can run in a background thread.
+
+		:param time: The simulation time of the values.
+		:type time: float
+		:param values: The values of the functions, as returned by :py:meth:`get_values`.
+		:type values: list of numpy.ndarray
+		"""
+		k_time = len(self.times)
+		self.times += [float(time)]
+
+		self.h5_file["/times"].resize((k_time + 1,))
+		self.h5_file["/times"][k_time] = float(time)
+		for function, function_values in zip(self.functions, values):
+			dataset = self.h5_file["/fields/" + function.name()]
+			dataset.resize((k_time + 1,) + dataset.shape[1:])
+			dataset[k_time] = function_values
+		self.h5_file.flush()
+
+		self.index_grids += [self.get_index_grid(k_time, float(time))]
+		self.index_is_outdated = True
+		if (self.index_interval > 0) and ((k_time + 1) % self.index_interval == 0):
+			self.write_index()
+
+	def get_index_grid(self, k_time, time):
+		"""Returns the XDMF grid of a given time, the number of times being left as a placeholder."""
+		h5_basename = os.path.basename(self.h5_filename)
+
+		lines = []
+		lines += ['      <Grid Name="mesh" GridType="Uniform">']
+		lines += [
+			'        <Topology TopologyType="'
+			+ self.topology_type
+			+ '" NumberOfElements="'
+			+ str(self.n_cells)
+			+ '" NodesPerElement="'
+			+ str(self.n_vertices_per_cell)
+			+ '">'
+		]
+		lines += [
+			'          <DataItem Dimensions="'
+			+ str(self.n_cells)
+			+ " "
+			+ str(self.n_vertices_per_cell)
+			+ '" NumberType="Int" Precision="8" Format="HDF">'
+			+ h5_basename
+			+ ":/mesh/topology</DataItem>"
+		]
+		lines += ["        </Topology>"]
+		lines += ['        <Geometry GeometryType="XYZ">']
+		lines += [
+			'          <DataItem Dimensions="'
+			+ str(self.n_vertices)
+			+ ' 3" Format="HDF">'
+			+ h5_basename
+			+ ":/mesh/geometry</DataItem>"
+		]
+		lines += ["        </Geometry>"]
+		lines += ['        <Time Value="' + repr(time) + '"/>']
+		for function, (attribute_type, center, n_entities, n_components, _) in zip(self.functions, self.fields):
+			lines += [
+				'        <Attribute Name="'
+				+ function.name()
+				+ '" AttributeType="'
+				+ attribute_type
+				+ '" Center="'
+				+ center
+				+ '">'
+			]
+			lines += [
+				'          <DataItem ItemType="HyperSlab" Dimensions="'
+				+ str(n_entities)
+				+ " "
+				+ str(n_components)
+				+ '">'
+			]
+			lines += [
+				'            <DataItem Dimensions="3 3" Format="XML">'
+				+ str(k_time)
+				+ " 0 0 1 1 1 1 "
+				+ str(n_entities)
+				+ " "
+				+ str(n_components)
+				+ "</DataItem>"
+			]
+			lines += [
+				'            <DataItem Dimensions="N_TIMES '
+				+ str(n_entities)
+				+ " "
+				+ str(n_components)
+				+ '" Format="HDF">'
+				+ h5_basename
+				+ ":/fields/"
+				+ function.name()
+				+ "</DataItem>"
+			]
+			lines += ["          </DataItem>"]
+			lines += ["        </Attribute>"]
+		lines += ["      </Grid>"]
+		return "\n".join(lines)
+
+	def write_index(self):
+		"""Rewrites the XDMF index, atomically.
+
+		The grids of all times are cached, only the dataset dimensions change.
+		"""
+		lines = []
+		lines += ['<?xml version="1.0"?>']
+		lines += ['<Xdmf Version="3.0" xmlns:xi="http://www.w3.org/2001/XInclude">']
+		lines += ["  <Domain>"]
+		lines += ['    <Grid Name="TimeSeries" GridType="Collection" CollectionType="Temporal">']
+		lines += [
+			"\n".join(self.index_grids).replace('Dimensions="N_TIMES ', 'Dimensions="' + str(len(self.times)) + " ")
+		]
+		lines += ["    </Grid>"]
+		lines += ["  </Domain>"]
+		lines += ["</Xdmf>"]
+
+		with open(self.filename + ".tmp", "w") as file:
+			file.write("\n".join(lines) + "\n")
+		os.replace(self.filename + ".tmp", self.filename)
+		self.index_is_outdated = False
+
+	def close(self):
+		"""Writes the final XDMF index, and closes the underlying HDF5 file handle."""
+		if self.index_is_outdated:
+			self.write_index()
+		self.h5_file.close()
@@ -40,6 +40,8 @@ class FOI:
 		        field. Options are:
 
 		        * ``"local_solver"``: Efficient cell-wise projection (default).
+		        * ``"assemble"``: Direct evaluation, without any solve, for
+		          spaces with diagonal mass matrix (DG0 or Quadrature).
 		        * ``"project"``: Global L2 projection.
 		        * ``"interpolate"``: Pointwise interpolation.
 
@@ -53,7 +55,7 @@ class FOI:
 
 	def __init__(
 		self, expr=None, fs=None, func=None, name=None, form_compiler_parameters={}, update_type="local_solver"
-	):  # local_solver or project or interpolate
+	):  # local_solver or assemble or project or interpolate
 		"""Initialize the FOI and configure the update mechanism.
 
 		Args:
@@ -70,6 +72,8 @@ class FOI:
 		        field. Options are:
 
 		        * ``"local_solver"``: Efficient cell-wise projection (default).
+		        * ``"assemble"``: Direct evaluation, without any solve, for
+		          spaces with diagonal mass matrix (DG0 or Quadrature).
 		        * ``"project"``: Global L2 projection.
 		        * ``"interpolate"``: Pointwise interpolation.
 		"""
@@ -81,6 +85,8 @@ class FOI:
 				self.name = name
 				self.func.rename(self.name, self.name)
 
+			self.update_type = update_type
+
 			if update_type == "local_solver":
 				self.form_compiler_parameters = form_compiler_parameters
 
@@ -93,14 +99,30 @@ class FOI:
 				self.b_expr = dolfin.inner(self.expr, self.func_test) * dolfin.dx(
 					metadata=self.form_compiler_parameters
 				)
-				self.local_solver = dolfin.LocalSolver(self.a_expr, self.b_expr)
-				# t = time.time()
-				self.local_solver.factorize()
-				# t = time.time() - t
-				# print("LocalSolver factorization = "+str(t)+" s")
+				self.local_solver = None  # created & factorized on first update, since batched FOIs do not need it
 
 				self.update = self.update_local_solver
 
+			elif update_type == "assemble":
+				assert FOI.has_diagonal_mass(self.fs), (
+					"update_type (=" + update_type + ") requires a DG0 or Quadrature function space. Aborting."
+				)
+
+				self.form_compiler_parameters = form_compiler_parameters
+
+				self.func_test = dolfin.TestFunction(self.fs)
+				self.func_tria = dolfin.TrialFunction(self.fs)
+
+				self.a_expr = dolfin.inner(self.func_tria, self.func_test) * dolfin.dx(
+					metadata=self.form_compiler_parameters
+				)
+				self.b_expr = dolfin.inner(self.expr, self.func_test) * dolfin.dx(
+					metadata=self.form_compiler_parameters
+				)
+				self.b_form = None  # compiled & preallocated on first update, since batched FOIs do not need it
+
+				self.update = self.update_assemble
+
 			elif update_type == "project":
 				self.form_compiler_parameters = form_compiler_parameters
 
@@ -112,6 +134,7 @@ class FOI:
 		elif (expr is None) and (fs is None) and (func is not None):
 			self.func = func
 
+			self.update_type = "none"
 			self.update = self.update_none
 
 	def update_local_solver(self):
@@ -123,11 +146,53 @@ class FOI:
 		# print(self.name)
 		# print(self.form_compiler_parameters)
 
+		if self.local_solver is None:
+			self.local_solver = dolfin.LocalSolver(self.a_expr, self.b_expr)
+			# t = time.time()
+			self.local_solver.factorize()
+			# t = time.time() - t
+			# print("LocalSolver factorization = "+str(t)+" s")
+
 		# t = time.time()
 		self.local_solver.solve_local_rhs(self.func)
 		# t = time.time() - t
 		# print("LocalSolver solve = "+str(t)+" s")
 
+	@staticmethod
+	def has_diagonal_mass(fs):
+		"""Checks whether the mass matrix of a function space is diagonal.
+
+		This is the case for DG0 spaces (one dof per cell) and Quadrature spaces
+		(one dof per quadrature point), for which the L2 projection reduces to a
+		cell average or a point evaluation.
+
+		Args:
+		    fs (dolfin.FunctionSpace): The function space.
+
+		Returns:
+		    bool: True if the mass matrix is diagonal.
+		"""
+		fe = fs.ufl_element()
+		return (fe.family() == "Quadrature") or ((fe.family() == "Discontinuous Lagrange") and (fe.degree() == 0))
+
+	def update_assemble(self):
+		r"""Update the field by direct evaluation, without any solve.
+
+		Since the mass matrix :math:`M` is diagonal, the L2 projection is simply
+		:math:`b / \mathrm{diag}(M)`, where :math:`b` is the assembled right-hand side,
+		and :math:`\mathrm{diag}(M) = M \cdot 1` is assembled once.
+		"""
+		if self.b_form is None:
+			self.b_form = dolfin.Form(self.b_expr)
+			ones_func = dolfin.Function(self.fs)
+			ones_func.vector()[:] = 1.0
+			self.diag_vec = dolfin.assemble(dolfin.action(self.a_expr, ones_func))
+			self.b_vec = self.diag_vec.copy()
+
+		dolfin.assemble(self.b_form, tensor=self.b_vec)
+		self.func.vector().set_local(self.b_vec.get_local() / self.diag_vec.get_local())
+		self.func.vector().apply("insert")
+
 	def update_project(self):
 		"""Update the field using global L2 projection via ``dolfin.project``."""
 		# print(self.name)
@@ -0,0 +1,100 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Defines the FOIBatch class.
+
+Groups Fields of Interest sharing the same function space, so that they are
+all updated by a single cell-wise local solve.
+"""
+
+import dolfin
+
+################################################################################
+
+
+class FOIBatch:
+	r"""Class to update together several FOIs defined on the same function space.
+
+	The right-hand sides of all the FOIs of a batch are assembled together, on the
+	mixed space :math:`V \times \dots \times V`, whose cell-wise kernel evaluates all
+	expressions in one mesh traversal, and are split with a ``dolfin.FunctionAssigner``.
+	Since the mass matrix is the same for all FOIs, a single ``dolfin.LocalSolver``
+	defined on :math:`V` factorizes the (small) cell-wise mass matrices once, and
+	applies them to the right-hand sides of all the FOIs, so that the cost per cell
+	grows linearly with the number of FOIs. For FOIs updated by direct evaluation
+	(``update_type="assemble"``), the local solves are replaced by a division by the
+	(diagonal) mass.
+
+	:param fois: The FOIs, which must all be defined on the same mesh with the same element,
+	    and share the same update type (``"local_solver"`` or ``"assemble"``).
+	:type fois: list of dolfin_mech.FOI
+	:param form_compiler_parameters: Parameters passed to the FEniCS form compiler.
+	:type form_compiler_parameters: dict, optional
+	"""
+
+	def __init__(self, fois, form_compiler_parameters={}):
+		"""Initializes the FOIBatch."""
+		self.fois = fois
+		self.form_compiler_parameters = form_compiler_parameters
+
+		mesh = self.fois[0].fs.mesh()
+		fe = self.fois[0].fs.ufl_element()
+		self.update_type = self.fois[0].update_type
+		assert self.update_type in ("local_solver", "assemble"), (
+			"update_type (=" + str(self.update_type) + ") should be local_solver or assemble. Aborting."
+		)
+		for foi in self.fois:
+			assert foi.fs.ufl_element() == fe, "FOIs of a batch must share the same element. Aborting."
+			assert foi.update_type == self.update_type, "FOIs of a batch must share the same update type. Aborting."
+
+		self.fe = dolfin.MixedElement([fe] * len(self.fois))
+		self.fs = dolfin.FunctionSpace(mesh, self.fe)
+		self.func = dolfin.Function(self.fs)
+
+		dx = dolfin.dx(domain=mesh, metadata=self.form_compiler_parameters)
+		self.a_expr = dolfin.inner(dolfin.TrialFunction(self.fois[0].fs), dolfin.TestFunction(self.fois[0].fs)) * dx
+		self.b_expr = (
+			sum([dolfin.inner(foi.expr, func_test) for foi, func_test in zip(self.fois, dolfin.TestFunctions(self.fs))])
+			* dx
+		)
+
+		self.local_solver = None
+		self.b_form = None
+
+		self.b_funcs = [dolfin.Function(foi.fs) for foi in self.fois]
+		self.function_assigner = dolfin.FunctionAssigner([foi.fs for foi in self.fois], self.fs)
+
+	def update(self):
+		"""Updates all the FOIs of the batch.
+
+		The compiled right-hand side, and the local solver (or the mass diagonal), are created on first call.
+		"""
+		if self.b_form is None:
+			self.b_form = dolfin.Form(self.b_expr)
+			self.b_vec = self.func.vector().copy()
+			if self.update_type == "local_solver":
+				self.local_solver = dolfin.LocalSolver(self.a_expr)
+				self.local_solver.factorize()
+			elif self.update_type == "assemble":
+				ones_func = dolfin.Function(self.fois[0].fs)
+				ones_func.vector()[:] = 1.0
+				self.diag_vec = dolfin.assemble(dolfin.action(self.a_expr, ones_func))
+
+		dolfin.assemble(self.b_form, tensor=self.b_vec)
+		self.func.vector().set_local(self.b_vec.get_local())
+		self.func.vector().apply("insert")
+		self.function_assigner.assign(self.b_funcs, self.func)
+
+		for foi, b_func in zip(self.fois, self.b_funcs):
+			if self.update_type == "local_solver":
+				self.local_solver.solve_local(foi.func.vector(), b_func.vector(), foi.fs.dofmap())
+			elif self.update_type == "assemble":
+				foi.func.vector().set_local(b_func.vector().get_local() / self.diag_vec.get_local())
+				foi.func.vector().apply("insert")
@@ -14,27 +14,43 @@
 
 """Utilities for converting FEniCS objects to VTK Unstructured Grids."""
 
-import dolfin
+import weakref
+
 import numpy
 import vtk
 
 ################################################################################
 
 
-def mesh2ugrid(mesh, verbose=0):
+# Cache of the VTK points & cells of each mesh, per degree; entries are freed with their mesh
+mesh2ugrid_cache = weakref.WeakKeyDictionary()
+
+# VTK ordering of the vertices & edges of linear (first) and quadratic (second) cells, cf. dolfin/UFC local numbering:
+# triangle edges are (1,2), (0,2), (0,1); tetrahedron edges are (2,3), (1,3), (1,2), (0,3), (0,2), (0,1).
+vtk_cell_types = {2: (vtk.VTK_TRIANGLE, vtk.VTK_QUADRATIC_TRIANGLE), 3: (vtk.VTK_TETRA, vtk.VTK_QUADRATIC_TETRA)}
+vtk_quadratic_permutations = {2: [0, 1, 2, 5, 3, 4], 3: [0, 1, 2, 3, 9, 6, 8, 7, 5, 4]}
+
+
+def mesh2ugrid(mesh, degree=1, verbose=0):
 	"""Converts a FEniCS mesh to a VTK Unstructured Grid (vtkUnstructuredGrid).
 
 	This utility allows for the transition from FEniCS finite element meshes
 	to VTK objects for visualization or further processing using VTK/PyVista.
-	It supports 2D (triangles) and 3D (tetrahedrons) meshes.
+	It supports 2D (triangles) and 3D (tetrahedrons) meshes, with linear or
+	quadratic cells.
 
-	.. note::
-	    The coordinates and connectivity arrays are stored in a global scope
-	    temporarily within the function to prevent Python's garbage collector
-	    from breaking the VTK pointers.
+	Points are ordered as the mesh vertices, followed, for quadratic cells, by the
+	edge midpoints (ordered as the mesh edges), so that the connectivity is built
+	in one go from the mesh topology. The VTK points & cells are cached per mesh (the
+	points being rebuilt only if the mesh moved), so that repeated calls, e.g., when
+	writing VTU files at each time step, only create a new grid sharing them, to which
+	data can be added. The VTK arrays are deep copies, owning their data. The cache is
+	weakly keyed on the mesh object, so that it is freed together with the mesh.
 
 	:param mesh: The FEniCS mesh to convert.
 	:type mesh: dolfin.Mesh
+	:param degree: Degree of the cells, 1 (linear) or 2 (quadratic), defaults to 1.
+	:type degree: int, optional
 	:param verbose: Verbosity level for debugging prints, defaults to 0.
 	:type verbose: int, optional
 	:return: A VTK unstructured grid representation of the mesh.
@@ -48,6 +64,7 @@ def mesh2ugrid(mesh, verbose=0):
 	assert n_dim in (2, 3)
 	if verbose:
 		print("n_dim = " + str(n_dim))
+	assert degree in (1, 2), "degree (=" + str(degree) + ") should be 1 or 2. Aborting."
 
 	n_verts = mesh.num_vertices()
 	if verbose:
@@ -56,123 +73,196 @@ def mesh2ugrid(mesh, verbose=0):
 	if verbose:
 		print("n_cells = " + str(n_cells))
 
-	# Create function space
-	fe = dolfin.FiniteElement(family="CG", cell=mesh.ufl_cell(), degree=1, quad_scheme="default")
-	fs = dolfin.FunctionSpace(mesh, fe)
+	mesh_caches = mesh2ugrid_cache.setdefault(mesh, {})
+	cache = mesh_caches.get(degree)
+	if cache is None:
+		cache = {"coordinates": None}
+
+		# Store connectivity as numpy array, with a left column specifying number of nodes per cell
+		np_cells = mesh.cells()
+		if degree == 2:
+			cache["edge_vertices"] = get_edge_vertices(mesh)
+			mesh.init(n_dim, 1)
+			cell_edges = mesh.topology()(n_dim, 1)().reshape([n_cells, -1])
+			np_cells = numpy.hstack((np_cells, n_verts + cell_edges))[:, vtk_quadratic_permutations[n_dim]]
+		n_nodes_per_cell = np_cells.shape[1]
+		if verbose:
+			print("n_nodes_per_cell = " + str(n_nodes_per_cell))
+		np_connectivity = numpy.empty([n_cells, 1 + n_nodes_per_cell], dtype=numpy.int64)
+		np_connectivity[:, 0] = n_nodes_per_cell
+		np_connectivity[:, 1:] = np_cells
 
-	# Store nodes coordinates as numpy array
-	n_nodes = fs.dim()
-	assert n_nodes == n_verts, "n_nodes (" + str(n_nodes) + ") ≠ n_verts (" + str(n_verts) + "). Aborting."
-	if verbose:
-		print("n_nodes = " + str(n_nodes))
-	global np_coordinates  # MG20190621: if it disappears the vtk objects is broken
-	np_coordinates = fs.tabulate_dof_coordinates().reshape([n_nodes, n_dim])
-	if verbose:
-		print("np_coordinates = " + str(np_coordinates))
+		# Convert connectivity to VTK
+		vtk_connectivity = vtk.util.numpy_support.numpy_to_vtkIdTypeArray(np_connectivity.flatten(), deep=1)
 
-	if n_dim == 2:
-		np_coordinates = numpy.hstack((np_coordinates, numpy.zeros([n_nodes, 1])))
+		# Create cell array
+		cache["vtk_cells"] = vtk.vtkCellArray()
+		cache["vtk_cells"].SetCells(n_cells, vtk_connectivity)
 		if verbose:
-			print("np_coordinates = " + str(np_coordinates))
+			print("n_cells = " + str(cache["vtk_cells"].GetNumberOfCells()))
 
-	# Convert nodes coordinates to VTK
-	vtk_coordinates = vtk.util.numpy_support.numpy_to_vtk(num_array=np_coordinates, deep=1)
-	vtk_points = vtk.vtkPoints()
-	vtk_points.SetData(vtk_coordinates)
-	if verbose:
-		print("n_points = " + str(vtk_points.GetNumberOfPoints()))
+		mesh_caches[degree] = cache
 
-	# Store connectivity as numpy array
-	if n_dim == 2:
-		n_nodes_per_cell = 3
-	elif n_dim == 3:
-		n_nodes_per_cell = 4
-	if verbose:
-		print("n_nodes_per_cell = " + str(n_nodes_per_cell))
-	global np_connectivity  # MG20190621: if it disappears the vtk objects is broken
-	np_connectivity = numpy.empty([n_cells, 1 + n_nodes_per_cell], dtype=int)
-	for i in range(n_cells):
-		np_connectivity[i, 0] = n_nodes_per_cell
-		np_connectivity[i, 1:] = fs.dofmap().cell_dofs(i)
-	# if (verbose): print("np_connectivity = "+str(np_connectivity))
-
-	# Add left column specifying number of nodes per cell and flatten array
-	np_connectivity = np_connectivity.flatten()
-	# if (verbose): print("np_connectivity = "+str(np_connectivity))
-
-	# Convert connectivity to VTK
-	vtk_connectivity = vtk.util.numpy_support.numpy_to_vtkIdTypeArray(np_connectivity)
-
-	# Create cell array
-	vtk_cells = vtk.vtkCellArray()
-	vtk_cells.SetCells(n_cells, vtk_connectivity)
-	if verbose:
-		print("n_cells = " + str(vtk_cells.GetNumberOfCells()))
+	if (cache["coordinates"] is None) or not (numpy.array_equal(cache["coordinates"], mesh.coordinates())):
+		cache["coordinates"] = mesh.coordinates().copy()
+
+		# Store nodes coordinates as numpy array
+		np_coordinates = cache["coordinates"]
+		if degree == 2:
+			np_coordinates = numpy.vstack((np_coordinates, np_coordinates[cache["edge_vertices"]].mean(axis=1)))
+		np_coordinates = numpy.hstack((np_coordinates, numpy.zeros([np_coordinates.shape[0], 3 - n_dim])))
+		if verbose:
+			print("np_coordinates = " + str(np_coordinates))
+
+		# Convert nodes coordinates to VTK
+		vtk_coordinates = vtk.util.numpy_support.numpy_to_vtk(num_array=np_coordinates, deep=1)
+		cache["vtk_points"] = vtk.vtkPoints()
+		cache["vtk_points"].SetData(vtk_coordinates)
+		if verbose:
+			print("n_points = " + str(cache["vtk_points"].GetNumberOfPoints()))
 
 	# Create unstructured grid and set points and connectivity
-	if n_dim == 2:
-		vtk_cell_type = vtk.VTK_TRIANGLE
-	elif n_dim == 3:
-		vtk_cell_type = vtk.VTK_TETRA
 	ugrid = vtk.vtkUnstructuredGrid()
-	ugrid.SetPoints(vtk_points)
-	ugrid.SetCells(vtk_cell_type, vtk_cells)
+	ugrid.SetPoints(cache["vtk_points"])
+	ugrid.SetCells(vtk_cell_types[n_dim][degree - 1], cache["vtk_cells"])
 
 	return ugrid
 
 
+def get_edge_vertices(mesh):
+	"""Returns the (n_edges, 2) array of the vertices of the mesh edges."""
+	mesh.init(1)
+	return mesh.topology()(1, 0)().reshape([-1, 2])
+
+
+def is_ugrid_function(function):
+	"""Returns whether a function can be converted to VTK data, i.e., is CG1, CG2, DG0 or DG1.
+
+	:param function: The FEniCS function.
+	:type function: dolfin.Function
+	:rtype: bool
+	"""
+	fe = function.ufl_element()
+	if fe.family() == "Lagrange":
+		return fe.degree() in (1, 2)
+	elif fe.family() == "Discontinuous Lagrange":
+		return fe.degree() in (0, 1)
+	return False
+
+
+def get_ugrid_degree(functions):
+	"""Returns the degree of the cells needed to represent some functions without interpolation.
+
+	:param functions: List of FEniCS functions.
+	:type functions: list[dolfin.Function]
+	:return: 2 if any function is continuous Lagrange of degree 2, 1 otherwise.
+	:rtype: int
+	"""
+	degree = 1
+	for function in functions:
+		fe = function.ufl_element()
+		if fe.family() == "Lagrange":
+			assert fe.degree() <= 2, "Only CG1 & CG2 functions can be converted to VTK point data. Aborting."
+			degree = max(degree, fe.degree())
+	return degree
+
+
 ################################################################################
 
 
+def get_function_components(function, entity_dim):
+	"""Returns the local values of the entity dofs of each component of a function.
+
+	:param function: The FEniCS function.
+	:type function: dolfin.Function
+	:param entity_dim: Topological dimension of the entities (0 for vertices, 1 for edges, etc.).
+	:type entity_dim: int
+	:return: One (n_entities, n_dofs_per_entity) array per component.
+	:rtype: list of numpy.ndarray
+	"""
+	fs = function.function_space()
+	mesh = fs.mesh()
+	mesh.init(entity_dim)
+	n_entities = mesh.num_entities(entity_dim)
+	np_array = function.vector().get_local()
+	dofmaps = [fs.dofmap()] if (fs.num_sub_spaces() == 0) else [fs.sub(k).dofmap() for k in range(fs.num_sub_spaces())]
+	return [np_array[dofmap.entity_dofs(mesh, entity_dim)].reshape([n_entities, -1]) for dofmap in dofmaps]
+
+
 def add_function_to_ugrid(function, ugrid, force_3d_field=1, verbose=0):
 	"""Attaches a FEniCS Function's data to an existing VTK unstructured grid.
 
-	The function values are extracted and added as point data to the VTK grid.
-	Currently, only Lagrange (CG1) functions are supported as they map
-	directly to mesh vertices.
+	The grid must have been created by :func:`mesh2ugrid` on the mesh of the function.
+
+	- Continuous Lagrange (CG1 & CG2) functions are added as point data; CG1
+	  functions are linearly interpolated at the edge midpoints of quadratic grids,
+	  while CG2 functions require a quadratic grid.
+	- Discontinuous Lagrange (DG0 & DG1) functions are added as cell data, DG1
+	  functions being represented by their mean value over each cell.
 
 	:param function: The FEniCS function containing the data (e.g., displacement, stress).
 	:type function: dolfin.Function
 	:param ugrid: The VTK unstructured grid to which data will be added.
 	:type ugrid: vtk.vtkUnstructuredGrid
-	:param force_3d_field: If 1 and the function is 2D, appends a zero Z-component, defaults to 1.
+	:param force_3d_field: If 1 and the function is 2D, pads vectors (& tensors) to 3D, defaults to 1.
 	:type force_3d_field: int, optional
 	:param verbose: Verbosity level, defaults to 0.
 	:type verbose: int, optional
-	:raises AssertionError: If the function space is not compatible with mesh vertices (non-CG1).
+	:raises AssertionError: If the function space cannot be converted.
 	"""
 	if verbose:
 		print("add_function_to_ugrid")
-	if verbose:
-		print(ugrid.GetPoints())
 
-	# Convert function values and add as scalar data
-	n_dofs = function.function_space().dim()
-	if verbose:
-		print("n_dofs = " + str(n_dofs))
-	n_dim = function.ufl_element().value_size()
-	if verbose:
-		print("n_dim = " + str(n_dim))
-	assert n_dofs // n_dim == ugrid.GetNumberOfPoints(), "Only CG1 functions can be converted to VTK. Aborting."
-	global np_array  # MG20190621: if it disappears the vtk object is broken
-	np_array = function.vector().get_local()
+	mesh = function.function_space().mesh()
+	n_dim = mesh.topology().dim()
+	n_verts = mesh.num_vertices()
+	fe = function.ufl_element()
 	if verbose:
-		print("np_array = " + str(np_array))
-	np_array = np_array.reshape([n_dofs // n_dim, n_dim])
+		print("element = " + str(fe))
+
+	if fe.family() == "Lagrange":
+		n_points = ugrid.GetNumberOfPoints()
+		assert fe.degree() in (1, 2), "Only CG1 & CG2 functions can be converted to VTK. Aborting."
+		if fe.degree() == 2:
+			assert n_points > n_verts, "CG2 functions can only be converted to VTK on quadratic grids. Aborting."
+		vertex_components = [vertex_values[:, 0] for vertex_values in get_function_components(function, 0)]
+		if n_points == n_verts:
+			components = vertex_components
+		elif fe.degree() == 2:
+			edge_components = [edge_values[:, 0] for edge_values in get_function_components(function, 1)]
+			components = [
+				numpy.concatenate((vertex_values, edge_values))
+				for vertex_values, edge_values in zip(vertex_components, edge_components)
+			]
+		else:
+			edge_vertices = mesh2ugrid_cache.get(mesh, {}).get(2, {}).get("edge_vertices")
+			if edge_vertices is None:
+				edge_vertices = get_edge_vertices(mesh)
+			components = [
+				numpy.concatenate((vertex_values, vertex_values[edge_vertices].mean(axis=1)))
+				for vertex_values in vertex_components
+			]
+		data = ugrid.GetPointData()
+	elif fe.family() == "Discontinuous Lagrange":
+		assert fe.degree() in (0, 1), "Only DG0 & DG1 functions can be converted to VTK. Aborting."
+		components = [cell_values.mean(axis=1) for cell_values in get_function_components(function, n_dim)]
+		data = ugrid.GetCellData()
+	else:
+		assert 0, "Only CG1, CG2, DG0 & DG1 functions can be converted to VTK. Aborting."
+
+	np_array = numpy.array(components).T
 	if verbose:
 		print("np_array = " + str(np_array))
-	if (force_3d_field) and (n_dim == 2):
-		np_array = numpy.hstack((np_array, numpy.zeros([n_dofs // n_dim, 1])))
+	if (force_3d_field) and (np_array.shape[1] in (2, 4)):
+		padded_array = numpy.zeros([np_array.shape[0], 3 if (np_array.shape[1] == 2) else 9])
+		padded_array[:, [0, 1] if (np_array.shape[1] == 2) else [0, 1, 3, 4]] = np_array
+		np_array = padded_array
 		if verbose:
 			print("np_array = " + str(np_array))
 	vtk_array = vtk.util.numpy_support.numpy_to_vtk(num_array=np_array, deep=1)
 	vtk_array.SetName(function.name())
 
-	if verbose:
-		print(ugrid.GetPoints())
-	ugrid.GetPointData().AddArray(vtk_array)
-	if verbose:
-		print(ugrid.GetPoints())
+	data.AddArray(vtk_array)
 
 
 ################################################################################
@@ -0,0 +1,180 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Geometric precomputations on meshes.
+
+Computes, in a single vectorized pass and a single MPI collective, the volume,
+centroid, bounding box and boundary areas of a mesh, and caches them, so that
+problems and operators do not reassemble these constants.
+"""
+
+import weakref
+
+import dolfin
+import numpy
+
+################################################################################
+
+
+# Cache of the geometric constants of each mesh, per boundary marker; entries are freed with their mesh
+mesh_geometry_cache = weakref.WeakKeyDictionary()
+
+
+def get_simplices_volumes(vertices):
+	"""Computes the volumes (lengths, areas) of simplices.
+
+	:param vertices: Coordinates of the simplices vertices, of shape (n_simplices, tdim + 1, gdim).
+	:type vertices: numpy.ndarray
+	:return: The volumes, of shape (n_simplices,).
+	:rtype: numpy.ndarray
+	"""
+	tdim = vertices.shape[1] - 1
+	edges = vertices[:, 1:, :] - vertices[:, :1, :]
+	if tdim == vertices.shape[2]:
+		dets = numpy.abs(numpy.linalg.det(edges))
+	else:
+		dets = numpy.sqrt(numpy.abs(numpy.linalg.det(numpy.einsum("kij,klj->kil", edges, edges))))
+	return dets / numpy.prod(numpy.arange(1, tdim + 1))
+
+
+def get_mesh_geometry(mesh, boundaries=None, force=False):
+	r"""Computes (or returns from cache) the geometric constants of a mesh.
+
+	The computation is vectorized over the cells of simplicial meshes (it falls back
+	to assembly for other cells), and all local contributions are gathered in a single
+	MPI collective. Results are cached per mesh (and per boundary marker), and
+	recomputed if the mesh moved (e.g., by ``dolfin.ALE.move``) since they were
+	computed, or if ``force`` is True. The cache is weakly keyed on the mesh object,
+	so that it is freed together with the mesh.
+
+	The returned dict contains:
+
+	- ``"V0"``: the volume :math:`V_0 = \int_{\Omega} d\Omega`;
+	- ``"X0"``: the centroid :math:`\mathbf{X}_0 = \frac{1}{V_0} \int_{\Omega} \mathbf{X} d\Omega`;
+	- ``"bbox"``: the bounding box ``[xmin, xmax, ymin, ymax, (zmin, zmax)]``;
+	- ``"S0"``: the area of the (exterior) boundary;
+	- ``"boundary_areas"``: if ``boundaries`` is provided, the areas of the boundary parts, per marker.
+
+	:param mesh: The mesh.
+	:type mesh: dolfin.Mesh
+	:param boundaries: (Optional) Facet markers.
+	:type boundaries: dolfin.MeshFunction
+	:param force: If True, the cache is not used.
+	:type force: bool
+	:return: The geometric constants.
+	:rtype: dict
+	"""
+	mesh_caches = mesh_geometry_cache.setdefault(mesh, {})
+	key = None if (boundaries is None) else boundaries.id()
+	cache = mesh_caches.get(key)
+	# The mesh may have moved on some processes only, so that the decision must be collective
+	is_outdated = force or (cache is None) or not (numpy.array_equal(cache["coordinates"], mesh.coordinates()))
+	if not (dolfin.MPI.max(mesh.mpi_comm(), int(is_outdated))):
+		return cache["geometry"]
+
+	gdim = mesh.geometry().dim()
+	tdim = mesh.topology().dim()
+	is_simplex = mesh.ufl_cell().cellname() in ("interval", "triangle", "tetrahedron")
+
+	coords = mesh.coordinates()
+	if len(coords) > 0:
+		coords_min = numpy.min(coords, axis=0)
+		coords_max = numpy.max(coords, axis=0)
+	else:
+		coords_min = numpy.full(gdim, +numpy.inf)
+		coords_max = numpy.full(gdim, -numpy.inf)
+
+	if is_simplex and (tdim == gdim):
+		cells = mesh.cells()[: mesh.topology().ghost_offset(tdim)]
+		cells_vertices = coords[cells]
+		cells_volumes = get_simplices_volumes(cells_vertices)
+		V0_loc = numpy.sum(cells_volumes)
+		V0X0_loc = numpy.einsum("k,kj->j", cells_volumes, numpy.mean(cells_vertices, axis=1))
+	else:
+		V0_loc = None
+		V0X0_loc = None
+
+	# Boundary facets are owned by a single process, and do not depend on ghosts
+	bmesh = dolfin.BoundaryMesh(mesh, "exterior")
+	if is_simplex:
+		facets_areas = get_simplices_volumes(bmesh.coordinates()[bmesh.cells()])
+	else:
+		facets_areas = numpy.array([dolfin.Cell(bmesh, k_cell).volume() for k_cell in range(bmesh.num_cells())])
+	S0_loc = numpy.sum(facets_areas)
+	if boundaries is not None:
+		facets_markers = boundaries.array()[bmesh.entity_map(tdim - 1).array()].astype(int)
+		boundary_areas_loc = {
+			int(marker): numpy.sum(facets_areas[facets_markers == marker]) for marker in numpy.unique(facets_markers)
+		}
+	else:
+		boundary_areas_loc = {}
+
+	geometries_loc = mesh.mpi_comm().allgather((coords_min, coords_max, V0_loc, V0X0_loc, S0_loc, boundary_areas_loc))
+
+	coords_min = numpy.min([geometry_loc[0] for geometry_loc in geometries_loc], axis=0)
+	coords_max = numpy.max([geometry_loc[1] for geometry_loc in geometries_loc], axis=0)
+	bbox = [float(val) for k_dim in range(gdim) for val in (coords_min[k_dim], coords_max[k_dim])]
+
+	if V0_loc is not None:
+		V0 = float(sum([geometry_loc[2] for geometry_loc in geometries_loc]))
+		X0 = numpy.sum([geometry_loc[3] for geometry_loc in geometries_loc], axis=0) / V0
+	else:
+		dV = dolfin.Measure("dx", domain=mesh)
+		X = dolfin.SpatialCoordinate(mesh)
+		V0 = dolfin.assemble(dolfin.Constant(1) * dV)
+		X0 = numpy.array([dolfin.assemble(X[k_dim] * dV) for k_dim in range(gdim)]) / V0
+
+	S0 = float(sum([geometry_loc[4] for geometry_loc in geometries_loc]))
+
+	boundary_areas = {}
+	for geometry_loc in geometries_loc:
+		for marker, area in geometry_loc[5].items():
+			boundary_areas[marker] = boundary_areas.get(marker, 0.0) + float(area)
+
+	mesh_caches[key] = {
+		"coordinates": mesh.coordinates().copy(),
+		"geometry": {"V0": V0, "X0": X0, "bbox": bbox, "S0": S0, "boundary_areas": boundary_areas},
+	}
+	return mesh_caches[key]["geometry"]
+
+
+def get_volume(measure):
+	"""Computes (or returns from cache) the volume integrated over by a cell measure.
+
+	:param measure: The measure, e.g., ``dV``.
+	:type measure: dolfin.Measure
+	:return: The volume.
+	:rtype: float
+	"""
+	if (measure.integral_type() != "cell") or (measure.subdomain_id() != "everywhere"):
+		return dolfin.assemble(dolfin.Constant(1) * measure)
+
+	return get_mesh_geometry(measure.ufl_domain().ufl_cargo())["V0"]
+
+
+def get_boundary_area(measure):
+	"""Computes (or returns from cache) the area of the boundary part integrated over by an exterior facet measure.
+
+	:param measure: The measure, e.g., ``ds`` or ``ds(1)``.
+	:type measure: dolfin.Measure
+	:return: The area.
+	:rtype: float
+	"""
+	mesh = measure.ufl_domain().ufl_cargo()
+	subdomain_id = measure.subdomain_id()
+	if (measure.integral_type() != "exterior_facet") or (
+		(subdomain_id != "everywhere")
+		and not (isinstance(subdomain_id, int) and (measure.subdomain_data() is not None))
+	):
+		return dolfin.assemble(dolfin.Constant(1) * measure)
+
+	if subdomain_id == "everywhere":
+		return get_mesh_geometry(mesh)["S0"]
+	return get_mesh_geometry(mesh, boundaries=measure.subdomain_data())["boundary_areas"].get(subdomain_id, 0.0)
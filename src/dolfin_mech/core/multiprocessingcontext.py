@@ -0,0 +1,29 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Process-start policy of the package."""
+
+import multiprocessing
+
+################################################################################
+
+
+def get_multiprocessing_context():
+	"""Returns the multiprocessing context to use for all worker processes of the package.
+
+	Workers are always spawned, never forked: MPI, PETSc and the JIT-compiled
+	libraries initialized in the parent process (by importing dolfin) do not
+	survive a fork. Consequently, workers must be given picklable arguments
+	(e.g., parameters dicts, arrays), and rebuild their dolfin objects.
+
+	:return: The "spawn" multiprocessing context.
+	:rtype: multiprocessing.context.SpawnContext
+	"""
+	return multiprocessing.get_context("spawn")
@@ -29,6 +29,7 @@ import numpy
 import petsc4py
 import petsc4py.PETSc
 
+from .assembler import Assembler
 from .compute_error import compute_error
 from .xdmffile import XDMFFile
 
@@ -45,6 +46,21 @@ class NonlinearSolver:
 	:param problem: The mechanical problem instance.
 	:type problem: dolfin_mech.problem.Problem
 	:param parameters: Solver parameters including 'linear_solver_type', 'sol_tol', and 'n_iter_max'.
+	    With the PETSc/MUMPS backend, 'reuse_symbolic_factorization' (defaults to False) keeps
+	    the symbolic analysis of the Jacobian across Newton iterations and time steps, and
+	    'check_jac_mat_pattern' (defaults to False) additionally raises an error if an assembly
+	    adds nonzero locations to the frozen pattern of the Jacobian.
+	    The Jacobian update policy is controlled by 'jac_update_n_iter' (the Jacobian is
+	    reassembled every n iterations, defaults to 1, i.e., full Newton),
+	    'jac_update_res_ratio_max' (the Jacobian is reassembled as soon as the residual
+	    contraction ratio of the current iterate exceeds this value, defaults to None) and 'jac_update_carry_over'
+	    (the Jacobian of the previous solve is reused, defaults to False).
+	    With the 'krylov' backend, 'linear_solver_name' is the Krylov method ('gmres' or 'minres'),
+	    'linear_solver_rtol' and 'linear_solver_n_iter_max' its stopping criteria, and
+	    'linear_solver_options' a dict of PETSc options overriding the default field-split
+	    preconditioner built from the sub-solutions (see :py:meth:`set_krylov_preconditioner`).
+	    'linear_solver_near_nullspace' (defaults to True) attaches the rigid body modes of the
+	    displacement to the Jacobian for algebraic multigrid (see :py:meth:`set_near_nullspace`).
 	:type parameters: dict
 	:param relax_type: Type of relaxation/line-search, defaults to "constant".
 	:type relax_type: str, optional
@@ -57,12 +73,14 @@ class NonlinearSolver:
 
 	Attributes:
 	    problem (Problem): The nonlinear problem to be solved.
-	    linear_solver_type (str): The backend used for linear solves ('petsc' or 'dolfin').
+	    linear_solver_type (str): The backend used for linear solves ('petsc', 'krylov' or 'dolfin').
 	    relax_type (str): The relaxation strategy ('constant', 'aitken', 'gss', 'backtracking').
 	    sol_tol (list): Convergence tolerances for each sub-solution.
 	    n_iter_max (int): Maximum number of Newton iterations allowed.
 	    success (bool): Whether the solver converged in the last solve call.
 	    k_iter (int): Current Newton iteration counter.
+	    statistics (SolverStatistics): If not None, a record is appended to it at each iteration
+	        (set by :py:class:`dolfin_mech.TimeIntegrator` with ``write_statistics``).
 	"""
 
 	def __init__(
@@ -86,6 +104,9 @@ class NonlinearSolver:
 
 			self.linear_solver_name = parameters.get("linear_solver_name", self.default_linear_solver_name)
 
+			self.reuse_symbolic_factorization = parameters.get("reuse_symbolic_factorization", False)
+			self.check_jac_mat_pattern = parameters.get("check_jac_mat_pattern", False)
+
 			if self.linear_solver_name == "mumps":
 				if int(dolfin.__version__.split(".")[0]) >= 2018:
 					options = petsc4py.PETSc.Options()
@@ -93,15 +114,53 @@ class NonlinearSolver:
 					options["pc_type"] = "lu"
 					options["pc_factor_mat_solver_type"] = "mumps"
 					options["mat_mumps_icntl_33"] = 0
+					# Always set, since options are global, and would otherwise leak to the next solvers
+					options["pc_factor_reuse_ordering"] = bool(self.reuse_symbolic_factorization)
 				else:
 					options = dolfin.PETScOptions()
 					options.set("ksp_type", "preonly")
 					options.set("pc_type", "lu")
 					options.set("pc_factor_mat_solver_package", "mumps")
 					options.set("mat_mumps_icntl_33", 0)
+					options.set("pc_factor_reuse_ordering", bool(self.reuse_symbolic_factorization))
+
+			self.linear_solver.ksp().setFromOptions()
+			self.linear_solver.ksp().setOperators(A=self.jac_mat.mat())
+
+			self.jac_mat_pattern_is_frozen = False
+
+		elif self.linear_solver_type == "krylov":
+			self.res_vec = dolfin.PETScVector()
+			self.jac_mat = dolfin.PETScMatrix()
+
+			self.linear_solver = dolfin.PETScKrylovSolver()
+
+			self.default_linear_solver_name = "gmres"
+			# self.default_linear_solver_name = "minres"
+
+			self.linear_solver_name = parameters.get("linear_solver_name", self.default_linear_solver_name)
+			assert self.linear_solver_name in ("gmres", "minres"), (
+				"linear_solver_name (=" + str(self.linear_solver_name) + ") must be gmres or minres. Aborting."
+			)
+
+			self.linear_solver_options_prefix = "dolfin_mech_nonlinearsolver_"
+			self.linear_solver.ksp().setOptionsPrefix(self.linear_solver_options_prefix)
+
+			options = petsc4py.PETSc.Options(self.linear_solver_options_prefix)
+			options["ksp_type"] = self.linear_solver_name
+			options["ksp_rtol"] = parameters.get("linear_solver_rtol", 1e-8)
+			options["ksp_max_it"] = parameters.get("linear_solver_n_iter_max", 1000)
+			self.linear_solver_near_nullspace = parameters.get("linear_solver_near_nullspace", True)
+			self.near_nullspace_coordinates = None
+			self.set_krylov_preconditioner(options)
+			for key, val in parameters.get("linear_solver_options", {}).items():
+				options[key] = val
 
 			self.linear_solver.ksp().setFromOptions()
 			self.linear_solver.ksp().setOperators(A=self.jac_mat.mat())
+			if self.linear_solver.ksp().getPC().getType() == "fieldsplit":
+				for name, dofs_is in self.krylov_fieldsplits:
+					self.linear_solver.ksp().getPC().setFieldSplitIS((name, dofs_is))
 
 		elif self.linear_solver_type == "dolfin":
 			self.res_vec = dolfin.Vector()
@@ -143,9 +202,24 @@ class NonlinearSolver:
 				else 8
 			)
 
+		if self.problem.periodic_dof_map is not None:
+			assert self.linear_solver_type == "petsc", (
+				"Periodic dof map requires the petsc linear solver (=" + str(self.linear_solver_type) + "). Aborting."
+			)
+
 		self.sol_tol = parameters.get("sol_tol", [1e-6] * len(self.problem.subsols))
 		self.n_iter_max = parameters.get("n_iter_max", 32)
 
+		self.jac_update_n_iter = parameters.get("jac_update_n_iter", 1)
+		self.jac_update_res_ratio_max = parameters.get("jac_update_res_ratio_max", None)
+		self.jac_update_carry_over = parameters.get("jac_update_carry_over", False)
+		self.invalidate_jac()
+
+		self.assembler = None
+
+		self.statistics = None
+		self.reset_iter_timers()
+
 		if type(print_out) is str:
 			if print_out == "stdout":
 				self.printer_filename = None
@@ -186,19 +260,25 @@ class NonlinearSolver:
 				filename=sys.argv[0][:-3] + "-sol-k_step=" + str(k_step) + "-k_t=" + str(k_t) + ".xdmf",
 				functions=self.functions_to_write,
 			)
-			self.problem.update_fois()
+			self.problem.update_fois_if_needed()
 			xdmf_file_iter.write(0.0)
 
+		if not (self.jac_update_carry_over):
+			self.invalidate_jac()
+		self.res_ratio = None
+
 		self.k_iter = 0
 		self.success = False
 		self.printer.inc()
 		while True:
 			self.k_iter += 1
 			self.printer.print_var("k_iter", self.k_iter, -1)
+			self.reset_iter_timers()
 
 			# linear problem
 			linear_success = self.linear_solve(k_step=k_step, k_t=k_t)
 			if not (linear_success):
+				self.record_iteration(k_step, k_t, dt, t, complete=False)
 				break
 			self.compute_dsol_norm()
 
@@ -218,7 +298,7 @@ class NonlinearSolver:
 
 			# write
 			if self.write_iter:
-				self.problem.update_fois()
+				self.problem.update_fois_if_needed()
 				xdmf_file_iter.write(self.k_iter)
 
 			# error
@@ -227,6 +307,8 @@ class NonlinearSolver:
 			# exit test
 			self.exit_test()
 
+			self.record_iteration(k_step, k_t, dt, t)
+
 			if self.success:
 				self.printer.print_str("Nonlinear solver converged…")
 				break
@@ -249,8 +331,21 @@ class NonlinearSolver:
 		:return: True if the linear solve was successful.
 		:rtype: bool
 		"""
+		self.update_jac = self.jac_needs_update()
+
+		# With a reused Jacobian, the Dirichlet increment cannot be lifted into the right-hand side,
+		# so it is imposed on the solution before assembling the residual
+		impose_constraints_increment = (not (self.update_jac)) and (self.k_iter == 1)
+		if impose_constraints_increment:
+			self.impose_constraints_increment()
+
 		assemble_linear_system = self.assemble_linear_system()
 
+		if impose_constraints_increment:
+			self.problem.sol_func.vector().axpy(-1.0, self.constraints_increment_vec)
+			if len(self.problem.subsols) > 1:
+				dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
+
 		if assemble_linear_system == False:
 			return False
 
@@ -262,14 +357,38 @@ class NonlinearSolver:
 		try:
 			self.printer.print_str("Solve…", newline=False)
 			timer = time.time()
-			self.linear_solver.solve(self.problem.dsol_func.vector(), self.res_vec)
+			if self.problem.periodic_dof_map is not None:
+				if self.update_jac or not (hasattr(self, "constraints_dofs")):
+					self.constraints_dofs = numpy.array(
+						[dof for constraint in self.constraints for dof in constraint.bc.get_boundary_values().keys()],
+						dtype=int,
+					)
+				self.problem.periodic_dof_map.solve(
+					self.jac_mat,
+					self.problem.dsol_func.vector(),
+					self.res_vec,
+					bc_dofs=self.constraints_dofs,
+					reuse_matrix=not (self.update_jac),
+				)
+			else:
+				self.linear_solver.solve(self.problem.dsol_func.vector(), self.res_vec)
 			timer = time.time() - timer
+			self.iter_timers["solve"] += timer
 			self.printer.print_str(" " + str(timer) + " s", tab=False)
 			# self.printer.print_var("dsol_func",self.problem.dsol_func.vector().get_local())
 		except:
 			self.printer.print_str("Warning! Linear solver failed!", tab=False)
 			return False
 
+		if self.update_jac:
+			self.jac_age = 1
+			self.jac_is_outdated = False
+		else:
+			self.jac_age += 1
+
+		if impose_constraints_increment:
+			self.problem.dsol_func.vector().axpy(1.0, self.constraints_increment_vec)
+
 		if not (numpy.isfinite(self.problem.dsol_func.vector()).all()):
 			# self.problem.dsol_func.vector().zero()
 
@@ -295,11 +414,272 @@ class NonlinearSolver:
 
 		return True
 
+	def reset_iter_timers(self):
+		"""Resets the assembly & solve times accumulated over the current iteration."""
+		self.iter_timers = {"assembly": 0.0, "solve": 0.0}
+
+	def record_iteration(self, k_step, k_t, dt, t, complete=True):
+		"""Appends the record of the current iteration to the statistics, if any.
+
+		:param complete: False if the iteration stopped before the solution update, in which
+		    case the residual & increment norms are not recorded.
+		"""
+		if self.statistics is None:
+			return
+
+		nan = float("nan")
+		record = {
+			"k_step": k_step,
+			"k_t": k_t,
+			"k_iter": self.k_iter,
+			"t": t,
+			"dt": dt,
+			"n_dofs": self.problem.sol_func.function_space().dim(),
+			"assembly_time": self.iter_timers["assembly"],
+			"solve_time": self.iter_timers["solve"],
+			"jac_updated": bool(getattr(self, "update_jac", True)),
+			"res_norm": self.res_norm if complete else nan,
+			"res_err": self.res_err if (complete and (self.k_iter > 1)) else nan,
+			"relax": self.relax if complete else nan,
+		}
+		for k_subsol, subsol in enumerate(self.problem.subsols):
+			record["d" + subsol.name + "_norm"] = self.dsubsol_norm_lst[k_subsol] if complete else nan
+			record[subsol.name + "_err"] = self.subsol_err_lst[k_subsol] if complete else nan
+		record["success"] = bool(self.success)
+		self.statistics.add_iteration(**record)
+
+	def get_displacement_subsol(self):
+		"""Returns the displacement sub-solution, or the first sub-solution if there is none."""
+		return getattr(
+			self.problem,
+			"displacement_subsol",
+			getattr(self.problem, "displacement_perturbation_subsol", self.problem.subsols[0]),
+		)
+
+	def set_krylov_preconditioner(self, options):
+		"""Sets the default preconditioner options of the Krylov backend.
+
+		The field splits are derived from the sub-spaces of ``problem.sol_fs``, one
+		per sub-solution, the displacement block coming first. The displacement block
+		is preconditioned with algebraic multigrid, the other blocks with Jacobi.
+		With two sub-solutions (e.g., displacement–pressure or displacement–porosity),
+		a Schur complement split is used, the Schur complement being approximated from
+		the diagonal of the displacement block; with more, a block Gauss–Seidel split
+		(block Jacobi for MINRES, which requires a symmetric preconditioner).
+
+		:param options: The PETSc options database (with the solver prefix).
+		:type options: petsc4py.PETSc.Options
+		"""
+		displacement_subsol = self.get_displacement_subsol()
+		subsols = [displacement_subsol] + [
+			subsol for subsol in self.problem.subsols if subsol is not displacement_subsol
+		]
+
+		self.krylov_fieldsplits = []
+		if len(self.problem.subsols) == 1:
+			self.krylov_fieldsplits += [(displacement_subsol.name, None)]
+		else:
+			for subsol in subsols:
+				k_subsol = self.problem.subsols.index(subsol)
+				dofs = self.problem.sol_fs.sub(k_subsol).dofmap().dofs()
+				dofs_is = petsc4py.PETSc.IS().createGeneral(
+					dofs.astype(petsc4py.PETSc.IntType), comm=self.problem.mesh.mpi_comm()
+				)
+				self.krylov_fieldsplits += [(subsol.name, dofs_is)]
+
+		if len(self.krylov_fieldsplits) == 1:
+			options["pc_type"] = "gamg"
+		else:
+			options["pc_type"] = "fieldsplit"
+			if len(self.krylov_fieldsplits) == 2:
+				options["pc_fieldsplit_type"] = "schur"
+				options["pc_fieldsplit_schur_fact_type"] = "diag" if (self.linear_solver_name == "minres") else "full"
+				options["pc_fieldsplit_schur_precondition"] = "selfp"
+			else:
+				options["pc_fieldsplit_type"] = (
+					"additive" if (self.linear_solver_name == "minres") else "multiplicative"
+				)
+			for k_split, (name, _) in enumerate(self.krylov_fieldsplits):
+				options["fieldsplit_" + name + "_ksp_type"] = "preonly"
+				options["fieldsplit_" + name + "_pc_type"] = "gamg" if (k_split == 0) else "jacobi"
+
+	def set_near_nullspace(self):
+		"""Attaches the rigid body modes of the displacement field to the Jacobian as near-nullspace.
+
+		The modes (translations and infinitesimal rotations) are built from the mesh
+		coordinates at the time of the call, i.e., the current coordinates for inverse
+		problems, whose mesh is the deformed configuration. They are orthonormalized,
+		and attached either to the Jacobian itself, or, with a field-split
+		preconditioner, to the displacement split, so that algebraic multigrid
+		converges in a mesh-independent number of iterations.
+
+		The modes are only built once, and rebuilt if the mesh moves, since the
+		near-nullspace remains attached to the Jacobian across assemblies.
+		"""
+		coordinates = self.problem.mesh.coordinates()
+		is_outdated = (self.near_nullspace_coordinates is None) or not (
+			numpy.array_equal(coordinates, self.near_nullspace_coordinates)
+		)
+		if not (dolfin.MPI.max(self.problem.mesh.mpi_comm(), int(is_outdated))):
+			return
+		self.near_nullspace_coordinates = coordinates.copy()
+
+		displacement_subsol = self.get_displacement_subsol()
+		if len(self.problem.subsols) == 1:
+			displacement_fs = self.problem.sol_fs
+		else:
+			displacement_fs = self.problem.sol_fs.sub(self.problem.subsols.index(displacement_subsol))
+
+		dim = self.problem.mesh.geometry().dim()
+		assert displacement_fs.num_sub_spaces() == dim, (
+			"Near-nullspace requires a vector displacement field (num_sub_spaces="
+			+ str(displacement_fs.num_sub_spaces())
+			+ ", dim="
+			+ str(dim)
+			+ "). Aborting."
+		)
+
+		n_modes = 3 if (dim == 2) else 6
+		modes = [self.problem.sol_func.vector().copy() for k_mode in range(n_modes)]
+		for mode in modes:
+			mode.zero()
+
+		# translations
+		for k_dim in range(dim):
+			displacement_fs.sub(k_dim).dofmap().set(modes[k_dim], 1.0)
+
+		# rotations
+		if dim == 2:
+			displacement_fs.sub(0).set_x(modes[2], -1.0, 1)
+			displacement_fs.sub(1).set_x(modes[2], 1.0, 0)
+		elif dim == 3:
+			displacement_fs.sub(0).set_x(modes[3], -1.0, 1)
+			displacement_fs.sub(1).set_x(modes[3], 1.0, 0)
+			displacement_fs.sub(0).set_x(modes[4], 1.0, 2)
+			displacement_fs.sub(2).set_x(modes[4], -1.0, 0)
+			displacement_fs.sub(2).set_x(modes[5], 1.0, 1)
+			displacement_fs.sub(1).set_x(modes[5], -1.0, 2)
+
+		for mode in modes:
+			mode.apply("insert")
+
+		self.near_nullspace = dolfin.VectorSpaceBasis(modes)
+		self.near_nullspace.orthonormalize()
+
+		fieldsplits = dict(self.krylov_fieldsplits)
+		if (len(fieldsplits) == 1) or (self.linear_solver.ksp().getPC().getType() != "fieldsplit"):
+			dolfin.as_backend_type(self.jac_mat).set_near_nullspace(self.near_nullspace)
+		else:
+			dofs_is = fieldsplits[displacement_subsol.name]
+			sub_modes = []
+			for mode in modes:
+				mode_vec = dolfin.as_backend_type(mode).vec()
+				sub_mode_vec = mode_vec.getSubVector(dofs_is)
+				sub_modes += [sub_mode_vec.copy()]
+				mode_vec.restoreSubVector(dofs_is, sub_mode_vec)
+			near_nullspace = petsc4py.PETSc.NullSpace().create(vectors=sub_modes, comm=self.problem.mesh.mpi_comm())
+			dofs_is.compose("nearnullspace", near_nullspace)
+
+	def invalidate_jac(self):
+		"""Marks the Jacobian as outdated, so that it is reassembled (and refactorized) at the next iteration.
+
+		Should be called whenever the variational formulation or the time step changes,
+		or after a failed solve.
+		"""
+		self.jac_is_outdated = True
+		self.jac_age = 0
+
+	def jac_needs_update(self, res_ratio=None):
+		"""Decides, according to the Jacobian update policy, whether the Jacobian must be reassembled.
+
+		The residual contraction criterion is only checked if the contraction ratio of the
+		current iterate is given, i.e., once its residual has been assembled.
+
+		:param res_ratio: The residual contraction ratio of the current iterate, if known.
+		:type res_ratio: float
+		:return: True if the Jacobian must be reassembled at the current iteration.
+		:rtype: bool
+		"""
+		if self.jac_is_outdated:
+			return True
+		if (self.jac_update_n_iter is not None) and (self.jac_age >= self.jac_update_n_iter):
+			return True
+		if (
+			(self.jac_update_res_ratio_max is not None)
+			and (res_ratio is not None)
+			and (res_ratio > self.jac_update_res_ratio_max)
+		):
+			return True
+		return False
+
+	def impose_constraints_increment(self):
+		"""Imposes the current Dirichlet increment on the solution, and homogenizes the constraints.
+
+		The imposed increment is stored in ``constraints_increment_vec``.
+		"""
+		if not hasattr(self, "constraints_increment_vec"):
+			self.constraints_increment_vec = self.problem.sol_func.vector().copy()
+		self.constraints_increment_vec.zero()
+		for constraint in self.constraints:
+			constraint.bc.apply(self.constraints_increment_vec)
+			constraint.homogenize()
+
+		self.problem.sol_func.vector().axpy(1.0, self.constraints_increment_vec)
+		if len(self.problem.subsols) > 1:
+			dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
+
+	def set_assembler(self):
+		"""Builds the persistent assembler for the current variational formulation and constraints.
+
+		Should be called once per step, after ``problem.set_variational_formulation``;
+		otherwise, it is called lazily whenever the assembler is outdated.
+		"""
+		self.assembler = Assembler(problem=self.problem, constraints=self.constraints)
+
+	def get_assembler(self):
+		"""Returns the persistent assembler, (re)building it if needed.
+
+		:rtype: dolfin_mech.Assembler
+		"""
+		if (self.assembler is None) or (self.assembler.is_outdated(self.constraints)):
+			self.set_assembler()
+		return self.assembler
+
+	def assemble_residual(self, res_vec=None):
+		"""Assembles the residual vector only, with the current constraints applied.
+
+		:param res_vec: The (preallocated) vector to assemble into, defaults to ``self.res_vec``.
+		"""
+		if res_vec is None:
+			res_vec = self.res_vec
+
+		self.printer.print_str("Assembly (residual only)…", newline=False)
+		timer = time.time()
+		self.get_assembler().assemble_residual(res_vec)
+		timer = time.time() - timer
+		self.iter_timers["assembly"] += timer
+		self.printer.print_str(" " + str(timer) + " s", tab=False)
+		# self.printer.print_var("res_vec",res_vec.get_local())
+
+	def assemble_energy(self):
+		"""Assembles the potential energy only.
+
+		:return: The potential energy, or +inf if it is NaN.
+		:rtype: float
+		"""
+		energy = self.get_assembler().assemble_energy()
+		if numpy.isnan(energy):
+			energy = float("+inf")
+		return energy
+
 	def assemble_linear_system(self):
 		"""Assembles the residual vector and Jacobian matrix.
 
-		This method handles standard integrals and special vertex-based integrals
-		separately to accommodate specific dolfin constraints.
+		The assembly is delegated to the persistent :py:class:`dolfin_mech.Assembler`,
+		which handles standard integrals and special vertex-based integrals
+		separately to accommodate specific dolfin constraints. If the Jacobian
+		update policy decided to reuse the current Jacobian, only the residual is assembled,
+		and the Jacobian is then only assembled if the residual contraction is too slow.
 		"""
 		# res_old
 		if self.k_iter > 1:
@@ -310,69 +690,35 @@ class NonlinearSolver:
 			self.res_old_norm = self.res_norm
 
 		# linear system: Assembly
-		if any(
-			[(operator.measure.integral_type() == "vertex") for operator in self.problem.operators]
-		):  # MG20190513: Cannot use point integral within assemble_system
-			self.printer.print_str("Assembly (without vertex integrals)…", newline=False)
-			timer = time.time()
-			dolfin.assemble_system(
-				self.problem.jac_form,
-				-self.problem.res_form,
-				bcs=[constraint.bc for constraint in self.constraints],
-				A_tensor=self.jac_mat,
-				b_tensor=self.res_vec,
-				add_values=False,
-				finalize_tensor=False,
-				form_compiler_parameters=self.problem.form_compiler_parameters,
-			)
-			timer = time.time() - timer
-			self.printer.print_str(" " + str(timer) + " s", tab=False)
-			# self.printer.print_var("res_vec",self.res_vec.get_local())
-			# self.printer.print_var("jac_mat",self.jac_mat.array())
+		if not (getattr(self, "update_jac", True)):
+			self.assemble_residual()
 
-			for operator in self.problem.operators:
-				if operator.measure.integral_type() == "vertex":
-					self.printer.print_str("Assembly (vertex integrals)…", newline=False)
-					timer = time.time()
-					dolfin.assemble(  # MG20190513: However, vertex integrals only work if solution only has dofs on vertices…
-						-operator.res_form,
-						tensor=self.res_vec,
-						add_values=True,
-						finalize_tensor=True,
-						form_compiler_parameters=self.problem.form_compiler_parameters,
-					)
-					operator.jac_form = dolfin.derivative(
-						operator.res_form, self.problem.sol_func, self.problem.dsol_tria
-					)
-					dolfin.assemble(
-						operator.jac_form,
-						tensor=self.jac_mat,
-						add_values=True,
-						finalize_tensor=True,
-						form_compiler_parameters=self.problem.form_compiler_parameters,
-					)
-					timer = time.time() - timer
-					self.printer.print_str(" " + str(timer) + " s", tab=False)
-					# self.printer.print_var("res_vec",self.res_vec.get_local())
-					# self.printer.print_var("jac_mat",self.jac_mat.array())
-		else:
+			# The residual contraction is only known once the residual of the current iterate is assembled
+			if (self.k_iter > 1) and self.jac_needs_update(
+				res_ratio=compute_error(val=self.res_vec.norm("l2"), ref=self.res_old_norm)
+			):
+				self.update_jac = True
+
+		if getattr(self, "update_jac", True):
 			self.printer.print_str("Assembly…", newline=False)
 			timer = time.time()
-			dolfin.assemble_system(
-				self.problem.jac_form,
-				-self.problem.res_form,
-				bcs=[constraint.bc for constraint in self.constraints],
-				A_tensor=self.jac_mat,
-				b_tensor=self.res_vec,
-				add_values=False,
-				finalize_tensor=True,
-				form_compiler_parameters=self.problem.form_compiler_parameters,
-			)
+			self.get_assembler().assemble_system(self.jac_mat, self.res_vec)
 			timer = time.time() - timer
+			self.iter_timers["assembly"] += timer
 			self.printer.print_str(" " + str(timer) + " s", tab=False)
 			# self.printer.print_var("res_vec",self.res_vec.get_local())
 			# self.printer.print_var("jac_mat",self.jac_mat.array())
 
+		if (self.linear_solver_type == "petsc") and (self.reuse_symbolic_factorization):
+			self.freeze_jac_mat_pattern()
+
+		if (
+			(self.linear_solver_type == "krylov")
+			and (self.linear_solver_near_nullspace)
+			and (getattr(self, "update_jac", True))
+		):
+			self.set_near_nullspace()
+
 		if not (numpy.isfinite(self.res_vec).all()):
 			self.printer.print_str("Warning! Residual is NaN!")
 			return False
@@ -410,6 +756,29 @@ class NonlinearSolver:
 			self.res_err_rel = compute_error(val=self.dres_norm, ref=self.res_old_norm)
 			self.printer.print_sci("res_err_rel", self.res_err_rel)
 
+		# res_ratio
+		if self.k_iter > 1:
+			self.res_ratio = compute_error(val=self.res_norm, ref=self.res_old_norm)
+			self.printer.print_sci("res_ratio", self.res_ratio)
+
+	def freeze_jac_mat_pattern(self):
+		"""Freezes the nonzero pattern of the Jacobian matrix after its first assembly.
+
+		Since the sparsity of ``jac_form`` does not change within a run, PETSc then
+		sees the operator with the same nonzero pattern at every Newton iteration
+		and time step, so that MUMPS only redoes the numeric factorization, while
+		the symbolic analysis (ordering and elimination tree) is computed once.
+		New nonzero locations are only turned into errors if ``check_jac_mat_pattern`` is set.
+		"""
+		if self.jac_mat_pattern_is_frozen:
+			return
+
+		jac_mat = self.jac_mat.mat()
+		jac_mat.setOption(petsc4py.PETSc.Mat.Option.KEEP_NONZERO_PATTERN, True)
+		if self.check_jac_mat_pattern:
+			jac_mat.setOption(petsc4py.PETSc.Mat.Option.NEW_NONZERO_LOCATION_ERR, True)
+		self.jac_mat_pattern_is_frozen = True
+
 	def eigen_solve(self):
 		"""Solves the eigenproblem for the Jacobian matrix to identify modal shapes."""
 		jac_eigensolver = dolfin.SLEPcEigenSolver(dolfin.as_backend_type(self.jac_mat))
@@ -507,13 +876,7 @@ class NonlinearSolver:
 					if len(self.problem.subsols) > 1:
 						dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
 					cur = c
-					relax_fc = dolfin.assemble(
-						self.problem.Pi_expr, form_compiler_parameters=self.problem.form_compiler_parameters
-					)
-					# self.printer.print_sci("relax_fc",relax_fc)
-					if numpy.isnan(relax_fc):
-						relax_fc = float("+inf")
-						# self.printer.print_sci("relax_fc",relax_fc)
+					relax_fc = self.assemble_energy()
 					self.printer.print_sci("relax_fc", relax_fc)
 					relax_vals.append(relax_fc)
 					# self.printer.print_var("relax_list",relax_list)
@@ -526,12 +889,7 @@ class NonlinearSolver:
 					if len(self.problem.subsols) > 1:
 						dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
 					cur = d
-					relax_fd = dolfin.assemble(
-						self.problem.Pi_expr, form_compiler_parameters=self.problem.form_compiler_parameters
-					)
-					if numpy.isnan(relax_fd):
-						relax_fd = float("+inf")
-						# self.printer.print_sci("relax_fd",relax_fd)
+					relax_fd = self.assemble_energy()
 					self.printer.print_sci("relax_fd", relax_fd)
 					relax_vals.append(relax_fd)
 					# self.printer.print_var("relax_list",relax_list)
@@ -568,16 +926,27 @@ class NonlinearSolver:
 				self.printer.print_str("Warning! Optimal relaxation is null…")
 
 	def compute_relax_backtracking(self):
-		"""Computes relaxation using a backtracking line-search until residual is finite."""
+		"""Computes relaxation using a backtracking line-search until residual is finite.
+
+		Each trial only assembles the residual, into a preallocated vector, so that
+		the current residual and Jacobian are left untouched.
+		"""
+		if not hasattr(self, "res_trial_vec"):
+			self.res_trial_vec = self.res_vec.copy()
+
 		k_relax = 1
 		self.printer.inc()
 		while True:
 			relax = 1.0 / self.relax_backtracking_factor ** (k_relax - 1)
 			self.problem.sol_func.vector().axpy(relax, self.problem.dsol_func.vector())
-			self.assemble_linear_system()
-			res_is_finite = numpy.isfinite(self.res_vec).all()
-			# print("numpy.isfinite(self.res_vec).all()", res_is_finite)
+			if len(self.problem.subsols) > 1:
+				dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
+			self.assemble_residual(res_vec=self.res_trial_vec)
+			res_is_finite = numpy.isfinite(self.res_trial_vec).all()
+			# print("numpy.isfinite(self.res_trial_vec).all()", res_is_finite)
 			self.problem.sol_func.vector().axpy(-relax, self.problem.dsol_func.vector())
+			if len(self.problem.subsols) > 1:
+				dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
 			if res_is_finite:
 				self.relax = relax
 				break
@@ -593,6 +962,7 @@ class NonlinearSolver:
 		# for constraint in self.problem.constraints+self.problem.steps[k_step-1].constraints:
 		#     print(constraint.bc.get_boundary_values())
 		self.problem.sol_func.vector().axpy(self.relax, self.problem.dsol_func.vector())
+		self.problem.set_fois_outdated()
 		# for constraint in self.problem.constraints+self.problem.steps[k_step-1].constraints:
 		#     print(constraint.bc.get_boundary_values())
 		# self.printer.print_var("sol_func",self.problem.sol_func.vector().get_local())
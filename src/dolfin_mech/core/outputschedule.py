@@ -0,0 +1,141 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Defines the OutputSchedule class.
+
+Decides at which converged time steps a given kind of output (solution,
+VTU/XML snapshots, QOIs) is written by the time integrator.
+"""
+
+import math
+
+################################################################################
+
+
+class OutputSchedule:
+	r"""Class to schedule outputs during a time integration.
+
+	An output is due at a converged time step if any of the criteria is met:
+
+	- ``n_steps``: every ``n_steps`` converged time steps;
+	- ``times``: the time step reached or crossed one of the target times;
+	- ``dt``: the time step reached or crossed a multiple of ``dt``;
+	- ``at_step_end``: the time step is the last one of a step.
+
+	If no criterion is given, the output is due at every converged time step,
+	which is the historical behavior. The time integrator also adjusts the
+	time increments so that target times and multiples of ``dt`` are hit exactly,
+	unless ``clip_dt`` is False: the increment is clipped at the target (the
+	adaptive :math:`\Delta t` being kept for the following time steps), or
+	extended to it if it would stop short of it by less than ``dt_min``.
+
+	:param n_steps: Write every ``n_steps`` converged time steps.
+	:type n_steps: int, optional
+	:param times: Target times at which to write.
+	:type times: list of float, optional
+	:param dt: Simulated-time interval between writes.
+	:type dt: float, optional
+	:param at_step_end: If True, also write at the end of each step. Defaults to True when another criterion is given.
+	:type at_step_end: bool, optional
+	:param clip_dt: If True, the time integrator clips the time increment to hit target times.
+	:type clip_dt: bool
+	:param tol: Tolerance used to compare times.
+	:type tol: float
+	"""
+
+	def __init__(self, n_steps=None, times=None, dt=None, at_step_end=None, clip_dt=True, tol=1e-9):
+		"""Initializes the OutputSchedule."""
+		assert (n_steps is None) or (n_steps >= 1), "n_steps (=" + str(n_steps) + ") should be positive. Aborting."
+		assert (dt is None) or (dt > 0.0), "dt (=" + str(dt) + ") should be positive. Aborting."
+
+		self.n_steps = n_steps
+		self.times = sorted(times) if (times is not None) else None
+		self.dt = dt
+		self.always = (n_steps is None) and (times is None) and (dt is None)
+		self.at_step_end = (not (self.always)) if (at_step_end is None) else bool(at_step_end)
+		self.clip_dt = bool(clip_dt)
+		self.tol = tol
+
+		self.k_t = 0
+		self.t_old = None
+
+	@classmethod
+	def from_parameter(cls, schedule):
+		"""Builds a schedule from a TimeIntegrator parameter.
+
+		:param schedule: None (write at every time step), an OutputSchedule, or a dict of OutputSchedule parameters.
+		:rtype: OutputSchedule
+		"""
+		if schedule is None:
+			return cls()
+		elif isinstance(schedule, cls):
+			return schedule
+		elif isinstance(schedule, dict):
+			return cls(**schedule)
+		else:
+			assert 0, "schedule (=" + str(schedule) + ") should be None, a dict or an OutputSchedule. Aborting."
+
+	def start(self, t):
+		"""Initializes the schedule at the initial time of the integration.
+
+		:param t: The initial time.
+		:type t: float
+		"""
+		self.k_t = 0
+		self.t_old = t
+
+	def get_next_time(self, t):
+		"""Returns the next time the time integrator should hit exactly, if any.
+
+		:param t: The current time.
+		:type t: float
+		:return: The next target time strictly after ``t``, or None.
+		:rtype: float or None
+		"""
+		if not (self.clip_dt):
+			return None
+
+		t_next = None
+		if self.times is not None:
+			for time in self.times:
+				if time > t + self.tol:
+					t_next = time
+					break
+		if self.dt is not None:
+			t_dt = (math.floor((t + self.tol) / self.dt) + 1) * self.dt
+			t_next = t_dt if (t_next is None) else min(t_next, t_dt)
+		return t_next
+
+	def is_due(self, t, step_end=False):
+		"""Registers a converged time step, and checks whether the output is due.
+
+		:param t: The time reached by the converged time step.
+		:type t: float
+		:param step_end: True if the time step is the last one of a step.
+		:type step_end: bool
+		:rtype: bool
+		"""
+		self.k_t += 1
+		t_old = self.t_old
+		self.t_old = t
+
+		if self.always:
+			return True
+		if self.at_step_end and step_end:
+			return True
+		if (self.n_steps is not None) and (self.k_t % self.n_steps == 0):
+			return True
+		if (self.times is not None) and (t_old is not None):
+			if any([(time > t_old + self.tol) and (time <= t + self.tol) for time in self.times]):
+				return True
+		if (self.dt is not None) and (t_old is not None):
+			if math.floor((t + self.tol) / self.dt) > math.floor((t_old + self.tol) / self.dt):
+				return True
+		return False
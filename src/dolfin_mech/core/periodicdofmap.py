@@ -0,0 +1,299 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Defines the PeriodicDofMap class.
+
+Periodicity engine alternative to ``constrained_domain``: the slave→master
+dof pairing of a periodic unit cell is computed once (and cached on disk), and
+periodicity is enforced on assembled systems through a sparse prolongation.
+"""
+
+import itertools
+import os
+
+import dolfin
+import numpy
+import petsc4py
+import petsc4py.PETSc
+
+from .subdomain_periodic import PeriodicSubDomain
+
+################################################################################
+
+
+class PeriodicDofMap:
+	r"""Master–slave dof map of a periodic unit cell.
+
+	The dofs of the function space are paired by coordinates: a dof lying on a
+	"max" side of the unit cell (right, top, front) is a slave of the dof located
+	at its image by the periodicity vectors :math:`\mathbf{a}_i`,
+	:math:`\mathbf{y} = \mathbf{x} - \sum_{i, x \in \text{max}_i} \mathbf{a}_i`,
+	which is the same rule as :py:class:`dolfin_mech.PeriodicSubDomain` (2D
+	parallelograms, 3D boxes, same tolerance). The pairing relies on the matching
+	node distributions of opposite faces (as enforced by ``setPeriodic`` in the
+	gmsh meshes). Images are matched to masters through a sorted grid of cell size
+	the tolerance, in :math:`O(n \log n)`, without calling back into Python for each dof.
+
+	Each sub-space is paired separately, so that mixed and vector spaces are
+	supported; global ("Real") dofs are never paired.
+
+	With :math:`\mathbf{P}` the prolongation from the independent dofs to all
+	dofs (:math:`P_{ij} = 1` if dof :math:`i` is, or is a slave of, independent
+	dof :math:`j`), a system :math:`\mathbf{A} \mathbf{x} = \mathbf{b}` assembled
+	on the non-periodic space is solved as
+	:math:`\left(\mathbf{P}^T \mathbf{A} \mathbf{P}\right) \mathbf{x}_r = \mathbf{P}^T \mathbf{b}`,
+	:math:`\mathbf{x} = \mathbf{P} \mathbf{x}_r`.
+
+	Only works in serial.
+
+	:param function_space: The (non-periodic) function space.
+	:type function_space: dolfin.FunctionSpace
+	:param dim: Spatial dimension (2 or 3).
+	:type dim: int
+	:param bbox: Bounding box coordinates ``[xmin, xmax, ymin, ymax, (zmin, zmax)]``.
+	:type bbox: list
+	:param vertices: (Optional) Array of RVE vertices for non-rectangular (2D) domains.
+	:type vertices: numpy.ndarray
+	:param tol: Geometric tolerance, defaults to 1e-3 times the bounding box diagonal.
+	:type tol: float
+	:param filename: Path to a ".npz" file where the pairing is cached. It is reused if it
+	    matches the function space and the periodicity vectors, and (re)computed otherwise.
+	:type filename: str, optional
+	"""
+
+	def __init__(self, function_space, dim, bbox, vertices=None, tol=None, filename=None):
+		"""Initializes the PeriodicDofMap, and computes (or loads) the pairing."""
+		self.function_space = function_space
+		self.mesh = function_space.mesh()
+		assert dolfin.MPI.size(self.mesh.mpi_comm()) == 1, "PeriodicDofMap only works in serial. Aborting."
+
+		self.dim = dim
+		self.n_dofs = function_space.dim()
+
+		# The Python SubDomain checks the geometry & computes the default tolerance
+		periodic_sd = PeriodicSubDomain(dim, bbox, vertices, tol)
+		self.tol = periodic_sd.tol
+		if self.dim == 2:
+			self.origin = numpy.array(periodic_sd.vv[0, :], dtype=float)
+			self.vectors = numpy.array([periodic_sd.a1, periodic_sd.a2], dtype=float)
+		elif self.dim == 3:
+			self.origin = numpy.array([bbox[0], bbox[2], bbox[4]], dtype=float)
+			self.vectors = numpy.diag([bbox[1] - bbox[0], bbox[3] - bbox[2], bbox[5] - bbox[4]]).astype(float)
+
+		self.dof_coordinates = function_space.tabulate_dof_coordinates().reshape((self.n_dofs, -1))[:, : self.dim]
+		# The pairing depends on the dofs, and on the periodicity
+		checksum = numpy.concatenate(
+			(
+				[self.n_dofs, numpy.sum(self.dof_coordinates), self.tol],
+				self.origin,
+				self.vectors.flatten(),
+			)
+		).astype(float)
+
+		if (filename is not None) and os.path.exists(filename):
+			cache = numpy.load(filename)
+			if (cache["checksum"].shape == checksum.shape) and numpy.allclose(
+				cache["checksum"], checksum, rtol=1e-12, atol=0.0
+			):
+				self.slave_dofs = cache["slave_dofs"]
+				self.master_dofs = cache["master_dofs"]
+			else:
+				self.compute_pairs()
+				numpy.savez(filename, slave_dofs=self.slave_dofs, master_dofs=self.master_dofs, checksum=checksum)
+		else:
+			self.compute_pairs()
+			if filename is not None:
+				numpy.savez(filename, slave_dofs=self.slave_dofs, master_dofs=self.master_dofs, checksum=checksum)
+
+		self.set_prolongation()
+
+		self.A_r = None
+		self.ksp = None
+
+	def get_sub_spaces_dofs(self, function_space):
+		"""Returns the dofs of each (scalar) leaf sub-space, excluding global dofs."""
+		if function_space.num_sub_spaces() == 0:
+			if function_space.ufl_element().family() == "Real":
+				return []
+			return [numpy.array(function_space.dofmap().dofs(), dtype=numpy.int64)]
+		return [
+			dofs
+			for k_sub in range(function_space.num_sub_spaces())
+			for dofs in self.get_sub_spaces_dofs(function_space.sub(k_sub))
+		]
+
+	def compute_pairs(self):
+		"""Computes the slave→master pairing of all sub-spaces."""
+		slave_dofs = []
+		master_dofs = []
+		for dofs in self.get_sub_spaces_dofs(self.function_space):
+			sub_slave_dofs, sub_master_dofs = self.compute_sub_space_pairs(dofs)
+			slave_dofs += [sub_slave_dofs]
+			master_dofs += [sub_master_dofs]
+		self.slave_dofs = numpy.concatenate(slave_dofs) if len(slave_dofs) else numpy.zeros(0, dtype=numpy.int64)
+		self.master_dofs = numpy.concatenate(master_dofs) if len(master_dofs) else numpy.zeros(0, dtype=numpy.int64)
+
+	def compute_sub_space_pairs(self, dofs):
+		"""Computes the slave→master pairing of the dofs of a scalar sub-space.
+
+		:return: (slave_dofs, master_dofs)
+		:rtype: tuple of numpy.ndarray
+		"""
+		coords = self.dof_coordinates[dofs]
+
+		# Coordinates in the basis of the periodicity vectors
+		frac_coords = numpy.linalg.solve(self.vectors.T, (coords - self.origin).T).T
+		frac_tol = self.tol / numpy.linalg.norm(self.vectors, axis=1)
+		on_min = numpy.abs(frac_coords) < frac_tol
+		on_max = numpy.abs(frac_coords - 1.0) < frac_tol
+
+		is_slave = numpy.any(on_max, axis=1)
+		is_candidate = numpy.any(on_min, axis=1) & ~is_slave
+		slave_dofs = dofs[is_slave]
+		images = coords[is_slave] - on_max[is_slave].astype(float) @ self.vectors
+		candidate_dofs = dofs[is_candidate]
+		candidate_coords = coords[is_candidate]
+		if (len(slave_dofs) == 0) or (len(candidate_dofs) == 0):
+			assert len(slave_dofs) == 0, "Periodic pairing failed, no master dofs. Aborting."
+			return slave_dofs, numpy.zeros(0, dtype=numpy.int64)
+
+		# Sorted grid of the candidates, looked up from the image cell & its neighbors
+		origin = numpy.min(coords, axis=0) - 2 * self.tol
+		n_cells = numpy.floor((numpy.max(coords, axis=0) - origin) / self.tol).astype(numpy.int64) + 3
+		strides = numpy.cumprod(numpy.concatenate([[1], n_cells[:-1]]))
+		candidate_keys = numpy.floor((candidate_coords - origin) / self.tol).astype(numpy.int64) @ strides
+		order = numpy.argsort(candidate_keys, kind="stable")
+		candidate_keys = candidate_keys[order]
+		image_cells = numpy.floor((images - origin) / self.tol).astype(numpy.int64)
+
+		master_dofs = numpy.full(len(slave_dofs), -1, dtype=numpy.int64)
+		for offset in itertools.product((0, -1, 1), repeat=self.dim):
+			unmatched = master_dofs < 0
+			if not (numpy.any(unmatched)):
+				break
+			keys = (image_cells[unmatched] + numpy.array(offset)) @ strides
+			positions = numpy.searchsorted(candidate_keys, keys)
+			positions = numpy.minimum(positions, len(candidate_keys) - 1)
+			found = candidate_keys[positions] == keys
+			candidates = order[positions]
+			found &= numpy.linalg.norm(candidate_coords[candidates] - images[unmatched], axis=1) <= self.tol
+			matched = numpy.where(unmatched)[0][found]
+			master_dofs[matched] = candidate_dofs[candidates[found]]
+
+		n_unmatched = numpy.sum(master_dofs < 0)
+		assert n_unmatched == 0, (
+			"Periodic pairing failed for "
+			+ str(n_unmatched)
+			+ " dofs; are the node distributions of opposite faces matching? Aborting."
+		)
+
+		return slave_dofs, master_dofs
+
+	def set_prolongation(self):
+		"""Numbers the independent dofs, and builds the prolongation matrix."""
+		is_slave = numpy.zeros(self.n_dofs, dtype=bool)
+		is_slave[self.slave_dofs] = True
+		self.reduced_dofs = numpy.full(self.n_dofs, -1, dtype=numpy.int64)
+		self.n_reduced_dofs = int(numpy.sum(~is_slave))
+		self.reduced_dofs[~is_slave] = numpy.arange(self.n_reduced_dofs)
+		self.reduced_dofs[self.slave_dofs] = self.reduced_dofs[self.master_dofs]
+
+		self.P = petsc4py.PETSc.Mat().createAIJ(
+			size=(self.n_dofs, self.n_reduced_dofs),
+			csr=(
+				numpy.arange(self.n_dofs + 1, dtype=petsc4py.PETSc.IntType),
+				self.reduced_dofs.astype(petsc4py.PETSc.IntType),
+				numpy.ones(self.n_dofs),
+			),
+			comm=petsc4py.PETSc.COMM_SELF,
+		)
+		self.P.assemble()
+
+	def restrict_matrix(self, A, reuse=False):
+		r"""Computes the reduced matrix :math:`\mathbf{P}^T \mathbf{A} \mathbf{P}`.
+
+		:param A: The matrix assembled on the non-periodic space.
+		:type A: dolfin.PETScMatrix
+		:param reuse: If True, the reduced matrix of the previous call is filled in place.
+		:rtype: petsc4py.PETSc.Mat
+		"""
+		A_mat = dolfin.as_backend_type(A).mat()
+		if reuse and (self.A_r is not None):
+			A_mat.PtAP(self.P, result=self.A_r)
+		else:
+			self.A_r = A_mat.PtAP(self.P)
+		return self.A_r
+
+	def restrict_vector(self, b, b_r=None):
+		r"""Computes the reduced vector :math:`\mathbf{P}^T \mathbf{b}`.
+
+		:rtype: petsc4py.PETSc.Vec
+		"""
+		if b_r is None:
+			b_r = self.P.createVecRight()
+		self.P.multTranspose(dolfin.as_backend_type(b).vec(), b_r)
+		return b_r
+
+	def prolongate_vector(self, x_r, x):
+		r"""Computes :math:`\mathbf{x} = \mathbf{P} \mathbf{x}_r`."""
+		self.P.mult(x_r, dolfin.as_backend_type(x).vec())
+		dolfin.as_backend_type(x).update_ghost_values()
+
+	def solve(self, A, x, b, bc_dofs=None, reuse_matrix=False):
+		r"""Solves a system assembled on the non-periodic space, on the periodic space.
+
+		Dirichlet conditions (already applied to the assembled system, so that
+		:math:`x_i = b_i` at the constrained dofs) are re-imposed on the reduced system.
+		The reduced system is solved with MUMPS; if ``reuse_matrix`` is True, the reduced
+		matrix and its factorization are reused from the previous call. Otherwise, the
+		symbolic product and the solver (and its ordering) are still reused, the sparsity
+		pattern of the assembled matrix being fixed.
+
+		:param A: The matrix assembled on the non-periodic space.
+		:type A: dolfin.PETScMatrix
+		:param x: The solution vector.
+		:type x: dolfin.PETScVector
+		:param b: The right-hand side vector.
+		:type b: dolfin.PETScVector
+		:param bc_dofs: The constrained dofs, if any.
+		:type bc_dofs: numpy.ndarray
+		"""
+		b_r = self.restrict_vector(b)
+
+		if (bc_dofs is not None) and (len(bc_dofs) > 0):
+			bc_dofs = numpy.asarray(bc_dofs, dtype=numpy.int64)
+			bc_rows, bc_indices = numpy.unique(self.reduced_dofs[bc_dofs], return_index=True)
+			bc_vals = dolfin.as_backend_type(b).vec().getValues(bc_dofs[bc_indices].astype(petsc4py.PETSc.IntType))
+		else:
+			bc_rows = numpy.zeros(0, dtype=numpy.int64)
+			bc_vals = numpy.zeros(0)
+		bc_rows = bc_rows.astype(petsc4py.PETSc.IntType)
+
+		if not (reuse_matrix and (self.A_r is not None)):
+			self.restrict_matrix(A, reuse=(self.A_r is not None))
+			x_r = self.A_r.createVecRight()
+			x_r.setValues(bc_rows, bc_vals)
+			x_r.assemble()
+			self.A_r.zeroRowsColumns(bc_rows, diag=1.0, x=x_r, b=b_r)
+
+			if self.ksp is None:
+				self.ksp = petsc4py.PETSc.KSP().create(petsc4py.PETSc.COMM_SELF)
+				self.ksp.setType("preonly")
+				self.ksp.getPC().setType("lu")
+				self.ksp.getPC().setFactorSolverType("mumps")
+			self.ksp.setOperators(self.A_r)
+		else:
+			# The constrained columns are already zeroed, so that only the rows are set
+			b_r.setValues(bc_rows, bc_vals)
+			b_r.assemble()
+
+		x_r = self.A_r.createVecRight()
+		self.ksp.solve(b_r, x_r)
+		self.prolongate_vector(x_r, x)
@@ -0,0 +1,242 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Form compilation cache warm-up.
+
+Provides tools to collect every form a run will JIT compile (residual and
+Jacobian of all steps, FOI local solvers, QOIs), and to compile them ahead of
+time in parallel processes, together with the ``dolfin_mech-precompile``
+command line entry point.
+"""
+
+import argparse
+import importlib
+import json
+import os
+import time
+
+import dolfin
+
+from .multiprocessingcontext import get_multiprocessing_context
+
+################################################################################
+
+
+def get_problem(problem_factory, problem_kwargs={}):
+	"""Builds a problem from a factory.
+
+	:param problem_factory: A callable returning a fully defined problem (mesh, operators, steps, FOIs, QOIs),
+	    or its "module:callable" path.
+	:type problem_factory: str or callable
+	:param problem_kwargs: Keyword arguments passed to the factory.
+	:type problem_kwargs: dict
+	:return: The problem.
+	:rtype: dolfin_mech.problem.Problem
+	"""
+	if type(problem_factory) is str:
+		assert ":" in problem_factory, (
+			"problem_factory (=" + problem_factory + ") should be of the form module:callable. Aborting."
+		)
+		module_name, callable_name = problem_factory.split(":")
+		problem_factory = getattr(importlib.import_module(module_name), callable_name)
+	return problem_factory(**problem_kwargs)
+
+
+def get_foi_mass_form(a_expr, fs, update_type):
+	"""Returns the mass form of a FOI (or FOI batch), as compiled by its update.
+
+	With ``update_type="assemble"``, the diagonal of the mass matrix is assembled as
+	the action of the mass form on a function, which is a different form.
+
+	:rtype: ufl.Form
+	"""
+	if update_type == "assemble":
+		return dolfin.action(a_expr, dolfin.Function(fs))
+	return a_expr
+
+
+def get_problem_forms(problem):
+	"""Collects all the forms that a run of a problem will JIT compile.
+
+	This includes, for each step, the (negated) residual and the Jacobian, as
+	assembled by :py:class:`dolfin_mech.Assembler`, the vertex-based integrals,
+	the mass and right-hand side forms of the FOI batches and of the other FOIs
+	updated by local solver or direct evaluation, and the forms of the QOIs updated by assembly.
+	Forms generated internally by ``dolfin.project`` are not included.
+
+	Note that this calls ``problem.set_variational_formulation`` for each step.
+
+	:param problem: The problem.
+	:type problem: dolfin_mech.problem.Problem
+	:return: List of (name, form, form_compiler_parameters) tuples, in a deterministic order.
+	:rtype: list
+	"""
+	forms = []
+
+	for k_step in range(len(problem.steps)):
+		problem.set_variational_formulation(k_step=k_step)
+		forms += [("step" + str(k_step + 1) + "-res", -problem.res_form, problem.form_compiler_parameters)]
+		forms += [("step" + str(k_step + 1) + "-jac", problem.jac_form, problem.form_compiler_parameters)]
+
+	for k_operator, operator in enumerate(problem.operators):
+		if operator.measure.integral_type() == "vertex":
+			forms += [("vertex" + str(k_operator) + "-res", -operator.res_form, problem.form_compiler_parameters)]
+			forms += [
+				(
+					"vertex" + str(k_operator) + "-jac",
+					dolfin.derivative(operator.res_form, problem.sol_func, problem.dsol_tria),
+					problem.form_compiler_parameters,
+				)
+			]
+
+	if hasattr(problem, "Pi_expr"):
+		forms += [("energy", problem.Pi_expr, problem.form_compiler_parameters)]
+
+	problem.set_foi_batches()
+	for k_foi_batch, foi_batch in enumerate(problem.foi_batches):
+		forms += [
+			(
+				"foibatch" + str(k_foi_batch) + "-a",
+				get_foi_mass_form(foi_batch.a_expr, foi_batch.fois[0].fs, foi_batch.update_type),
+				None,
+			)
+		]
+		forms += [("foibatch" + str(k_foi_batch) + "-b", foi_batch.b_expr, None)]
+	for foi in problem.unbatched_fois:
+		if foi.update_type in ("local_solver", "assemble"):
+			name = getattr(foi, "name", "foi")
+			forms += [("foi-" + name + "-a", get_foi_mass_form(foi.a_expr, foi.fs, foi.update_type), None)]
+			forms += [("foi-" + name + "-b", foi.b_expr, None)]
+
+	for qoi in problem.qois:
+		if qoi.update == qoi.update_assembly:
+			if qoi.expr is not None:
+				forms += [("qoi-" + qoi.name, qoi.expr, qoi.form_compiler_parameters)]
+			else:
+				for k_expr, expr in enumerate(qoi.expr_lst):
+					forms += [("qoi-" + qoi.name + "-" + str(k_expr + 1), expr, qoi.form_compiler_parameters)]
+
+	return forms
+
+
+def is_form_cached(form, form_compiler_parameters=None):
+	"""Checks whether a form is already in the FFC/dijitso JIT cache.
+
+	The module name is computed as in ``dolfin.jit.ffc_jit``, and looked up in the
+	dijitso library directory. This relies on FFC & dijitso internals, so that
+	any failure is reported as unknown.
+
+	:return: True if cached, False if not, None if unknown.
+	:rtype: bool or None
+	"""
+	try:
+		import dijitso
+		import ffc
+		import ffc.jitcompiler
+		import ffc.parameters
+
+		parameters = ffc.default_jit_parameters()
+		parameters.update(dict(dolfin.parameters["form_compiler"]))
+		parameters.update(form_compiler_parameters or {})
+		parameters = ffc.parameters.validate_jit_parameters(parameters)
+		kind, module_name = ffc.jitcompiler.compute_jit_prefix(form, parameters)
+		cache_params = dijitso.validate_params({"cache": {"cache_dir": parameters["cache_dir"]}})["cache"]
+		lib_filename = os.path.join(
+			cache_params["cache_dir"],
+			cache_params["lib_dir"],
+			cache_params["lib_prefix"] + module_name + cache_params["lib_postfix"],
+		)
+		return os.path.exists(lib_filename)
+	except Exception:
+		return None
+
+
+def precompile_problem_forms(problem_factory, problem_kwargs={}, k_proc=0, n_procs=1):
+	"""Compiles the forms of a problem assigned to a given process.
+
+	The problem is rebuilt from its factory (forms cannot be sent across
+	processes), and forms are assigned round-robin to processes.
+
+	:return: List of (name, status, time) tuples, status being "hit", "miss" or "unknown".
+	:rtype: list
+	"""
+	problem = get_problem(problem_factory, problem_kwargs)
+	forms = get_problem_forms(problem)
+
+	report = []
+	for name, form, form_compiler_parameters in forms[k_proc::n_procs]:
+		is_cached = is_form_cached(form, form_compiler_parameters)
+		timer = time.time()
+		dolfin.Form(form, form_compiler_parameters=form_compiler_parameters)
+		timer = time.time() - timer
+		status = "unknown" if (is_cached is None) else ("hit" if is_cached else "miss")
+		report += [(name, status, timer)]
+	return report
+
+
+def _precompile_problem_forms_star(args):
+	return precompile_problem_forms(*args)
+
+
+def precompile(problem_factory, problem_kwargs={}, n_procs=1, verbose=True):
+	"""Pre-compiles every form a run of a problem will need, in parallel processes.
+
+	:param problem_factory: "module:callable" path of a callable returning a fully defined problem.
+	:type problem_factory: str
+	:param problem_kwargs: Keyword arguments passed to the factory (must be picklable).
+	:type problem_kwargs: dict
+	:param n_procs: Number of compilation processes.
+	:type n_procs: int
+	:param verbose: If True, prints the cache report.
+	:return: List of (name, status, time) tuples, status being "hit", "miss" or "unknown".
+	:rtype: list
+	"""
+	assert n_procs >= 1, "n_procs (=" + str(n_procs) + ") should be positive. Aborting."
+
+	if n_procs == 1:
+		report = precompile_problem_forms(problem_factory, problem_kwargs)
+	else:
+		with get_multiprocessing_context().Pool(n_procs) as pool:
+			reports = pool.map(
+				_precompile_problem_forms_star,
+				[(problem_factory, problem_kwargs, k_proc, n_procs) for k_proc in range(n_procs)],
+			)
+		report = [line for report in reports for line in report]
+
+	if verbose:
+		for name, status, timer in report:
+			print(name + ": " + status + " (" + str(timer) + " s)")
+		n_hits = len([line for line in report if line[1] == "hit"])
+		n_misses = len([line for line in report if line[1] == "miss"])
+		print(
+			str(len(report))
+			+ " forms: "
+			+ str(n_hits)
+			+ " hits, "
+			+ str(n_misses)
+			+ " misses, "
+			+ str(len(report) - n_hits - n_misses)
+			+ " unknown"
+		)
+
+	return report
+
+
+def main(argv=None):
+	"""Entry point of the ``dolfin_mech-precompile`` command."""
+	parser = argparse.ArgumentParser(
+		description="Pre-compiles all the forms of a dolfin_mech problem, and reports the JIT cache status."
+	)
+	parser.add_argument("problem_factory", help="module:callable returning a fully defined problem")
+	parser.add_argument("--kwargs", default="{}", help="JSON dict of keyword arguments passed to the factory")
+	parser.add_argument("--n_procs", type=int, default=1, help="number of compilation processes")
+	args = parser.parse_args(argv)
+
+	precompile(problem_factory=args.problem_factory, problem_kwargs=json.loads(args.kwargs), n_procs=args.n_procs)
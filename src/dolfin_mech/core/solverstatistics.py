@@ -0,0 +1,170 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Defines the SolverStatistics class.
+
+Collects machine-readable records of the nonlinear iterations and time steps
+of a run, and exports them (CSV, JSON, Parquet) together with per-step summaries.
+"""
+
+import csv
+import json
+import math
+import resource
+
+import dolfin
+
+################################################################################
+
+
+class SolverStatistics:
+	"""In-memory records of the solver iterations and time steps.
+
+	Records are dicts of numbers (or booleans), appended by :py:class:`dolfin_mech.NonlinearSolver`
+	(one per Newton iteration) and :py:class:`dolfin_mech.TimeIntegrator` (one per time step attempt,
+	converged or not). Per-step summaries are aggregated from them when exporting.
+
+	Iteration records contain k_step, k_t, k_iter, t, dt, n_dofs, assembly_time & solve_time (s),
+	jac_updated, res_norm, res_err, relax, the norms & errors of the sub-solution increments,
+	success, and maxrss (the peak resident memory of the process, in MB).
+	Time step records contain k_step, k_t, t, dt, n_iter, success, solver_time & write_time (s), and maxrss.
+	"""
+
+	formats = ("csv", "json", "parquet")
+
+	def __init__(self):
+		"""Initializes the SolverStatistics."""
+		self.iterations = []
+		self.time_steps = []
+
+	@staticmethod
+	def get_maxrss():
+		"""Returns the peak resident memory of the process, in MB."""
+		return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+	def add_iteration(self, **record):
+		"""Appends an iteration record."""
+		record["maxrss"] = self.get_maxrss()
+		self.iterations += [record]
+
+	def add_time_step(self, **record):
+		"""Appends a time step record."""
+		record["maxrss"] = self.get_maxrss()
+		self.time_steps += [record]
+
+	def get_step_summaries(self):
+		"""Aggregates the records per step.
+
+		:return: One record per step, with the number of converged & failed time steps, the total
+		    number of iterations, and the total solver, assembly, solve & write times.
+		:rtype: list of dict
+		"""
+		summaries = {}
+		for record in self.time_steps:
+			summary = summaries.setdefault(
+				record["k_step"],
+				{
+					"k_step": record["k_step"],
+					"n_time_steps": 0,
+					"n_failed_time_steps": 0,
+					"n_iter": 0,
+					"n_iter_failed": 0,
+					"solver_time": 0.0,
+					"assembly_time": 0.0,
+					"solve_time": 0.0,
+					"write_time": 0.0,
+					"maxrss": 0.0,
+				},
+			)
+			if record["success"]:
+				summary["n_time_steps"] += 1
+				summary["n_iter"] += record["n_iter"]
+			else:
+				summary["n_failed_time_steps"] += 1
+				summary["n_iter_failed"] += record["n_iter"]
+			summary["solver_time"] += record["solver_time"]
+			summary["write_time"] += record["write_time"]
+			summary["maxrss"] = max(summary["maxrss"], record["maxrss"])
+		for record in self.iterations:
+			if record["k_step"] in summaries:
+				summaries[record["k_step"]]["assembly_time"] += record["assembly_time"]
+				summaries[record["k_step"]]["solve_time"] += record["solve_time"]
+		for summary in summaries.values():
+			summary["n_iter_per_time_step"] = summary["n_iter"] / max(1, summary["n_time_steps"])
+		return [summaries[k_step] for k_step in sorted(summaries)]
+
+	def get_tables(self):
+		"""Returns the tables to export, as a dict of lists of records."""
+		return {"iterations": self.iterations, "time_steps": self.time_steps, "steps": self.get_step_summaries()}
+
+	@staticmethod
+	def get_columns(records):
+		"""Returns the union of the keys of some records, in order of appearance."""
+		columns = []
+		for record in records:
+			for key in record:
+				if key not in columns:
+					columns += [key]
+		return columns
+
+	@staticmethod
+	def get_json_value(value):
+		"""Converts a value to a JSON compatible one (NaN & inf are not valid JSON)."""
+		if isinstance(value, float) and not (math.isfinite(value)):
+			return None
+		return value
+
+	def write(self, filebasename, formats=("csv",)):
+		"""Exports the records, on the first process only.
+
+		- ``"csv"``: one file per table (``filebasename-iterations.csv``, ``-time_steps.csv``, ``-steps.csv``);
+		- ``"json"``: all tables in ``filebasename.json``;
+		- ``"parquet"``: one file per table, requires pandas & pyarrow (or fastparquet).
+
+		:param filebasename: Base name of the files.
+		:type filebasename: str
+		:param formats: List of formats.
+		:type formats: list of str
+		"""
+		for file_format in formats:
+			assert file_format in self.formats, (
+				"format (=" + str(file_format) + ") should be in " + str(self.formats) + ". Aborting."
+			)
+
+		if dolfin.MPI.rank(dolfin.MPI.comm_world) > 0:
+			return
+
+		tables = self.get_tables()
+
+		if "csv" in formats:
+			for name, records in tables.items():
+				with open(filebasename + "-" + name + ".csv", "w", newline="") as file:
+					writer = csv.DictWriter(file, fieldnames=self.get_columns(records), restval="")
+					writer.writeheader()
+					writer.writerows(records)
+
+		if "json" in formats:
+			with open(filebasename + ".json", "w") as file:
+				json.dump(
+					{
+						name: [{key: self.get_json_value(value) for key, value in record.items()} for record in records]
+						for name, records in tables.items()
+					},
+					file,
+					indent=1,
+				)
+
+		if "parquet" in formats:
+			import pandas
+
+			for name, records in tables.items():
+				pandas.DataFrame.from_records(records, columns=self.get_columns(records)).to_parquet(
+					filebasename + "-" + name + ".parquet"
+				)
@@ -0,0 +1,216 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""C++ backend of the periodic boundary mapping.
+
+Provides a pybind11-compiled equivalent of :py:class:`dolfin_mech.PeriodicSubDomain`,
+so that dolfin does not call back into Python for every boundary vertex and dof
+when building periodic function spaces.
+"""
+
+import dolfin
+
+from .subdomain_periodic import PeriodicSubDomain
+
+################################################################################
+
+
+def get_PeriodicSubDomain_cpp_pybind():
+	"""Return the C++ source code for a pybind11-based periodic dolfin SubDomain.
+
+	The ``PeriodicSubDomainCpp`` class implements the same ``inside`` and ``map``
+	methods as :py:class:`dolfin_mech.PeriodicSubDomain`, with the same tolerance
+	rules: in 2D, the unit cell is the parallelogram defined by its four vertices;
+	in 3D, it is the box defined by its bounding box.
+
+	Returns:
+	    str: The complete C++ source code string to be compiled by
+	    :py:func:`dolfin.compile_cpp_code`.
+	"""
+	cpp_code = """
+#include <pybind11/pybind11.h>
+#include <pybind11/eigen.h>
+#include <pybind11/stl.h>
+
+#include <dolfin/common/math.h>
+#include <dolfin/mesh/SubDomain.h>
+
+class PeriodicSubDomainCpp : public dolfin::SubDomain
+{
+public:
+    int dim;
+    double tol;
+    // bounding box: xmin, xmax, ymin, ymax, (zmin, zmax)
+    std::vector<double> bb;
+    // vertices of the unit cell (2D): v0x, v0y, v1x, v1y, v2x, v2y, v3x, v3y
+    std::vector<double> vv;
+    // vectors generating periodicity (2D)
+    double a1[2], a2[2];
+
+    PeriodicSubDomainCpp(
+        int dim_,
+        double tol_,
+        std::vector<double> bb_,
+        std::vector<double> vv_) : dolfin::SubDomain(tol_), dim(dim_), tol(tol_), bb(bb_), vv(vv_)
+    {
+        a1[0] = vv[2] - vv[0]; a1[1] = vv[3] - vv[1];
+        a2[0] = vv[6] - vv[0]; a2[1] = vv[7] - vv[1];
+    }
+
+    bool near(double x, double x0) const
+    {
+        return dolfin::near(x, x0, tol);
+    }
+
+    bool inside(Eigen::Ref<const Eigen::VectorXd> x, bool on_boundary) const override
+    {
+        if (!on_boundary)
+            return false;
+        if (dim == 2)
+        {
+            // on left or bottom boundary, but not on bottom-right or top-left vertices
+            return (near(x[0], vv[0] + x[1] * a2[0] / vv[7])
+                 || near(x[1], vv[1] + x[0] * a1[1] / vv[2]))
+                && !((near(x[0], vv[2]) && near(x[1], vv[3]))
+                  || (near(x[0], vv[6]) && near(x[1], vv[7])));
+        }
+        else
+        {
+            // on a min face, but not on a max face
+            return (near(x[0], bb[0]) || near(x[1], bb[2]) || near(x[2], bb[4]))
+               && !(near(x[0], bb[1]) || near(x[1], bb[3]) || near(x[2], bb[5]));
+        }
+    }
+
+    void map(Eigen::Ref<const Eigen::VectorXd> x, Eigen::Ref<Eigen::VectorXd> y) const override
+    {
+        if (dim == 2)
+        {
+            if (near(x[0], vv[4]) && near(x[1], vv[5])) // top-right corner
+            {
+                y[0] = x[0] - (a1[0] + a2[0]);
+                y[1] = x[1] - (a1[1] + a2[1]);
+            }
+            else if (near(x[0], vv[2] + x[1] * a2[0] / vv[5])) // right boundary
+            {
+                y[0] = x[0] - a1[0];
+                y[1] = x[1] - a1[1];
+            }
+            else // top boundary
+            {
+                y[0] = x[0] - a2[0];
+                y[1] = x[1] - a2[1];
+            }
+        }
+        else
+        {
+            const bool x_min = near(x[0], bb[0]), x_max = near(x[0], bb[1]);
+            const bool y_min = near(x[1], bb[2]), y_max = near(x[1], bb[3]);
+            const bool z_min = near(x[2], bb[4]), z_max = near(x[2], bb[5]);
+            const bool x_on = x_min || x_max, y_on = y_min || y_max, z_on = z_min || z_max;
+            const bool any_max = x_max || y_max || z_max;
+            if (x_on && y_on && z_on && any_max) // vertices
+            {
+                y[0] = bb[0];
+                y[1] = bb[2];
+                y[2] = bb[4];
+            }
+            else if (x_on && y_on && (x_max || y_max)) // edges along z
+            {
+                y[0] = bb[0];
+                y[1] = bb[2];
+                y[2] = x[2];
+            }
+            else if (x_on && z_on && (x_max || z_max)) // edges along y
+            {
+                y[0] = bb[0];
+                y[1] = x[1];
+                y[2] = bb[4];
+            }
+            else if (y_on && z_on && (y_max || z_max)) // edges along x
+            {
+                y[0] = x[0];
+                y[1] = bb[2];
+                y[2] = bb[4];
+            }
+            else if (x_max) // faces
+            {
+                y[0] = bb[0];
+                y[1] = x[1];
+                y[2] = x[2];
+            }
+            else if (y_max)
+            {
+                y[0] = x[0];
+                y[1] = bb[2];
+                y[2] = x[2];
+            }
+            else if (z_max)
+            {
+                y[0] = x[0];
+                y[1] = x[1];
+                y[2] = bb[4];
+            }
+            else // the point must always end up mapped somewhere
+            {
+                y[0] = -1000.;
+                y[1] = -1000.;
+                y[2] = -1000.;
+            }
+        }
+    }
+};
+
+PYBIND11_MODULE(SIGNATURE, m)
+{
+pybind11::class_<PeriodicSubDomainCpp, std::shared_ptr<PeriodicSubDomainCpp>, dolfin::SubDomain>
+(m, "PeriodicSubDomainCpp")
+.def(pybind11::init<int, double, std::vector<double>, std::vector<double>>());
+}
+"""
+
+	return cpp_code
+
+
+periodic_subdomain_cpp_module = None
+
+
+def get_PeriodicSubDomain(dim, bbox, vertices=None, tol=None, pbc_type="cpp"):
+	"""Return a periodic SubDomain, to be used as ``constrained_domain`` of a FunctionSpace.
+
+	:param dim: Spatial dimension (2 or 3).
+	:type dim: int
+	:param bbox: Bounding box coordinates ``[xmin, xmax, ymin, ymax, (zmin, zmax)]``.
+	:type bbox: list
+	:param vertices: (Optional) Array of RVE vertices for non-rectangular (2D) domains.
+	:type vertices: numpy.ndarray
+	:param tol: Geometric tolerance, defaults to 1e-3 times the bounding box diagonal.
+	:type tol: float
+	:param pbc_type: ``"cpp"`` (compiled, default) or ``"python"`` (:py:class:`dolfin_mech.PeriodicSubDomain`).
+	:type pbc_type: str
+	:return: The SubDomain.
+	:rtype: dolfin.SubDomain
+	"""
+	assert pbc_type in ("cpp", "python"), "pbc_type (=" + str(pbc_type) + ") should be cpp or python. Aborting."
+
+	# The Python SubDomain checks the geometry & computes the default tolerance
+	periodic_sd = PeriodicSubDomain(dim, bbox, vertices, tol)
+	if pbc_type == "python":
+		return periodic_sd
+
+	global periodic_subdomain_cpp_module
+	if periodic_subdomain_cpp_module is None:
+		periodic_subdomain_cpp_module = dolfin.compile_cpp_code(get_PeriodicSubDomain_cpp_pybind())
+	return periodic_subdomain_cpp_module.PeriodicSubDomainCpp(
+		dim,
+		float(periodic_sd.tol),
+		[float(val) for val in bbox],
+		[float(val) for val in periodic_sd.vv.flatten()],
+	)
@@ -11,10 +11,19 @@
 """Main driver for time-dependent FEA simulations with adaptive time-stepping."""
 
 import sys
+import time
 
 import dolfin
 import myPythonLibrary as mypy
-
+import numpy
+
+from .arclengthsolver import ArcLengthSolver
+from .asyncwriter import AsyncWriter
+from .checkpoint import read_checkpoint, write_checkpoint
+from .compactxdmffile import CompactXDMFFile
+from .mesh2ugrid import is_ugrid_function
+from .outputschedule import OutputSchedule
+from .solverstatistics import SolverStatistics
 from .write_vtu_file import write_VTU_file
 from .xdmffile import XDMFFile
 
@@ -68,14 +77,67 @@ class TimeIntegrator:
 	    - ``n_iter_for_decel`` (int): Min iterations to trigger time step decrease.
 	    - ``accel_coeff`` (float): Factor to increase ``dt`` by.
 	    - ``decel_coeff`` (float): Factor to decrease ``dt`` by.
+	    - ``predictor`` (str): Initial guess of the Newton iterations: ``"none"`` (last converged solution,
+	      default), ``"linear"`` or ``"quadratic"`` (extrapolation from the last two or three converged
+	      solutions of the step, with the constrained dofs kept at their last converged values, so that the
+	      constraint increments are imposed as usual during the first iteration).
+	    - ``dt_controller`` (str): ``"n_iter"`` (default, ``dt`` driven by the number of Newton iterations) or
+	      ``"error"`` (``dt`` driven by an estimate of the local truncation error of the backward Euler step,
+	      obtained by comparing the solution with the linear extrapolation of the two previous solutions,
+	      through a PI controller; steps with an estimated error larger than the tolerance are rejected, and
+	      retried with a smaller ``dt``, down to ``dt_min``, at which they are accepted with a warning).
+	    - ``error_rtol``, ``error_atol`` (float): Relative & absolute tolerances of the error estimate.
+	    - ``error_safety`` (float): Safety factor of the error controller.
+	    - ``error_fac_min``, ``error_fac_max`` (float): Bounds of the ``dt`` factor of the error controller.
+	    - ``continuation`` (str): ``"none"`` (default, load control: the operators and constraints of the
+	      steps follow the time) or ``"arc_length"`` (load-path continuation, through an
+	      :py:class:`dolfin_mech.ArcLengthSolver`: the load factor of the operators of the steps is an unknown,
+	      and ``dt`` is the arc-length, expressed in time units, so that it is controlled by ``dt_ini``,
+	      ``dt_min`` & ``dt_max`` of the steps as usual; time can then decrease, e.g., after a limit point.
+	      The last time increment of each step is load controlled, to reach exactly ``t_fin``. Only for
+	      quasi-static problems, with constant step constraints, without internal variables, predictor nor
+	      error controller, and with output schedules that do not clip ``dt``).
+
+	    The solver Jacobian is invalidated at the beginning of each step, after each failed
+	    solve, and whenever ``dt`` changes, so that, if the solver carries its Jacobian over
+	    (``jac_update_carry_over``), it is only reused across time steps of same size.
+
+	    FOIs are evaluated lazily: they are only updated when the solution is written,
+	    when a QOI depends on them, or when read through :py:meth:`dolfin_mech.Problem.get_foi`.
 	:type parameters: dict
 	:param print_out: Enable/disable main log file output.
 	:param print_sta: Enable/disable statistics table output (.sta file).
 	:param write_qois: Enable/disable writing Quantity of Interest data (.dat file).
 	:param write_sol: Enable/disable writing full field solution (.xdmf file).
 	:param write_vtus: Enable/disable writing VTU files for ParaView.
+	:param write_qois_schedule: When to write QOIs, as an :py:class:`dolfin_mech.OutputSchedule`
+	    or a dict of its parameters (e.g., ``{"n_steps": 10}``, ``{"times": [0.5, 1.0]}``, ``{"dt": 0.1}``).
+	    Defaults to every converged time step.
+	:param write_sol_schedule: When to write the solution (.xdmf file), cf. ``write_qois_schedule``.
+	:param write_vtus_schedule: When to write VTU files, cf. ``write_qois_schedule``.
+	:param write_xmls_schedule: When to write XML files, cf. ``write_qois_schedule``.
+	:param write_sol_async: If True (or ``"thread"``), the solution (.xdmf file) and VTU files
+	    are written in the background by an :py:class:`dolfin_mech.AsyncWriter`, so that the time loop
+	    does not wait for disk I/O; only the compact solution file and the VTU files with preserved
+	    connectivity can be written in the background, the others are written immediately.
+	:param write_sol_compact: If True (or a dict of its parameters, e.g., ``{"compression": "gzip"}``), the
+	    solution is written to a :py:class:`dolfin_mech.CompactXDMFFile` (mesh written once, one HDF5 dataset
+	    per field), without the ``_old`` fields.
+	:param write_checkpoint: Enable/disable writing checkpoints (.h5 file), overwritten each time, from which
+	    a run can be restarted. Not compatible with arc-length continuation.
+	:param write_checkpoint_schedule: When to write checkpoints, cf. ``write_qois_schedule``.
+	:param restart_from: Path to a checkpoint file. The integrator state (solution, internal variables,
+	    time-varying constants, step, time, time increment, and converged solutions & error estimate of the
+	    step, used by the predictor & error controller) is restored from it, and the integration
+	    continues from there. The problem must be built as for the checkpointed run, and outputs are written
+	    from the restart time on, so they should be given new names.
+	:param write_statistics: Enable/disable collecting :py:class:`dolfin_mech.SolverStatistics` (per-iteration
+	    and per-time step records, with timings, norms and memory, and per-step summaries), written when closing.
+	:param write_statistics_formats: Formats of the statistics files, among ``"csv"``, ``"json"`` & ``"parquet"``.
 	"""
 
+	checkpoint_state_keys = ["k_step", "k_t", "k_t_tot", "n_iter_tot", "t", "dt", "err_old"]
+
 	def __init__(
 		self,
 		problem,
@@ -89,6 +151,17 @@ class TimeIntegrator:
 		write_vtus=False,
 		write_vtus_with_preserved_connectivity=False,
 		write_xmls=False,
+		write_qois_schedule=None,
+		write_sol_schedule=None,
+		write_vtus_schedule=None,
+		write_xmls_schedule=None,
+		write_sol_async=False,
+		write_sol_compact=False,
+		write_checkpoint=False,
+		write_checkpoint_schedule=None,
+		restart_from=None,
+		write_statistics=False,
+		write_statistics_formats=["csv"],
 	):
 		"""Initializes the TimeIntegrator."""
 		self.problem = problem
@@ -100,6 +173,41 @@ class TimeIntegrator:
 		self.accel_coeff = parameters.get("accel_coeff", 2)
 		self.decel_coeff = parameters.get("decel_coeff", 2)
 
+		self.predictor = parameters.get("predictor", "none")
+		assert self.predictor in ("none", "linear", "quadratic"), (
+			"predictor (=" + str(self.predictor) + ") should be none, linear or quadratic. Aborting."
+		)
+		self.predictor_n_states = {"none": 1, "linear": 2, "quadratic": 3}[self.predictor]
+
+		self.dt_controller = parameters.get("dt_controller", "n_iter")
+		assert self.dt_controller in ("n_iter", "error"), (
+			"dt_controller (=" + str(self.dt_controller) + ") should be n_iter or error. Aborting."
+		)
+		self.error_rtol = parameters.get("error_rtol", 1e-3)
+		self.error_atol = parameters.get("error_atol", 1e-6)
+		self.error_safety = parameters.get("error_safety", 0.9)
+		self.error_fac_min = parameters.get("error_fac_min", 0.2)
+		self.error_fac_max = parameters.get("error_fac_max", 5.0)
+
+		self.continuation = parameters.get("continuation", "none")
+		assert self.continuation in ("none", "arc_length"), (
+			"continuation (=" + str(self.continuation) + ") should be none or arc_length. Aborting."
+		)
+		if self.continuation == "arc_length":
+			assert isinstance(self.solver, ArcLengthSolver), (
+				"Arc-length continuation requires an ArcLengthSolver. Aborting."
+			)
+			assert (self.predictor == "none") and (self.dt_controller == "n_iter"), (
+				"Arc-length continuation is not compatible with predictor & error controller. Aborting."
+			)
+			assert len(self.problem.inelastic_behaviors_internal) == 0, (
+				"Arc-length continuation is not compatible with internal variables, which are updated at"
+				" prescribed times. Aborting."
+			)
+
+		# Converged solutions kept for the predictor & error estimate
+		self.sol_history_n_states = max(self.predictor_n_states, 3 if (self.dt_controller == "error") else 1)
+
 		if type(print_out) is str:
 			if print_out == "stdout":
 				self.printer_filename = None
@@ -127,8 +235,28 @@ class TimeIntegrator:
 			silent=not (print_sta),
 		)
 
+		if (write_checkpoint) or (restart_from is not None):
+			assert self.continuation == "none", "Checkpoints are not compatible with arc-length continuation. Aborting."
+
+		if restart_from is not None:
+			self.restart_state = read_checkpoint(
+				filename=restart_from, problem=self.problem, state_keys=self.checkpoint_state_keys
+			)
+			self.printer.print_str("Restarting from " + restart_from + " at t = " + str(self.restart_state["t"]))
+			t_ini = self.restart_state["t"]
+			k_t_tot_ini = int(self.restart_state["k_t_tot"])
+		else:
+			self.restart_state = None
+			t_ini = 0.0
+			k_t_tot_ini = 0
+
+		self.output_schedules = []
+
 		self.write_qois = bool(write_qois) and (len(self.problem.qois) > 0)
 		if self.write_qois:
+			self.write_qois_schedule = OutputSchedule.from_parameter(write_qois_schedule)
+			self.output_schedules += [self.write_qois_schedule]
+
 			self.write_qois_filebasename = write_qois if (type(write_qois) is str) else sys.argv[0][:-3] + "-qois"
 
 			self.qoi_printer = mypy.DataPrinter(
@@ -138,42 +266,264 @@ class TimeIntegrator:
 			)
 
 			self.problem.update_qois(dt=1)
-			self.qoi_printer.write_line([0.0] + [qoi.value for qoi in self.problem.qois])
+			self.qoi_printer.write_line([t_ini] + [qoi.value for qoi in self.problem.qois])
 
-		self.problem.update_fois()
 		self.write_sol = bool(write_sol)
 		if self.write_sol:
+			self.write_sol_schedule = OutputSchedule.from_parameter(write_sol_schedule)
+			self.output_schedules += [self.write_sol_schedule]
+
+			self.problem.update_fois_if_needed()
+
 			self.write_sol_filebasename = write_sol if (type(write_sol) is str) else sys.argv[0][:-3] + "-sol"
 
 			self.functions_to_write = []
 			self.functions_to_write += self.problem.get_subsols_func_lst()
-			self.functions_to_write += self.problem.get_subsols_func_old_lst()
+			if not (write_sol_compact):
+				self.functions_to_write += self.problem.get_subsols_func_old_lst()
 			self.functions_to_write += self.problem.get_fois_func_lst()
 
-			self.xdmf_file_sol = XDMFFile(
-				filename=self.write_sol_filebasename + ".xdmf", functions=self.functions_to_write
-			)
-			self.xdmf_file_sol.write(0.0)
-
 			self.write_vtus = bool(write_vtus)
 			self.write_vtus_with_preserved_connectivity = bool(write_vtus_with_preserved_connectivity)
-			if self.write_vtus:
-				write_VTU_file(
-					filebasename=self.write_sol_filebasename,
-					function=self.problem.displacement_subsol.subfunc,
-					time=0,
-					preserve_connectivity=self.write_vtus_with_preserved_connectivity,
+			if self.write_vtus_with_preserved_connectivity:
+				# Only the current values of the functions supported by the VTU writer
+				self.vtu_functions = [
+					function
+					for function in self.problem.get_subsols_func_lst() + self.problem.get_fois_func_lst()
+					if is_ugrid_function(function)
+				]
+			else:
+				self.vtu_functions = [self.problem.displacement_subsol.subfunc]
+
+			self.write_sol_async = bool(write_sol_async)
+			if self.write_sol_async:
+				self.xdmf_file_sol = AsyncWriter(
+					filename=self.write_sol_filebasename + ".xdmf",
+					functions=self.functions_to_write,
+					mode=write_sol_async if (type(write_sol_async) is str) else "thread",
+					compact=write_sol_compact,
+				)
+			elif write_sol_compact:
+				self.xdmf_file_sol = CompactXDMFFile(
+					filename=self.write_sol_filebasename + ".xdmf",
+					functions=self.functions_to_write,
+					**(write_sol_compact if (type(write_sol_compact) is dict) else {}),
+				)
+			else:
+				self.xdmf_file_sol = XDMFFile(
+					filename=self.write_sol_filebasename + ".xdmf", functions=self.functions_to_write
 				)
+			self.xdmf_file_sol.write(t_ini)
+
+			if self.write_vtus:
+				self.write_vtus_schedule = OutputSchedule.from_parameter(write_vtus_schedule)
+				self.output_schedules += [self.write_vtus_schedule]
+
+				self.write_vtu(time=k_t_tot_ini)
 
 			self.write_xmls = bool(write_xmls)
 			if self.write_xmls:
+				self.write_xmls_schedule = OutputSchedule.from_parameter(write_xmls_schedule)
+				self.output_schedules += [self.write_xmls_schedule]
+
 				(
-					dolfin.File(self.write_sol_filebasename + "_" + str(0).zfill(3) + ".xml")
+					dolfin.File(self.write_sol_filebasename + "_" + str(k_t_tot_ini).zfill(3) + ".xml")
 					<< self.problem.displacement_subsol.subfunc
 				)
 
+		self.set_write_checkpoint(write_checkpoint, write_checkpoint_schedule)
+
+		if self.continuation == "arc_length":
+			assert all(
+				[
+					not (output_schedule.clip_dt) or ((output_schedule.times is None) and (output_schedule.dt is None))
+					for output_schedule in self.output_schedules
+				]
+			), (
+				"Arc-length continuation cannot hit output times; use n_steps or clip_dt=False output schedules."
+				" Aborting."
+			)
+
+		self.write_statistics = bool(write_statistics)
+		if self.write_statistics:
+			self.statistics = SolverStatistics()
+			self.write_statistics_filebasename = (
+				write_statistics if (type(write_statistics) is str) else sys.argv[0][:-3] + "-statistics"
+			)
+			self.write_statistics_formats = write_statistics_formats
+		else:
+			self.statistics = None
+		self.solver.statistics = self.statistics
+
+	def set_write_checkpoint(self, write_checkpoint, write_checkpoint_schedule):
+		"""Sets up checkpoint writing."""
+		self.write_checkpoint = bool(write_checkpoint)
+		if self.write_checkpoint:
+			self.write_checkpoint_schedule = OutputSchedule.from_parameter(write_checkpoint_schedule)
+			self.output_schedules += [self.write_checkpoint_schedule]
+
+			self.write_checkpoint_filename = (
+				write_checkpoint if (type(write_checkpoint) is str) else sys.argv[0][:-3] + "-checkpoint"
+			) + ".h5"
+
+	def write_checkpoint_file(self, k_step, k_t, k_t_tot, n_iter_tot, t, dt):
+		"""Writes the current integrator state to the checkpoint file."""
+		self.printer.print_str("Writing checkpoint…", newline=False)
+		timer = time.time()
+		write_checkpoint(
+			filename=self.write_checkpoint_filename,
+			problem=self.problem,
+			state={
+				"k_step": k_step,
+				"k_t": k_t,
+				"k_t_tot": k_t_tot,
+				"n_iter_tot": n_iter_tot,
+				"t": t,
+				"dt": dt,
+				"err_old": 0.0 if (self.err_old is None) else self.err_old,
+			},
+			sol_history=self.sol_history if (k_t > 0) else [],
+		)
+		timer = time.time() - timer
+		self.printer.print_str(" " + str(timer) + " s", tab=False)
+
+	def get_output_dt_step(self, t, dt_step):
+		"""Adjusts the time increment of a time step to hit the next output time, if any.
+
+		The increment is clipped if the time step would go beyond the next output time, and extended
+		if it would stop short of it by less than ``dt_min``, so that no time step smaller than
+		``dt_min`` is left to reach it.
+
+		:param t: The current time.
+		:type t: float
+		:param dt_step: The time increment, clipped to the end of the step.
+		:type dt_step: float
+		:return: The adjusted time increment.
+		:rtype: float
+		"""
+		t_nexts = [output_schedule.get_next_time(t) for output_schedule in self.output_schedules]
+		t_nexts = [t_next for t_next in t_nexts if (t_next is not None) and (t_next <= self.step.t_fin + 1e-9)]
+		if len(t_nexts) == 0:
+			return dt_step
+		t_next = min(t_nexts)
+		if t + dt_step > t_next - self.step.dt_min:
+			return t_next - t
+		return dt_step
+
+	def reset_sol_history(self, t):
+		"""Resets the history of converged solutions, at the beginning of a step."""
+		self.sol_history = []
+		self.predictor_bc_dofs = None
+		self.err_old = None
+		self.add_sol_history(t)
+
+	def add_sol_history(self, t):
+		"""Adds the current (converged) solution to the history used by the predictor and the error estimate."""
+		if self.sol_history_n_states == 1:
+			return
+		self.sol_history += [(t, self.problem.sol_func.vector().get_local())]
+		self.sol_history = self.sol_history[-self.sol_history_n_states :]
+
+	@staticmethod
+	def extrapolate(states, t):
+		r"""Evaluates at time ``t`` the Lagrange polynomial interpolating some states :math:`\{(t_i, u_i)\}`."""
+		sol_local = numpy.zeros_like(states[-1][1])
+		for k_state, (t_k, sol_k) in enumerate(states):
+			coeff = 1.0
+			for l_state, (t_l, _) in enumerate(states):
+				if l_state != k_state:
+					coeff *= (t - t_l) / (t_k - t_l)
+			sol_local += coeff * sol_k
+		return sol_local
+
+	def predict(self, t):
+		"""Extrapolates the solution at time ``t`` from the last (up to two or three) converged solutions.
+
+		Constrained dofs are kept at their last converged values, as the constraints are imposed
+		incrementally by the solver.
+		"""
+		if (self.predictor == "none") or (len(self.sol_history) < 2):
+			return
+
+		sol_local = self.extrapolate(self.sol_history[-self.predictor_n_states :], t)
+
+		if self.predictor_bc_dofs is None:
+			self.predictor_bc_dofs = numpy.array(
+				[dof for constraint in self.solver.constraints for dof in constraint.bc.get_boundary_values().keys()],
+				dtype=int,
+			)
+			self.predictor_bc_dofs = self.predictor_bc_dofs[self.predictor_bc_dofs < len(sol_local)]
+		sol_local[self.predictor_bc_dofs] = self.sol_history[-1][1][self.predictor_bc_dofs]
+
+		self.problem.sol_func.vector().set_local(sol_local)
+		self.problem.sol_func.vector().apply("insert")
+		if len(self.problem.subsols) > 1:
+			dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
+		self.problem.set_fois_outdated()
+
+	def estimate_error(self, t):
+		r"""Estimates the local truncation error of the (backward Euler) step to time ``t``.
+
+		With :math:`\tilde{u}` the linear extrapolation of the two previous solutions, the error is estimated as
+		:math:`e = \frac{\Delta t}{\Delta t + \Delta t_{old}} \left(u - \tilde{u}\right)`, and measured in the
+		weighted RMS norm
+		:math:`\sqrt{\frac{1}{N} \sum_i \left(\frac{e_i}{atol + rtol \max(|u_i|, |u_{old,i}|)}\right)^2}`,
+		so that the step is acceptable if the error is smaller than 1.
+
+		:return: The error, or None if there are not enough previous solutions.
+		:rtype: float or None
+		"""
+		if len(self.sol_history) < 2:
+			return None
+
+		(t_m1, _), (t_0, sol_0) = self.sol_history[-2:]
+		sol_local = self.problem.sol_func.vector().get_local()
+		err_local = (t - t_0) / (t - t_m1) * (sol_local - self.extrapolate(self.sol_history[-2:], t))
+		scale_local = self.error_atol + self.error_rtol * numpy.maximum(numpy.abs(sol_local), numpy.abs(sol_0))
+
+		comm = self.problem.mesh.mpi_comm()
+		err_sum = dolfin.MPI.sum(comm, float(numpy.sum((err_local / scale_local) ** 2)))
+		n_dofs = dolfin.MPI.sum(comm, float(len(err_local)))
+		return (err_sum / n_dofs) ** 0.5
+
+	def get_error_dt_factor(self, err):
+		"""Returns the ``dt`` factor of the PI controller for an accepted step (err ≤ 1) or rejected step (err > 1).
+
+		The classical exponents 0.7/2 (integral) & 0.4/2 (proportional) are used, the error estimate being of
+		order 2; the first step of each step, as well as rejected steps, use an integral controller only.
+		"""
+		err = max(err, 1e-10)
+		if (err > 1.0) or (self.err_old is None):
+			fac = self.error_safety * err ** (-0.5)
+		else:
+			fac = self.error_safety * err ** (-0.35) * self.err_old**0.2
+		return min(self.error_fac_max, max(self.error_fac_min, fac))
+
+	def write_vtu(self, time):
+		"""Writes the displacement to a VTU file, in the background if ``write_sol_async``.
+
+		With preserved connectivity, all the (current) functions written to the solution file that can be
+		converted to VTK (CG1, CG2, DG0 & DG1) are written to the VTU file.
+		"""
+		if self.write_sol_async:
+			self.xdmf_file_sol.write_vtu(
+				filebasename=self.write_sol_filebasename,
+				function=self.problem.displacement_subsol.subfunc,
+				time=time,
+				preserve_connectivity=self.write_vtus_with_preserved_connectivity,
+				functions=self.vtu_functions if self.write_vtus_with_preserved_connectivity else None,
+			)
+		else:
+			write_VTU_file(
+				filebasename=self.write_sol_filebasename,
+				function=self.problem.displacement_subsol.subfunc,
+				time=time,
+				preserve_connectivity=self.write_vtus_with_preserved_connectivity,
+				functions=self.vtu_functions if self.write_vtus_with_preserved_connectivity else None,
+			)
+
 	def close(self):
-		"""Closes all open file handles (logs, tables, QOI data, XDMF)."""
+		"""Closes all open file handles (logs, tables, QOI data, XDMF), waiting for pending background writes."""
 		self.printer.close()
 		self.table_printer.close()
 
@@ -183,6 +533,11 @@ class TimeIntegrator:
 		if self.write_sol:
 			self.xdmf_file_sol.close()
 
+		if self.write_statistics:
+			self.statistics.write(
+				filebasename=self.write_statistics_filebasename, formats=self.write_statistics_formats
+			)
+
 	def integrate(self):
 		"""Executes the time integration loop.
 
@@ -190,16 +545,32 @@ class TimeIntegrator:
 
 		:return: True if the simulation completed successfully, False otherwise.
 		"""
-		k_t_tot = 0
-		n_iter_tot = 0
+		if self.restart_state is not None:
+			k_step_ini = int(self.restart_state["k_step"])
+			k_t_tot = int(self.restart_state["k_t_tot"])
+			n_iter_tot = int(self.restart_state["n_iter_tot"])
+			t_ini = self.restart_state["t"]
+		else:
+			k_step_ini = 1
+			k_t_tot = 0
+			n_iter_tot = 0
+			t_ini = self.problem.steps[0].t_ini
+		for output_schedule in self.output_schedules:
+			output_schedule.start(t_ini)
+		self.success = True
 		self.printer.inc()
-		for k_step in range(1, len(self.problem.steps) + 1):
+		for k_step in range(k_step_ini, len(self.problem.steps) + 1):
 			self.printer.print_var("k_step", k_step, -1)
 
 			self.step = self.problem.steps[k_step - 1]
 
 			t = self.step.t_ini
 			dt = self.step.dt_ini
+			k_t = 0
+			if (self.restart_state is not None) and (k_step == k_step_ini) and (self.restart_state["k_t"] > 0):
+				t = self.restart_state["t"]
+				dt = self.restart_state["dt"]
+				k_t = int(self.restart_state["k_t"])
 
 			self.problem.set_variational_formulation(k_step=k_step - 1)
 
@@ -207,74 +578,166 @@ class TimeIntegrator:
 			self.solver.constraints += self.problem.constraints
 			self.solver.constraints += self.step.constraints
 
-			k_t = 0
+			self.solver.set_assembler()
+
+			self.solver.invalidate_jac()
+			dt_old = None
+
+			self.reset_sol_history(t)
+			if (self.restart_state is not None) and (k_step == k_step_ini) and (self.restart_state["k_t"] > 0):
+				# The Jacobian is rebuilt anyway, so that only the history of the step must be restored
+				if len(self.restart_state["sol_history"]) > 0:
+					self.sol_history = self.restart_state["sol_history"][-self.sol_history_n_states :]
+				if self.restart_state["err_old"] > 0.0:
+					self.err_old = self.restart_state["err_old"]
+
+			if self.continuation == "arc_length":
+				for constraint in self.step.constraints:
+					assert (constraint.tv_val.val_ini == constraint.tv_val.val_fin).all(), (
+						"Arc-length continuation requires constant step constraints. Aborting."
+					)
+				self.solver.reset_arc_length()
+
 			self.printer.inc()
 			while True:
 				k_t += 1
 				k_t_tot += 1
 				self.printer.print_var("k_t", k_t, -1)
 
-				if t + dt > self.step.t_fin:
-					dt = self.step.t_fin - t
-				self.printer.print_var("dt", dt)
+				# The time increment of the step (dt_step) is clipped to hit the output times, but dt is
+				# kept, so that the time step adaptation does not restart from the clipped value
+				dt_step = min(dt, self.step.t_fin - t)
+				arc_length = (self.continuation == "arc_length") and not (
+					dolfin.near(t + dt_step, self.step.t_fin, eps=1e-9)
+				)
+				if not (arc_length):
+					dt_step = self.get_output_dt_step(t, dt_step)
+				self.printer.print_var("dt", dt_step)
 
 				# self.problem.set_variational_formulation(
 				#     k_step=k_step-1,
 				#     dt=dt)
 
-				t += dt
-				self.printer.print_var("t", t)
+				t_old = t
+				solver_timer = time.time()
+				if arc_length:
+					t_step = (t - self.step.t_ini) / (self.step.t_fin - self.step.t_ini)
+
+					for constraint in self.step.constraints:
+						constraint.set_value_at_t_step(t_step)
 
-				t_step = (t - self.step.t_ini) / (self.step.t_fin - self.step.t_ini)
-				self.printer.print_var("t_step", t_step)
+					self.problem.sol_old_func.vector()[:] = self.problem.sol_func.vector()[:]
+					if len(self.problem.subsols) > 1:
+						dolfin.assign(self.problem.get_subsols_func_old_lst(), self.problem.sol_old_func)
+					solver_success, n_iter, t_step = self.solver.solve_arc_length(
+						k_step, k_t, self.step.operators, t_step, dt_step / (self.step.t_fin - self.step.t_ini)
+					)
+
+					t = self.step.t_ini + t_step * (self.step.t_fin - self.step.t_ini)
+					self.printer.print_var("t", t)
+					self.printer.print_var("t_step", t_step)
+
+					arc_length_overshoot = solver_success and (t > self.step.t_fin + 1e-9)
+					if arc_length_overshoot:
+						self.printer.print_str("Warning! Arc-length increment went beyond t_fin.")
+						solver_success = False
+				else:
+					t += dt_step
+					self.printer.print_var("t", t)
 
-				for operator in self.step.operators:
-					operator.set_value_at_t_step(t_step)
-					operator.set_dt(dt)
+					t_step = (t - self.step.t_ini) / (self.step.t_fin - self.step.t_ini)
+					self.printer.print_var("t_step", t_step)
 
-				for constraint in self.step.constraints:
-					constraint.set_value_at_t_step(t_step)
+					for operator in self.step.operators:
+						operator.set_value_at_t_step(t_step)
+						operator.set_dt(dt_step)
 
-				for inelastic_behavior in self.problem.inelastic_behaviors_internal:
-					inelastic_behavior.update_internal_variables_at_t(t)
+					if dt_step != dt_old:
+						self.solver.invalidate_jac()
+					dt_old = dt_step
 
-				self.problem.sol_old_func.vector()[:] = self.problem.sol_func.vector()[:]
-				if len(self.problem.subsols) > 1:
-					dolfin.assign(self.problem.get_subsols_func_old_lst(), self.problem.sol_old_func)
-				solver_success, n_iter = self.solver.solve(k_step, k_t, dt, t)
+					for constraint in self.step.constraints:
+						constraint.set_value_at_t_step(t_step)
 
-				self.table_printer.write_line([k_step, k_t, dt, t, t_step, n_iter, solver_success])
+					for inelastic_behavior in self.problem.inelastic_behaviors_internal:
+						inelastic_behavior.update_internal_variables_at_t(t)
 
-				if solver_success:
+					self.problem.sol_old_func.vector()[:] = self.problem.sol_func.vector()[:]
+					if len(self.problem.subsols) > 1:
+						dolfin.assign(self.problem.get_subsols_func_old_lst(), self.problem.sol_old_func)
+					self.predict(t)
+					solver_success, n_iter = self.solver.solve(k_step, k_t, dt_step, t)
+
+				solver_timer = time.time() - solver_timer
+
+				self.table_printer.write_line([k_step, k_t, t - t_old, t, t_step, n_iter, solver_success])
+
+				err = None
+				err_rejected = False
+				if solver_success and (self.dt_controller == "error"):
+					err = self.estimate_error(t)
+					if err is not None:
+						self.printer.print_sci("err", err)
+						if err > 1.0:
+							if dt_step > self.step.dt_min * (1 + 1e-9):
+								self.printer.print_str("Warning! Step rejected by error estimate.")
+								err_rejected = True
+							else:
+								self.printer.print_str("Warning! Step accepted at dt_min despite error estimate.")
+
+				if self.write_statistics:
+					self.statistics.add_time_step(
+						k_step=k_step,
+						k_t=k_t,
+						t=t,
+						dt=t - t_old,
+						n_iter=n_iter,
+						success=solver_success and not (err_rejected),
+						solver_time=solver_timer,
+						write_time=0.0,
+					)
+
+				if solver_success and not (err_rejected):
 					n_iter_tot += n_iter
 
-					self.problem.update_fois()
+					self.add_sol_history(t)
+
+					step_end = dolfin.near(t, self.step.t_fin, eps=1e-9)
+
+					write_timer = time.time()
 					if self.write_sol:
-						self.xdmf_file_sol.write(t)
-
-						if self.write_vtus:
-							write_VTU_file(
-								filebasename=self.write_sol_filebasename,
-								function=self.problem.displacement_subsol.subfunc,
-								time=k_t_tot,
-								preserve_connectivity=self.write_vtus_with_preserved_connectivity,
-							)
+						if self.write_sol_schedule.is_due(t, step_end):
+							self.problem.update_fois_if_needed()
+							self.xdmf_file_sol.write(t)
+
+						if self.write_vtus and self.write_vtus_schedule.is_due(t, step_end):
+							self.write_vtu(time=k_t_tot)
 
-						if self.write_xmls:
+						if self.write_xmls and self.write_xmls_schedule.is_due(t, step_end):
 							(
 								dolfin.File(self.write_sol_filebasename + "_" + str(k_t_tot).zfill(3) + ".xml")
 								<< self.problem.displacement_subsol.subfunc
 							)
 
-					if self.write_qois:
-						self.problem.update_qois(dt, k_step)
+					if self.write_qois and self.write_qois_schedule.is_due(t, step_end):
+						self.problem.update_qois(dt_step, k_step)
 						self.qoi_printer.write_line([t] + [qoi.value for qoi in self.problem.qois])
+					if self.write_statistics:
+						self.statistics.time_steps[-1]["write_time"] = time.time() - write_timer
 
-					if dolfin.near(t, self.step.t_fin, eps=1e-9):
+					checkpoint_due = self.write_checkpoint and self.write_checkpoint_schedule.is_due(t, step_end)
+
+					if step_end:
+						if checkpoint_due:
+							self.write_checkpoint_file(k_step + 1, 0, k_t_tot, n_iter_tot, t, dt)
 						self.success = True
 						break
 					else:
-						if n_iter <= self.n_iter_for_accel:
+						if err is not None:
+							dt = dt_step * self.get_error_dt_factor(err)
+							self.err_old = max(err, 1e-10)
+							dt = min(self.step.dt_max, max(self.step.dt_min, dt))
+						elif n_iter <= self.n_iter_for_accel:
 							dt *= self.accel_coeff
 							if dt > self.step.dt_max:
 								dt = self.step.dt_max
@@ -282,11 +745,18 @@ class TimeIntegrator:
 							dt /= self.decel_coeff
 							if dt < self.step.dt_min:
 								dt = self.step.dt_min
+
+						if checkpoint_due:
+							self.write_checkpoint_file(k_step, k_t, k_t_tot, n_iter_tot, t, dt)
 				else:
+					self.solver.invalidate_jac()
+
 					self.problem.sol_func.vector()[:] = self.problem.sol_old_func.vector()[:]
 					if len(self.problem.subsols) > 1:
 						dolfin.assign(self.problem.get_subsols_func_lst(), self.problem.sol_func)
 
+					self.problem.set_fois_outdated()
+
 					for inelastic_behavior in self.problem.inelastic_behaviors_internal:
 						inelastic_behavior.restore_old_value()
 
@@ -295,9 +765,15 @@ class TimeIntegrator:
 
 					k_t -= 1
 					k_t_tot -= 1
-					t -= dt
+					t = t_old
 
-					dt /= self.decel_coeff
+					if arc_length and arc_length_overshoot:
+						dt = self.step.t_fin - t
+						continue
+					elif solver_success:
+						dt = max(self.step.dt_min, dt_step * self.get_error_dt_factor(err))
+					else:
+						dt = dt_step / self.decel_coeff
 					if dt < self.step.dt_min:
 						self.printer.print_str("Warning! Time integrator failed to move forward!")
 						self.success = False
@@ -16,12 +16,12 @@ import shutil
 import dolfin
 import myVTKPythonLibrary as myvtk
 
-from .mesh2ugrid import add_function_to_ugrid, mesh2ugrid
+from .mesh2ugrid import add_functions_to_ugrid, get_ugrid_degree, mesh2ugrid
 
 ################################################################################
 
 
-def write_VTU_file(filebasename, function, time=None, zfill=3, preserve_connectivity=False):
+def write_VTU_file(filebasename, function=None, time=None, zfill=3, preserve_connectivity=False, functions=None):
 	"""Exports a FEniCS Function to a VTU file for visualization in ParaView.
 
 	This function saves the state of a finite element field at a specific time step.
@@ -42,7 +42,9 @@ def write_VTU_file(filebasename, function, time=None, zfill=3, preserve_connecti
 	    VTK Unstructured Grid. This is slower but ensures that the topology (nodes
 	    and cells) in the output file exactly matches the computational mesh,
 	    which is critical for visualizing Discontinuous Galerkin (DG) fields
-	    or high-order elements correctly.
+	    or high-order elements correctly. CG2 functions are written on quadratic
+	    cells, DG0 & DG1 functions as cell data, and several functions can be
+	    written to the same file.
 
 	:param filebasename: The prefix for the output file path (e.g., "results/u").
 	:type filebasename: str
@@ -54,20 +56,33 @@ def write_VTU_file(filebasename, function, time=None, zfill=3, preserve_connecti
 	:type zfill: int
 	:param preserve_connectivity: If True, uses the custom writer to maintain exact mesh topology.
 	:type preserve_connectivity: bool
+	:param functions: With ``preserve_connectivity``, list of FEniCS Function objects to export together,
+	    instead of ``function``.
+	:type functions: list
 	:return: None
 	"""
 	if preserve_connectivity:
-		ugrid = mesh2ugrid(function.function_space().mesh())
-		add_function_to_ugrid(function=function, ugrid=ugrid)
 		myvtk.writeUGrid(
-			ugrid=ugrid, filename=filebasename + ("_" + str(time).zfill(zfill) if (time is not None) else "") + ".vtu"
+			ugrid=get_VTU_ugrid(functions or [function]), filename=get_VTU_filename(filebasename, time, zfill)
 		)
 
 	else:
 		file_pvd = dolfin.File(filebasename + "__.pvd")
 		file_pvd << (function, float(time) if (time is not None) else 0.0)
 		os.remove(filebasename + "__.pvd")
-		shutil.move(
-			filebasename + "__" + "".zfill(6) + ".vtu",
-			filebasename + ("_" + str(time).zfill(zfill) if (time is not None) else "") + ".vtu",
-		)
+		shutil.move(filebasename + "__" + "".zfill(6) + ".vtu", get_VTU_filename(filebasename, time, zfill))
+
+
+def get_VTU_filename(filebasename, time=None, zfill=3):
+	"""Returns the name of the VTU file of a given time, cf. :py:func:`write_VTU_file`."""
+	return filebasename + ("_" + str(time).zfill(zfill) if (time is not None) else "") + ".vtu"
+
+
+def get_VTU_ugrid(functions):
+	"""Returns a VTK unstructured grid of the mesh, holding copies of the current values of some functions.
+
+	The grid owns its data, so that it can be written after the functions are modified, without calling dolfin.
+	"""
+	ugrid = mesh2ugrid(functions[0].function_space().mesh(), degree=get_ugrid_degree(functions))
+	add_functions_to_ugrid(functions=functions, ugrid=ugrid)
+	return ugrid
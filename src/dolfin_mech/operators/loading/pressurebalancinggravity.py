@@ -23,7 +23,7 @@ finite and small strain regimes.
 
 import dolfin
 
-from ...core import TimeVaryingConstant
+from ...core import TimeVaryingConstant, get_volume
 from ..operator import Operator
 
 ################################################################################
@@ -102,8 +102,11 @@ class PressureBalancingGravity(Operator):
 		"""Initializes the PressureBalancingGravityLoadingOperator."""
 		self.measure = dV
 
-		self.V0 = dolfin.assemble(dolfin.Constant(1) * self.measure)
-		self.Vs0 = dolfin.assemble(Phis0 * self.measure)
+		self.V0 = get_volume(self.measure)
+		if isinstance(Phis0, (int, float, dolfin.Constant)):
+			self.Vs0 = float(Phis0) * self.V0
+		else:
+			self.Vs0 = dolfin.assemble(Phis0 * self.measure)
 
 		self.tv_f = TimeVaryingConstant(val=f_val, val_ini=f_ini, val_fin=f_fin)
 		f = self.tv_f.val
@@ -17,6 +17,7 @@ enabling the simulation of area-dependent phenomena such as surface tension.
 
 import dolfin
 
+from ...core import get_boundary_area
 from ..operator import Operator
 
 # ################################################################################
@@ -71,6 +72,6 @@ class DeformedSurfaceArea(Operator):
 
 		FmTN = dolfin.dot(dolfin.inv(self.kinematics.F).T, self.N)
 		T = dolfin.sqrt(dolfin.inner(FmTN, FmTN))
-		S0 = dolfin.assemble(1 * self.measure)
+		S0 = get_boundary_area(self.measure)
 
 		self.res_form = ((S_area / S0 - T * self.kinematics.J) * S_area_test) * self.measure
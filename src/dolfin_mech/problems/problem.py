@@ -16,8 +16,9 @@ and time-stepping logic to automate the assembly of nonlinear variational forms.
 """
 
 import dolfin
+import ufl
 
-from ..core import FOI, QOI, Constraint, Step, SubSol
+from ..core import FOI, QOI, Constraint, FOIBatch, Step, SubSol, get_mesh_geometry
 from ..operators import Inertia, loading, penalty
 
 ################################################################################
@@ -50,10 +51,15 @@ class Problem:
 		self.steps = []
 
 		self.fois = []
+		self.foi_batches = None
+		self.fois_outdated = True
 		self.qois = []
+		self.qois_depending_on_fois = None
 
 		self.form_compiler_parameters = {}
 
+		self.periodic_dof_map = None
+
 	####################################################################### mesh ###
 
 	def set_mesh(
@@ -85,7 +91,8 @@ class Problem:
 
 		self.mesh = mesh
 		self.dV = dolfin.Measure("dx", domain=self.mesh)
-		self.mesh_V0 = dolfin.assemble(dolfin.Constant(1) * self.dV)
+		self.mesh_geometry = get_mesh_geometry(self.mesh)
+		self.mesh_V0 = self.mesh_geometry["V0"]
 
 		if define_spatial_coordinates:
 			if "Inverse" in str(self):
@@ -97,19 +104,7 @@ class Problem:
 			self.mesh_normals = dolfin.FacetNormal(mesh)
 
 		if compute_bbox:
-			coord = self.mesh.coordinates()
-			self.mesh_bbox = []
-			xmin = dolfin.MPI.min(mesh.mpi_comm(), min(coord[:, 0]))
-			xmax = dolfin.MPI.max(mesh.mpi_comm(), max(coord[:, 0]))
-			self.mesh_bbox += [xmin, xmax]
-			if self.dim >= 2:
-				ymin = dolfin.MPI.min(mesh.mpi_comm(), min(coord[:, 1]))
-				ymax = dolfin.MPI.max(mesh.mpi_comm(), max(coord[:, 1]))
-				self.mesh_bbox += [ymin, ymax]
-				if self.dim >= 3:
-					zmin = dolfin.MPI.min(mesh.mpi_comm(), min(coord[:, 2]))
-					zmax = dolfin.MPI.max(mesh.mpi_comm(), max(coord[:, 2]))
-					self.mesh_bbox += [zmin, zmax]
+			self.mesh_bbox = list(self.mesh_geometry["bbox"])
 
 		if compute_local_cylindrical_basis:
 			self.local_basis_fe = dolfin.VectorElement(
@@ -359,23 +354,76 @@ class Problem:
 	def add_foi(self, *args, **kwargs):
 		"""Adds a Field of Interest (FOI) to the problem.
 		FOIs are updated at the end of every step for visualization/output.
+		If no update type is given, FOIs on DG0 or Quadrature spaces are updated
+		by direct evaluation (``update_type="assemble"``), the others by local solver.
 		"""
+		if (kwargs.get("update_type") is None) and (kwargs.get("fs") is not None):
+			kwargs["update_type"] = "assemble" if FOI.has_diagonal_mass(kwargs["fs"]) else "local_solver"
 		foi = FOI(*args, form_compiler_parameters=self.form_compiler_parameters, **kwargs)
 		self.fois += [foi]
+		self.foi_batches = None
+		self.fois_outdated = True
+		self.qois_depending_on_fois = None
 		return foi
 
 	def get_foi(self, name):
-
+		"""Returns the FOI of a given name, updating the FOIs first if they are outdated."""
+		self.update_fois_if_needed()
 		for foi in self.fois:
 			if foi.name == name:
 				return foi
 		assert 0, 'No FOI named "' + name + '". Aborting.'
 
-	def update_fois(self):
-		"""Triggers the projection/interpolation of all registered FOIs."""
+	def set_foi_batches(self):
+		"""Groups the FOIs updated by local solver (or direct evaluation) on the same mesh & element into batches.
+
+		Each batch of several FOIs is updated by a single local solve or assembly (see
+		:py:class:`dolfin_mech.FOIBatch`), while the other FOIs are updated individually.
+		Quadrature FOIs are not batched.
+		"""
+		fois_by_key = {}
+		self.unbatched_fois = []
 		for foi in self.fois:
+			if (foi.update_type in ("local_solver", "assemble")) and (foi.fs.ufl_element().family() != "Quadrature"):
+				key = (foi.fs.mesh().id(), foi.fs.ufl_element(), foi.update_type)
+				fois_by_key.setdefault(key, []).append(foi)
+			else:
+				self.unbatched_fois += [foi]
+
+		self.foi_batches = []
+		for fois in fois_by_key.values():
+			if len(fois) == 1:
+				self.unbatched_fois += fois
+			else:
+				self.foi_batches += [FOIBatch(fois, form_compiler_parameters=self.form_compiler_parameters)]
+
+	def update_fois(self):
+		"""Triggers the projection/interpolation of all registered FOIs.
+
+		FOIs sharing the same space are updated together, cf. :py:meth:`set_foi_batches`.
+		"""
+		if self.foi_batches is None:
+			self.set_foi_batches()
+
+		for foi_batch in self.foi_batches:
+			foi_batch.update()
+		for foi in self.unbatched_fois:
 			foi.update()
 
+		self.fois_outdated = False
+
+	def set_fois_outdated(self):
+		"""Marks the FOIs as outdated, e.g., after the solution changed.
+
+		FOIs are then lazily updated, only when actually read, cf. :py:meth:`update_fois_if_needed`.
+		"""
+		self.fois_outdated = True
+
+	def update_fois_if_needed(self):
+		"""Updates the FOIs only if they are outdated."""
+		if self.fois_outdated:
+			self.update_fois()
+
 	def get_fois_func_lst(self):
 
 		return [foi.func for foi in self.fois]
@@ -388,10 +436,30 @@ class Problem:
 		"""
 		qoi = QOI(*args, form_compiler_parameters=self.form_compiler_parameters, **kwargs)
 		self.qois += [qoi]
+		self.qois_depending_on_fois = None
 		return qoi
 
+	def set_qois_depending_on_fois(self):
+		"""Finds the QOIs whose expressions read FOI functions."""
+		fois_func_lst = self.get_fois_func_lst()
+		self.qois_depending_on_fois = []
+		for qoi in self.qois:
+			exprs = [qoi.expr] if (qoi.expr is not None) else (qoi.expr_lst or [])
+			coefficients = [coefficient for expr in exprs for coefficient in ufl.algorithms.extract_coefficients(expr)]
+			if any([any([coefficient is func for func in fois_func_lst]) for coefficient in coefficients]):
+				self.qois_depending_on_fois += [qoi]
+
 	def update_qois(self, dt=None, k_step=None):
-		"""Updates the values of all registered QOIs."""
+		"""Updates the values of all registered QOIs.
+
+		Outdated FOIs are updated first, but only if some QOI reads them.
+		"""
+		if self.fois_outdated:
+			if self.qois_depending_on_fois is None:
+				self.set_qois_depending_on_fois()
+			if len(self.qois_depending_on_fois) > 0:
+				self.update_fois()
+
 		for qoi in self.qois:
 			qoi.update(dt, k_step)
 
@@ -19,10 +19,14 @@ microstructure (REV). It solves corrector problems under unit macroscopic strain
 to determine the full stiffness tensor and effective bulk moduli.
 """
 
+import os
+
 import dolfin
 import numpy
+import petsc4py
+import petsc4py.PETSc
 
-from ..core import PeriodicSubDomain
+from ..core import PeriodicDofMap, get_mesh_geometry, get_PeriodicSubDomain
 
 #############################################################################
 
@@ -51,7 +55,7 @@ class Homogenization:
 	    mesh_V0 (float): Total volume/area of the solid part of the mesh.
 	"""
 
-	def __init__(self, dim, mesh, mat_params, vol, bbox, vertices=None):
+	def __init__(self, dim, mesh, mat_params, vol, bbox, vertices=None, pbc_type="python", pbc_filename=None):
 		"""Initializes the HomogenizationProblem.
 
 		:param dim: Spatial dimension (2 or 3).
@@ -60,6 +64,10 @@ class Homogenization:
 		:param vol: Total volume of the unit cell (including pores).
 		:param bbox: Bounding box of the unit cell for periodicity.
 		:param vertices: Vertices defining the periodicity directions.
+		:param pbc_type: Implementation of the periodicity: "python" or "cpp" (compiled) periodic mapping,
+		    cf. :py:func:`dolfin_mech.get_PeriodicSubDomain`, or "dofmap", cf. :py:class:`dolfin_mech.PeriodicDofMap`.
+		:param pbc_filename: With "dofmap", path to the ".npz" file caching the dof pairing of the corrector
+		    problems; the pairing of the bulk modulus problem is cached in "<pbc_filename>-kappa.npz".
 		"""
 		self.dim = dim
 		if self.dim == 2:
@@ -69,7 +77,8 @@ class Homogenization:
 
 		self.mesh = mesh
 		self.dV = dolfin.Measure("dx", domain=self.mesh)
-		self.mesh_V0 = dolfin.assemble(dolfin.Constant(1) * self.dV)
+		self.mesh_geometry = get_mesh_geometry(self.mesh)
+		self.mesh_V0 = self.mesh_geometry["V0"]
 
 		self.E_s = mat_params["E"]
 		self.nu_s = mat_params["nu"]
@@ -79,6 +88,10 @@ class Homogenization:
 		self.vertices = vertices
 		self.vol = vol
 		self.bbox = bbox
+		self.pbc_type = pbc_type
+		self.pbc_filename = pbc_filename
+		self.periodic_dof_maps = {}
+		self.corrector_system = None
 
 	def eps(self, v):
 		"""Computes the symmetric strain tensor (micro-strain).
@@ -88,7 +101,7 @@ class Homogenization:
 		"""
 		return dolfin.sym(dolfin.grad(v))
 
-	def sigma(self, v, eps):
+	def sigma(self, v, eps, lmbda=None, mu=None):
 		r"""Computes the micro-stress tensor using the constitutive law.
 
 		The total strain is the sum of the macroscopic strain :math:`\mathbf{E}`
@@ -96,10 +109,14 @@ class Homogenization:
 
 		:param v: Fluctuation displacement field.
 		:param eps: Macroscopic strain tensor.
+		:param lmbda: (Optional) Lamé coefficient, defaults to the one of the solid.
+		:param mu: (Optional) Shear modulus, defaults to the one of the solid.
 		"""
-		return self.lmbda_s * dolfin.tr(eps + self.eps(v)) * dolfin.Identity(self.dim) + 2 * self.mu_s * (
-			eps + self.eps(v)
-		)
+		if lmbda is None:
+			lmbda = self.lmbda_s
+		if mu is None:
+			mu = self.mu_s
+		return lmbda * dolfin.tr(eps + self.eps(v)) * dolfin.Identity(self.dim) + 2 * mu * (eps + self.eps(v))
 
 	def Voigt2strain(self, s):
 		"""Converts a Voigt notation vector to a second-order strain tensor."""
@@ -124,50 +141,213 @@ class Homogenization:
 		Eps_Voigt[i] = 1
 		return self.Voigt2strain(Eps_Voigt)
 
-	def get_lambda_and_mu(self):
-		r"""Computes the homogenized Lamé coefficients by solving corrector problems.
+	def get_periodic_function_space(self, element, vertices, name="corrector"):
+		"""Creates the periodic function space of an element, according to ``pbc_type``.
 
-		This method solves :math:`n_{Voigt}` linear elastic problems on the REV with
-		periodic boundary conditions and recovers the full homogenized stiffness
-		matrix :math:`\mathbb{C}^{hom}`.
+		With "dofmap", the function space is not constrained, and its dof map is stored
+		in ``periodic_dof_maps[name]``, each set of vertices having its own map.
+		"""
+		if self.pbc_type == "dofmap":
+			W = dolfin.FunctionSpace(self.mesh, element)
+			filename = self.pbc_filename
+			if (filename is not None) and (name != "corrector"):
+				filename = os.path.splitext(filename)[0] + "-" + name + ".npz"
+			self.periodic_dof_maps[name] = PeriodicDofMap(W, self.dim, self.bbox, vertices, filename=filename)
+		else:
+			W = dolfin.FunctionSpace(
+				self.mesh,
+				element,
+				constrained_domain=get_PeriodicSubDomain(self.dim, self.bbox, vertices, pbc_type=self.pbc_type),
+			)
+		return W
+
+	def solve_periodic(self, a, b, w, name="corrector"):
+		"""Solves a linear problem on the periodic function space ``name``, cf. ``get_periodic_function_space``."""
+		if self.pbc_type == "dofmap":
+			A = dolfin.assemble(a, tensor=dolfin.PETScMatrix())
+			B = dolfin.assemble(b, tensor=dolfin.PETScVector())
+			self.periodic_dof_maps[name].solve(A, w.vector(), B)
+		else:
+			dolfin.solve(a == b, w, solver_parameters={"linear_solver": "mumps"})
 
-		:return: Homogenized Lamé constants (lmbda_hom, mu_hom).
+	def solve_multiple_rhs(self, A_mat, b_vecs):
+		"""Solves a linear system for several right-hand sides, with a single factorization.
+
+		The matrix is factorized once with MUMPS, and all right-hand sides are solved
+		together, as the columns of a dense block.
+
+		:param A_mat: The matrix.
+		:type A_mat: petsc4py.PETSc.Mat
+		:param b_vecs: The right-hand sides.
+		:type b_vecs: list of petsc4py.PETSc.Vec
+		:return: The solutions.
+		:rtype: list of petsc4py.PETSc.Vec
+		"""
+		ksp = petsc4py.PETSc.KSP().create(A_mat.getComm())
+		ksp.setOperators(A_mat)
+		ksp.setType("preonly")
+		ksp.getPC().setType("lu")
+		ksp.getPC().setFactorSolverType("mumps")
+		ksp.setUp()
+
+		n_rhs = len(b_vecs)
+		row_start, row_end = A_mat.getOwnershipRange()
+		rows = numpy.arange(row_start, row_end, dtype=petsc4py.PETSc.IntType)
+		B_mat = petsc4py.PETSc.Mat().createDense(
+			size=((row_end - row_start, A_mat.getSize()[0]), (petsc4py.PETSc.DECIDE, n_rhs)),
+			comm=A_mat.getComm(),
+		)
+		B_mat.setUp()
+		for k_rhs, b_vec in enumerate(b_vecs):
+			B_mat.setValues(rows, [k_rhs], b_vec.getArray())
+		B_mat.assemble()
+		X_mat = B_mat.duplicate()
+		ksp.getPC().getFactorMatrix().matSolve(B_mat, X_mat)
+
+		x_vecs = []
+		for k_rhs, b_vec in enumerate(b_vecs):
+			x_vec = b_vec.duplicate()
+			x_vec.setArray(X_mat.getValues(rows, [k_rhs]).flatten())
+			x_vecs += [x_vec]
+		ksp.destroy()
+		return x_vecs
+
+	def set_corrector_system(self):
+		r"""Assembles, once, the material-independent terms of the corrector problems.
+
+		Since the stiffness is linear in the Lamé coefficients, the matrix of the corrector
+		problems is split into :math:`\lambda \mathbf{A}_{\lambda} + \mu \mathbf{A}_{\mu} + \mathbf{A}_{R}`
+		(:math:`\mathbf{A}_{R}` being the zero-mean constraint), and the right-hand side of the
+		:math:`j`-th unit macroscopic strain into :math:`\lambda \mathbf{b}_{\lambda}^j + \mu \mathbf{b}_{\mu}^j`.
+		The function space, the periodicity and all these terms are stored in ``corrector_system``.
 		"""
 		Ve = dolfin.VectorElement("CG", self.mesh.ufl_cell(), 2)
 		Re = dolfin.VectorElement("R", self.mesh.ufl_cell(), 0)
-		W = dolfin.FunctionSpace(
-			self.mesh,
-			dolfin.MixedElement([Ve, Re]),
-			constrained_domain=PeriodicSubDomain(self.dim, self.bbox, self.vertices),
-		)
+		W = self.get_periodic_function_space(dolfin.MixedElement([Ve, Re]), self.vertices)
 
 		v_test, lmbda_test = dolfin.TestFunctions(W)
 		v_tria, lmbda_tria = dolfin.TrialFunctions(W)
 
 		macro_strain = dolfin.Constant(numpy.zeros((self.dim, self.dim)))
-		F = dolfin.inner(self.sigma(v_tria, macro_strain), self.eps(v_test)) * self.dV
-		a, b = dolfin.lhs(F), dolfin.rhs(F)
-		a += dolfin.inner(lmbda_test, v_tria) * self.dV
-		a += dolfin.inner(lmbda_tria, v_test) * self.dV
+		a_lmbda = dolfin.tr(self.eps(v_tria)) * dolfin.tr(self.eps(v_test)) * self.dV
+		a_mu = 2 * dolfin.inner(self.eps(v_tria), self.eps(v_test)) * self.dV
+		a_R = dolfin.inner(lmbda_test, v_tria) * self.dV + dolfin.inner(lmbda_tria, v_test) * self.dV
+		b_lmbda = -dolfin.tr(macro_strain) * dolfin.tr(self.eps(v_test)) * self.dV
+		b_mu = -2 * dolfin.inner(macro_strain, self.eps(v_test)) * self.dV
+
+		A_lst = [dolfin.assemble(a, tensor=dolfin.PETScMatrix()) for a in [a_lmbda, a_mu, a_R]]
+		B_lmbda_lst = []
+		B_mu_lst = []
+		for j in range(self.n_Voigt):
+			macro_strain.assign(dolfin.Constant(self.get_macro_strain(j)))
+			B_lmbda_lst += [dolfin.assemble(b_lmbda, tensor=dolfin.PETScVector())]
+			B_mu_lst += [dolfin.assemble(b_mu, tensor=dolfin.PETScVector())]
+
+		if self.pbc_type == "dofmap":
+			periodic_dof_map = self.periodic_dof_maps["corrector"]
+			A_mats = [periodic_dof_map.restrict_matrix(A).copy() for A in A_lst]
+			b_lmbda_vecs = [periodic_dof_map.restrict_vector(B) for B in B_lmbda_lst]
+			b_mu_vecs = [periodic_dof_map.restrict_vector(B) for B in B_mu_lst]
+		else:
+			periodic_dof_map = None
+			A_mats = [A.mat() for A in A_lst]
+			b_lmbda_vecs = [B.vec() for B in B_lmbda_lst]
+			b_mu_vecs = [B.vec() for B in B_mu_lst]
+
+		self.corrector_system = {
+			"W": W,
+			"periodic_dof_map": periodic_dof_map,
+			"A_lst": A_lst,
+			"A_mats": A_mats,
+			"B_lst": B_lmbda_lst + B_mu_lst,
+			"b_lmbda_vecs": b_lmbda_vecs,
+			"b_mu_vecs": b_mu_vecs,
+		}
+
+	def get_C_hom_batch(self, mat_params_lst):
+		r"""Computes the homogenized stiffness matrices of several materials, on the same geometry.
+
+		The material-independent terms are assembled once, cf. :py:meth:`set_corrector_system`.
+		Since the corrector fields only depend on the Poisson ratio (the stiffness scales with
+		:math:`E`), the corrector problems are assembled from these terms, factorized once
+		and solved for all unit macroscopic strains together, for each distinct Poisson ratio
+		only, and the resulting :math:`\mathbb{C}^{hom}(E=1)` are scaled by :math:`E`.
+
+		:param mat_params_lst: List of dictionaries containing 'E' (Young's modulus) and 'nu' (Poisson's ratio).
+		:type mat_params_lst: list of dict
+		:return: Homogenized stiffness matrices (in Voigt notation), in the order of ``mat_params_lst``.
+		:rtype: list of numpy.ndarray
+		"""
+		if self.corrector_system is None:
+			self.set_corrector_system()
+		periodic_dof_map = self.corrector_system["periodic_dof_map"]
+		A_lmbda_mat, A_mu_mat, A_R_mat = self.corrector_system["A_mats"]
 
-		w = dolfin.Function(W)
+		w = dolfin.Function(self.corrector_system["W"])
 		(v, lmbda) = dolfin.split(w)
+		macro_strain = dolfin.Constant(numpy.zeros((self.dim, self.dim)))
+		lmbda_1 = dolfin.Constant(0.0)
+		mu_1 = dolfin.Constant(0.0)
+
+		C_hom_1 = {}
+		for nu in sorted(set([float(mat_params["nu"]) for mat_params in mat_params_lst])):
+			lmbda_1_val = nu / (1 + nu) / (1 - 2 * nu)
+			mu_1_val = 1.0 / 2 / (1 + nu)
+			lmbda_1.assign(dolfin.Constant(lmbda_1_val))
+			mu_1.assign(dolfin.Constant(mu_1_val))
+
+			A_mat = A_R_mat.copy()
+			A_mat.axpy(lmbda_1_val, A_lmbda_mat, structure=petsc4py.PETSc.Mat.Structure.DIFFERENT_NONZERO_PATTERN)
+			A_mat.axpy(mu_1_val, A_mu_mat, structure=petsc4py.PETSc.Mat.Structure.DIFFERENT_NONZERO_PATTERN)
+			b_vecs = []
+			for b_lmbda_vec, b_mu_vec in zip(self.corrector_system["b_lmbda_vecs"], self.corrector_system["b_mu_vecs"]):
+				b_vec = b_lmbda_vec.copy()
+				b_vec.scale(lmbda_1_val)
+				b_vec.axpy(mu_1_val, b_mu_vec)
+				b_vecs += [b_vec]
+			x_vecs = self.solve_multiple_rhs(A_mat, b_vecs)
+			A_mat.destroy()
+
+			C_hom_1[nu] = numpy.zeros((self.n_Voigt, self.n_Voigt))
+			for j in range(self.n_Voigt):
+				macro_strain.assign(dolfin.Constant(self.get_macro_strain(j)))
+				if periodic_dof_map is not None:
+					periodic_dof_map.prolongate_vector(x_vecs[j], w.vector())
+				else:
+					x_vecs[j].copy(dolfin.as_backend_type(w.vector()).vec())
+					dolfin.as_backend_type(w.vector()).update_ghost_values()
+				# xdmf_file_per.write(w, float(j))
+
+				for k in range(self.n_Voigt):
+					C_hom_1[nu][j, k] = dolfin.assemble(
+						self.stress2Voigt(self.sigma(v, macro_strain, lmbda_1, mu_1))[k] * self.dV
+					)
+					C_hom_1[nu][j, k] /= self.vol
+			# print("C_hom:" + str(C_hom_1[nu]))
+
+		return [mat_params["E"] * C_hom_1[float(mat_params["nu"])] for mat_params in mat_params_lst]
+
+	def get_C_hom(self):
+		r"""Computes the homogenized stiffness matrix by solving corrector problems.
 
-		C_hom = numpy.zeros((self.n_Voigt, self.n_Voigt))
+		This method solves :math:`n_{Voigt}` linear elastic problems on the REV with
+		periodic boundary conditions, one per unit macroscopic strain, and recovers the full
+		homogenized stiffness matrix :math:`\mathbb{C}^{hom}` (in Voigt notation).
+		Since only the right-hand side depends on the macroscopic strain, the matrix is
+		assembled and factorized once, and all corrector problems are solved together,
+		cf. :py:meth:`get_C_hom_batch`.
+
+		:return: Homogenized stiffness matrix C_hom.
+		:rtype: numpy.ndarray
+		"""
+		return self.get_C_hom_batch([{"E": self.E_s, "nu": self.nu_s}])[0]
 
-		for j in range(self.n_Voigt):
-			macro_strain.assign(dolfin.Constant(self.get_macro_strain(j)))
-			dolfin.solve(a == b, w, solver_parameters={"linear_solver": "mumps"})
-			# if (self.dim == 3):
-			#     dolfin.solve(a == b, w, [], solver_parameters={"linear_solver": "cg"})
-			# else:
-			#     dolfin.solve(a == b, w, [], solver_parameters={"linear_solver": "lu"}) # MMT20230616: "cg" solver doesn't work when material Poisson ratio nu=0.499, and "lu" doesn't work for 3D geometries
-			# xdmf_file_per.write(w, float(j))
+	def get_lambda_and_mu(self):
+		r"""Computes the homogenized Lamé coefficients, cf. :py:meth:`get_C_hom`.
 
-			for k in range(self.n_Voigt):
-				C_hom[j, k] = dolfin.assemble(self.stress2Voigt(self.sigma(v, macro_strain))[k] * self.dV)
-				C_hom[j, k] /= self.vol
-		# print("C_hom:" + str(C_hom))
+		:return: Homogenized Lamé constants (lmbda_hom, mu_hom).
+		"""
+		C_hom = self.get_C_hom()
 
 		lmbda_hom = C_hom[0, 1]
 		if self.dim == 2:
@@ -194,14 +374,9 @@ class Homogenization:
 
 		:return: Effective bulk modulus kappa_tilde.
 		"""
-		coord = self.mesh.coordinates()
-		xmax = max(coord[:, 0])
-		xmin = min(coord[:, 0])
-		ymax = max(coord[:, 1])
-		ymin = min(coord[:, 1])
+		xmin, xmax, ymin, ymax = self.mesh_geometry["bbox"][0:4]
 		if self.dim == 3:
-			zmax = max(coord[:, 2])
-			zmin = min(coord[:, 2])
+			zmin, zmax = self.mesh_geometry["bbox"][4:6]
 
 		if self.dim == 2:
 			vol = (xmax - xmin) * (ymax - ymin)
@@ -271,11 +446,7 @@ class Homogenization:
 
 		Ve = dolfin.VectorElement("CG", self.mesh.ufl_cell(), 2)
 		Re = dolfin.VectorElement("R", self.mesh.ufl_cell(), 0)
-		W = dolfin.FunctionSpace(
-			self.mesh,
-			dolfin.MixedElement([Ve, Re]),
-			constrained_domain=PeriodicSubDomain(self.dim, self.bbox, vertices),
-		)
+		W = self.get_periodic_function_space(dolfin.MixedElement([Ve, Re]), vertices, name="kappa")
 
 		v_test, lmbda_test = dolfin.TestFunctions(W)
 		v_tria, lmbda_tria = dolfin.TrialFunctions(W)
@@ -288,11 +459,7 @@ class Homogenization:
 		macro_strain = dolfin.Constant(numpy.zeros((self.dim, self.dim)))
 
 		X = dolfin.SpatialCoordinate(self.mesh)
-		X_0 = numpy.zeros(self.dim)
-		for k_dim in range(self.dim):
-			X_0[k_dim] = dolfin.assemble(X[k_dim] * self.dV)
-			X_0[k_dim] /= self.mesh_V0
-		X_0 = dolfin.Constant(X_0)
+		X_0 = dolfin.Constant(self.mesh_geometry["X0"])
 
 		u_bar = dolfin.dot(macro_strain, X - X_0)
 		u_tot = u_bar + v
@@ -309,7 +476,7 @@ class Homogenization:
 		a += dolfin.dot(lmbda_test, v_tria) * self.dV
 		a += dolfin.dot(lmbda_tria, v_test) * self.dV
 
-		dolfin.solve(a == b, w, solver_parameters={"linear_solver": "mumps"})
+		self.solve_periodic(a, b, w, name="kappa")
 		# if (self.dim==3):
 		#     dolfin.solve(a == L, w, [], solver_parameters={"linear_solver": "cg"})
 		# else:
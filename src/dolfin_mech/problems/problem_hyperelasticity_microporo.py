@@ -68,14 +68,20 @@ class MicroPoroHyperelasticity(Hyperelasticity):
 		quadrature_degree=None,
 		foi_degree=0,
 		solid_behavior=None,
-		bcs="kubc",
-	):  # "kubc" or "pbc"
+		bcs="kubc",  # "kubc" or "pbc"
+		pbc_type="python",
+		pbc_filename=None,
+	):
 		r"""Initializes the MicroPoroHyperelasticityProblem.
 
 		:param w_solid_incompressibility: If True, uses a mixed u-p formulation for the solid phase.
 		:param mesh_bbox: Bounding box [xmin, xmax, ymin, ymax, ...] defining the unit cell.
 		:param vertices: Vertices for periodic point mapping.
 		:param bcs: Boundary condition type: "kubc" (Kinematic Uniform) or "pbc" (Periodic).
+		:param pbc_type: Implementation of the periodicity: "python" or "cpp" (compiled) periodic mapping,
+		    cf. :py:func:`dolfin_mech.get_PeriodicSubDomain`, or "dofmap", cf. :py:class:`dolfin_mech.PeriodicDofMap`
+		    (requires the "petsc" linear solver).
+		:param pbc_filename: With "dofmap", path to the ".npz" file caching the dof pairing.
 		"""
 		Problem.__init__(self)
 
@@ -83,10 +89,7 @@ class MicroPoroHyperelasticity(Hyperelasticity):
 		self.vertices = vertices
 
 		self.set_mesh(mesh=mesh, define_spatial_coordinates=1, define_facet_normals=1, compute_bbox=(mesh_bbox is None))
-		self.X_0 = [0.0] * self.dim
-		for k_dim in range(self.dim):
-			self.X_0[k_dim] = dolfin.assemble(self.X[k_dim] * self.dV) / self.mesh_V0
-		self.X_0 = dolfin.Constant(self.X_0)
+		self.X_0 = dolfin.Constant(self.mesh_geometry["X0"])
 		if mesh_bbox is not None:
 			self.mesh_bbox = mesh_bbox
 		d = [0] * self.dim
@@ -104,8 +107,13 @@ class MicroPoroHyperelasticity(Hyperelasticity):
 			solid_pressure_degree=solid_pressure_degree,
 		)
 		self.set_solution_finite_element()
-		if bcs == "pbc":
-			periodic_sd = core.PeriodicSubDomain(self.dim, self.mesh_bbox, self.vertices)
+		if (bcs == "pbc") and (pbc_type == "dofmap"):
+			self.set_solution_function_space()
+			self.periodic_dof_map = core.PeriodicDofMap(
+				self.sol_fs, self.dim, self.mesh_bbox, self.vertices, filename=pbc_filename
+			)
+		elif bcs == "pbc":
+			periodic_sd = core.get_PeriodicSubDomain(self.dim, self.mesh_bbox, self.vertices, pbc_type=pbc_type)
 			self.set_solution_function_space(constrained_domain=periodic_sd)
 		else:
 			self.set_solution_function_space()
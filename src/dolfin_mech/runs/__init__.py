@@ -6,7 +6,11 @@ from .disc_hyperelasticity import Disc_Hyperelasticity
 from .disc_mesh import Disc_Mesh
 from .heartslice_hyperelasticity import HeartSlice_Hyperelasticity
 from .heartslice_mesh import HeartSlice_Mesh
-from .hollowbox_homogenization import HollowBox_Homogenization
+from .hollowbox_homogenization import (
+	HollowBox_Homogenization,
+	HollowBox_Homogenization_Batch,
+	HollowBox_Homogenization_C_hom_batch,
+)
 from .hollowbox_mesh import HollowBox_Mesh, setPeriodic
 from .hollowbox_microporohyperelasticity import HollowBox_MicroPoroHyperelasticity
 from .rivlincube_elasticity import RivlinCube_Elasticity
@@ -24,6 +28,8 @@ __all__ = [
 	"setPeriodic",
 	"HollowBox_Mesh",
 	"HollowBox_Homogenization",
+	"HollowBox_Homogenization_Batch",
+	"HollowBox_Homogenization_C_hom_batch",
 	"HollowBox_MicroPoroHyperelasticity",
 	"RivlinCube_Mesh",
 	"RivlinCube_Elasticity",
@@ -14,18 +14,31 @@ Calculates the effective
 (homogenized) elastic properties of a periodic unit cell. It automates the
 setup of the Representative Volume Element (RVE), solves the necessary
 corrector problems, and extracts macroscopic Young's modulus, Poisson's ratio,
-and bulk modulus.
+and bulk modulus, for a single cell or for batches of materials & cells.
 """
 
-import dolfin
 import myPythonLibrary as mypy
 
 from .. import problems
+from ..core import get_mesh_geometry, get_multiprocessing_context
 from .hollowbox_mesh import HollowBox_Mesh
 
 ################################################################################
 
 
+def get_HollowBox_vol_and_bbox(dim, mesh):
+	"""Computes the volume & the bounding box of a unit cell from its mesh.
+
+	:return: (vol, bbox).
+	:rtype: tuple
+	"""
+	bbox = get_mesh_geometry(mesh)["bbox"][: 2 * dim]
+	vol = 1.0
+	for k_dim in range(dim):
+		vol *= bbox[2 * k_dim + 1] - bbox[2 * k_dim + 0]
+	return vol, bbox
+
+
 def HollowBox_Homogenization(
 	dim,
 	mesh=None,
@@ -83,23 +96,10 @@ def HollowBox_Homogenization(
 	if mesh is None:
 		mesh = HollowBox_Mesh(params=mesh_params)
 
-	coord = mesh.coordinates()
-	xmax = max(coord[:, 0])
-	xmin = min(coord[:, 0])
-	ymax = max(coord[:, 1])
-	ymin = min(coord[:, 1])
-	if dim == 2:
-		vol = (xmax - xmin) * (ymax - ymin)
-		bbox = [xmin, xmax, ymin, ymax]
-	elif dim == 3:
-		zmax = max(coord[:, 2])
-		zmin = min(coord[:, 2])
-		vol = (xmax - xmin) * (ymax - ymin) * (zmax - zmin)
-		bbox = [xmin, xmax, ymin, ymax, zmin, zmax]
+	vol, bbox = get_HollowBox_vol_and_bbox(dim, mesh)
 
 	V_0 = vol
-	dV = dolfin.Measure("dx", domain=mesh)
-	V_s0 = dolfin.assemble(dolfin.Constant(1.0) * dV)
+	V_s0 = get_mesh_geometry(mesh)["V0"]
 	Phi_s0 = V_s0 / V_0
 	print("Phi_s0 = " + str(Phi_s0))
 
@@ -125,3 +125,71 @@ def HollowBox_Homogenization(
 		)  # MG20231124: Need to write twice for some postprocessing issue
 
 	return mat_params["E"], mat_params["nu"], E_, nu_, kappa_
+
+
+def HollowBox_Homogenization_C_hom_batch(dim, mesh_params, mat_params_lst, pbc_type="python"):
+	"""Computes the homogenized stiffness matrices of several materials on a single "Hollow Box" unit cell.
+
+	The mesh, the periodic function space and the material-independent terms of the corrector
+	problems are shared by all materials, cf. :py:meth:`dolfin_mech.Homogenization.get_C_hom_batch`.
+
+	:param dim: Spatial dimension (2 or 3).
+	:type dim: int
+	:param mesh_params: Dictionary of parameters to generate the mesh.
+	:type mesh_params: dict
+	:param mat_params_lst: List of material parameters for the solid phase (e.g., ``{"E": 100, "nu": 0.3}``).
+	:type mat_params_lst: list of dict
+	:param pbc_type: Implementation of the periodicity, cf. :py:class:`dolfin_mech.Homogenization`.
+	:type pbc_type: str
+	:return: Homogenized stiffness matrices, in the order of ``mat_params_lst``.
+	:rtype: list of numpy.ndarray
+	"""
+	mesh = HollowBox_Mesh(params=mesh_params)
+	vol, bbox = get_HollowBox_vol_and_bbox(dim, mesh)
+
+	homogenization_problem = problems.Homogenization(
+		dim=dim, mesh=mesh, mat_params=mat_params_lst[0], vol=vol, bbox=bbox, pbc_type=pbc_type
+	)
+	return homogenization_problem.get_C_hom_batch(mat_params_lst)
+
+
+def _HollowBox_Homogenization_C_hom_batch_star(args):
+	return HollowBox_Homogenization_C_hom_batch(*args)
+
+
+def HollowBox_Homogenization_Batch(dim, mesh_params_lst, mat_params_lst, pbc_type="python", n_procs=1):
+	"""Computes the homogenized stiffness matrices of a family of "Hollow Box" unit cells, for several materials.
+
+	Each unit cell (e.g., each pore radius ``r0``) is treated independently, possibly in parallel
+	processes, and all materials are computed on each cell at once, cf.
+	:py:func:`HollowBox_Homogenization_C_hom_batch`. Since the cells are meshed concurrently,
+	their ``mesh_filebasename`` (default "mesh") are suffixed by the cell index.
+
+	:param dim: Spatial dimension (2 or 3).
+	:type dim: int
+	:param mesh_params_lst: List of dictionaries of parameters to generate the meshes (must be picklable).
+	:type mesh_params_lst: list of dict
+	:param mat_params_lst: List of material parameters for the solid phase (e.g., ``{"E": 100, "nu": 0.3}``).
+	:type mat_params_lst: list of dict
+	:param pbc_type: Implementation of the periodicity, cf. :py:class:`dolfin_mech.Homogenization`.
+	:type pbc_type: str
+	:param n_procs: Number of processes.
+	:type n_procs: int
+	:return: Homogenized stiffness matrices, as ``C_hom_lst[k_mesh][k_mat]``.
+	:rtype: list of list of numpy.ndarray
+	"""
+	assert n_procs >= 1, "n_procs (=" + str(n_procs) + ") should be positive. Aborting."
+
+	args_lst = []
+	for k_mesh, mesh_params in enumerate(mesh_params_lst):
+		mesh_params = dict(mesh_params)
+		mesh_params["mesh_filebasename"] = mesh_params.get("mesh_filebasename", "mesh") + "-" + str(k_mesh)
+		args_lst += [(dim, mesh_params, mat_params_lst, pbc_type)]
+
+	if n_procs == 1:
+		C_hom_lst = [HollowBox_Homogenization_C_hom_batch(*args) for args in args_lst]
+	else:
+		with get_multiprocessing_context().Pool(n_procs) as pool:
+			C_hom_lst = pool.map(_HollowBox_Homogenization_C_hom_batch_star, args_lst)
+
+	return C_hom_lst
@@ -36,6 +36,9 @@ def RivlinCube_Hyperelasticity(
 	const_params: dict = {},
 	load_params: dict = {},
 	move_params: dict = {},
+	solver_params: dict = {},
+	integrator_params: dict = {},
+	integrator_kwargs: dict = {},
 	get_results: bool = 0,
 	res_basename: str = "run_RivlinCube_Hyperelasticity",
 	write_vtus_with_preserved_connectivity: bool = False,
@@ -79,6 +82,10 @@ def RivlinCube_Hyperelasticity(
 	:param const_params: Boundary constraints (e.g., symmetry planes).
 	:param load_params: Loading configuration.
 	:param move_params: Parameters for pre-simulation mesh movement (ALE).
+	:param solver_params: Additional parameters of the :class:`NonlinearSolver` (e.g., ``{"sol_tol": [1e-8]}``).
+	:param integrator_params: Additional parameters of the :class:`TimeIntegrator` (e.g., ``{"predictor": "linear"}``).
+	:param integrator_kwargs: Additional keyword arguments of the :class:`TimeIntegrator` (e.g., output schedules,
+	    checkpoints, statistics).
 	:param get_results: If True, returns the displacement function and measure at the end.
 	:param res_basename: Output filename prefix.
 	:return: (Optional) Tuple ``(displacement_function, measure)`` if ``get_results`` is True.
@@ -377,7 +384,7 @@ def RivlinCube_Hyperelasticity(
 
 	solver = core.NonlinearSolver(
 		problem=problem,
-		parameters={"sol_tol": [1e-6] * len(problem.subsols), "n_iter_max": 32},
+		parameters={"sol_tol": [1e-6] * len(problem.subsols), "n_iter_max": 32, **solver_params},
 		relax_type="constant",
 		write_iter=0,
 	)
@@ -385,7 +392,13 @@ def RivlinCube_Hyperelasticity(
 	integrator = core.TimeIntegrator(
 		problem=problem,
 		solver=solver,
-		parameters={"n_iter_for_accel": 4, "n_iter_for_decel": 16, "accel_coeff": 2, "decel_coeff": 2},
+		parameters={
+			"n_iter_for_accel": 4,
+			"n_iter_for_decel": 16,
+			"accel_coeff": 2,
+			"decel_coeff": 2,
+			**integrator_params,
+		},
 		print_out=res_basename * verbose,
 		print_sta=res_basename * verbose,
 		write_qois=res_basename + "-qois",
@@ -393,6 +406,7 @@ def RivlinCube_Hyperelasticity(
 		write_sol=res_basename * verbose,
 		write_vtus=res_basename * verbose,
 		write_vtus_with_preserved_connectivity=write_vtus_with_preserved_connectivity,
+		**integrator_kwargs,
 	)
 
 	success = integrator.integrate()
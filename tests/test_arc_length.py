@@ -0,0 +1,109 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the arc-length continuation of the TimeIntegrator, through the snap-through of a shallow arch."""
+
+#################################################################### imports ###
+
+import json
+import math
+import os
+import shutil
+import sys
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def get_problem():
+	"""Builds a clamped shallow arch under a downward dead load, beyond its limit load."""
+	length = 1.0
+	thickness = 0.02
+	rise = 0.1
+	mesh = dolfin.RectangleMesh(dolfin.Point(0.0, 0.0), dolfin.Point(length, thickness), 50, 2)
+	mesh.coordinates()[:, 1] += rise * numpy.sin(math.pi * mesh.coordinates()[:, 0] / length)
+
+	boundaries_mf = dolfin.MeshFunction("size_t", mesh, mesh.topology().dim() - 1)
+	boundaries_mf.set_all(0)
+	dolfin.CompiledSubDomain("near(x[0], 0.) && on_boundary").mark(boundaries_mf, 1)
+	dolfin.CompiledSubDomain("near(x[0], L) && on_boundary", L=length).mark(boundaries_mf, 2)
+
+	problem = dmech.problems.Hyperelasticity(
+		mesh=mesh,
+		define_facet_normals=1,
+		boundaries_mf=boundaries_mf,
+		displacement_degree=2,
+		quadrature_degree="default",
+		elastic_behavior={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+	)
+
+	for boundary_id in [1, 2]:
+		problem.add_constraint(
+			V=problem.displacement_subsol.fs, sub_domains=boundaries_mf, sub_domain_id=boundary_id, val=[0.0, 0.0]
+		)
+
+	k_step = problem.add_step(Deltat=1.0, dt_ini=0.002, dt_min=1e-5, dt_max=0.05)
+	problem.add_volume_force0_loading_operator(measure=problem.dV, F_ini=[0.0, 0.0], F_fin=[0.0, -0.1], k_step=k_step)
+
+	return problem
+
+
+# The load factor decreases after the limit point, and the path is followed up to the final load
+problem = get_problem()
+solver = dmech.core.ArcLengthSolver(problem=problem, parameters={"sol_tol": [1e-8], "n_iter_max": 32}, print_out=0)
+integrator = dmech.core.TimeIntegrator(
+	problem=problem,
+	solver=solver,
+	parameters={"continuation": "arc_length"},
+	print_out=0,
+	print_sta=res_folder + "/" + "sta",
+	write_qois=0,
+	write_sol=0,
+	write_statistics=res_folder + "/" + "statistics",
+	write_statistics_formats=["json"],
+)
+success = integrator.integrate()
+assert success, "Integration failed. Aborting."
+integrator.close()
+
+with open(res_folder + "/" + "statistics.json") as file:
+	t_lst = [time_step["t"] for time_step in json.load(file)["time_steps"] if time_step["success"]]
+assert any([t < t_old for t_old, t in zip(t_lst[:-1], t_lst[1:])]), (
+	"Load factor should decrease after the limit point. Aborting."
+)
+assert numpy.isclose(t_lst[-1], 1.0), "Final load should be reached. Aborting."
+
+# Output schedules that clip dt cannot be honored
+problem = get_problem()
+solver = dmech.core.ArcLengthSolver(problem=problem, parameters={"sol_tol": [1e-8], "n_iter_max": 32}, print_out=0)
+schedule_rejected = False
+try:
+	dmech.core.TimeIntegrator(
+		problem=problem,
+		solver=solver,
+		parameters={"continuation": "arc_length"},
+		print_out=0,
+		print_sta=res_folder + "/" + "sta-schedule",
+		write_qois=0,
+		write_sol=res_folder + "/" + "sol-schedule",
+		write_sol_schedule={"dt": 0.1},
+	)
+except AssertionError:
+	schedule_rejected = True
+assert schedule_rejected, "Clipping output schedules should be rejected. Aborting."
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,159 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the Assembler against dolfin's assemble_system, with vertex loads & changing constraints."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def assemble_system_ref(problem, constraints):
+	"""Assembles the system as the NonlinearSolver did before the Assembler, and returns its arrays."""
+	jac_mat = dolfin.PETScMatrix()
+	res_vec = dolfin.PETScVector()
+	vertex_operators = [operator for operator in problem.operators if operator.measure.integral_type() == "vertex"]
+	dolfin.assemble_system(
+		problem.jac_form,
+		-problem.res_form,
+		bcs=[constraint.bc for constraint in constraints],
+		A_tensor=jac_mat,
+		b_tensor=res_vec,
+		add_values=False,
+		finalize_tensor=len(vertex_operators) == 0,
+		form_compiler_parameters=problem.form_compiler_parameters,
+	)
+	for operator in vertex_operators:
+		dolfin.assemble(
+			-operator.res_form,
+			tensor=res_vec,
+			add_values=True,
+			finalize_tensor=True,
+			form_compiler_parameters=problem.form_compiler_parameters,
+		)
+		dolfin.assemble(
+			dolfin.derivative(operator.res_form, problem.sol_func, problem.dsol_tria),
+			tensor=jac_mat,
+			add_values=True,
+			finalize_tensor=True,
+			form_compiler_parameters=problem.form_compiler_parameters,
+		)
+	return jac_mat.array(), res_vec.get_local()
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	for point_load in [0, 1]:
+		print("dim =", dim, "point_load =", point_load)
+
+		if dim == 2:
+			mesh, boundaries_mf, xmin_id, xmax_id, ymin_id, ymax_id = dmech.runs.RivlinCube_Mesh(
+				dim=dim, params={"mesh_filebasename": res_folder + "/" + "mesh"}
+			)
+		elif dim == 3:
+			mesh, boundaries_mf, xmin_id, xmax_id, ymin_id, ymax_id, zmin_id, zmax_id = dmech.runs.RivlinCube_Mesh(
+				dim=dim, params={"mesh_filebasename": res_folder + "/" + "mesh"}
+			)
+
+		points_mf = dolfin.MeshFunction("size_t", mesh, 0)
+		points_mf.set_all(0)
+		dolfin.CompiledSubDomain(" && ".join(["near(x[" + str(k) + "], 1.)" for k in range(dim)])).mark(points_mf, 1)
+
+		problem = dmech.problems.Hyperelasticity(
+			mesh=mesh,
+			define_facet_normals=1,
+			boundaries_mf=boundaries_mf,
+			points_mf=points_mf,
+			displacement_degree=1,
+			quadrature_degree="default",
+			elastic_behavior={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+		)
+
+		problem.add_constraint(
+			V=problem.displacement_subsol.fs.sub(0), sub_domains=boundaries_mf, sub_domain_id=xmin_id, val=0.0
+		)
+		problem.add_constraint(
+			V=problem.displacement_subsol.fs.sub(1), sub_domains=boundaries_mf, sub_domain_id=ymin_id, val=0.0
+		)
+		if point_load:
+			problem.add_volume_force0_loading_operator(measure=problem.dP(1), F_val=[0.1] + [0.05] * (dim - 1))
+
+		k_step = problem.add_step(Deltat=1.0, dt_ini=0.1, dt_min=0.01)
+		problem.add_constraint(
+			V=problem.displacement_subsol.fs.sub(0),
+			sub_domains=boundaries_mf,
+			sub_domain_id=xmax_id,
+			val_ini=0.0,
+			val_fin=0.2,
+			k_step=k_step,
+		)
+		problem.add_surface_force0_loading_operator(
+			measure=problem.dS(ymax_id), F_ini=[0.0] * dim, F_fin=[0.0, 0.1] + [0.0] * (dim - 2), k_step=k_step
+		)
+		problem.set_variational_formulation(k_step=k_step)
+		constraints = problem.constraints + problem.steps[k_step].constraints
+
+		# A nonzero state, so that the Jacobian depends on the solution
+		problem.sol_func.interpolate(dolfin.Expression(["0.1*x[0]*x[1]"] + ["0.05*x[0]"] * (dim - 1), degree=2))
+		if len(problem.subsols) > 1:
+			dolfin.assign(problem.get_subsols_func_lst(), problem.sol_func)
+
+		assembler = dmech.core.Assembler(problem=problem, constraints=constraints)
+		assert assembler.system_assembler.finalize_tensor == (not (point_load)), (
+			"Tensors should only be finalized without vertex integrals. Aborting."
+		)
+		assert len(assembler.vertex_res_forms) == point_load, "Wrong number of vertex integrals. Aborting."
+
+		# The tensors are reused, while the constraint values change
+		jac_mat = dolfin.PETScMatrix()
+		res_vec = dolfin.PETScVector()
+		for t_step in [0.5, 1.0]:
+			for operator in problem.steps[k_step].operators:
+				operator.set_value_at_t_step(t_step)
+			for constraint in problem.steps[k_step].constraints:
+				constraint.set_value_at_t_step(t_step)
+
+			jac_array_ref, res_array_ref = assemble_system_ref(problem, constraints)
+			assembler.assemble_system(jac_mat, res_vec)
+			assert numpy.allclose(jac_mat.array(), jac_array_ref, rtol=1e-12, atol=1e-12), (
+				"Jacobian differs from assemble_system. Aborting."
+			)
+			assert numpy.allclose(res_vec.get_local(), res_array_ref, rtol=1e-12, atol=1e-12), (
+				"Residual differs from assemble_system. Aborting."
+			)
+
+			res_vec_only = dolfin.PETScVector()
+			assembler.assemble_residual(res_vec_only)
+			assert numpy.allclose(res_vec_only.get_local(), res_array_ref, rtol=1e-12, atol=1e-12), (
+				"Residual alone differs from assemble_system. Aborting."
+			)
+
+		# The assembler is outdated if the constraints or the formulation change
+		assert not (assembler.is_outdated(constraints)), "Assembler should be up to date. Aborting."
+		assert assembler.is_outdated(constraints[:-1]), "Assembler should be outdated. Aborting."
+		assert assembler.is_outdated(constraints[::-1]), "Assembler should be outdated. Aborting."
+		problem.set_variational_formulation(k_step=k_step)
+		assert assembler.is_outdated(constraints), "Assembler should be outdated. Aborting."
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,93 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that the threaded AsyncWriter writes the same snapshots as the synchronous one."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import dolfin
+import h5py
+import numpy
+import vtk
+import vtk.util.numpy_support
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def read_ugrid(filename):
+	"""Reads a VTU file."""
+	reader = vtk.vtkXMLUnstructuredGridReader()
+	reader.SetFileName(filename)
+	reader.Update()
+	return reader.GetOutput()
+
+
+mesh = dolfin.UnitSquareMesh(3, 2)
+
+U = dolfin.Function(dolfin.VectorFunctionSpace(mesh, "CG", 2))
+U.rename("U", "U")
+P = dolfin.Function(dolfin.FunctionSpace(mesh, "DG", 0))
+P.rename("P", "P")
+functions = [U, P]
+
+times = [0.0, 0.5, 1.0, 1.5, 2.0, 2.5]
+mode_lst = []
+mode_lst += ["sync"]
+mode_lst += ["thread"]
+for mode in mode_lst:
+	print("mode =", mode)
+
+	filebasename = res_folder + "/" + "sol-mode=" + mode
+	writer = dmech.core.AsyncWriter(
+		filename=filebasename + ".xdmf", functions=functions, mode=mode, max_queue_size=2, compact=True
+	)
+	for k_time, time in enumerate(times):
+		U.interpolate(dolfin.Expression(["t*x[0]", "t*x[0]*x[1]"], t=time, degree=2))
+		P.interpolate(dolfin.Expression("1 + t*x[0]", t=time, degree=1))
+		writer.write(time)
+		writer.write_vtu(filebasename=filebasename, time=k_time, preserve_connectivity=True, functions=functions)
+
+		# The solver keeps modifying the functions while the snapshots are written
+		U.vector().zero()
+		P.vector()[:] = -1.0
+	writer.close()
+
+filebasename_sync = res_folder + "/" + "sol-mode=sync"
+filebasename_thread = res_folder + "/" + "sol-mode=thread"
+with h5py.File(filebasename_sync + ".h5", "r") as h5_file_sync, h5py.File(filebasename_thread + ".h5", "r") as h5_file:
+	assert numpy.array_equal(h5_file["/times"][:], times), "Wrong times. Aborting."
+	for name in ["U", "P"]:
+		assert h5_file["/fields/" + name].shape[0] == len(times), "Wrong " + name + " shape. Aborting."
+		assert numpy.array_equal(h5_file["/fields/" + name][:], h5_file_sync["/fields/" + name][:]), (
+			"Wrong " + name + " values. Aborting."
+		)
+	assert not (numpy.allclose(h5_file["/fields/P"][-1], -1.0)), "P snapshot was not consistent. Aborting."
+
+for k_time in range(len(times)):
+	ugrid_sync = read_ugrid(filebasename_sync + "_" + str(k_time).zfill(3) + ".vtu")
+	ugrid = read_ugrid(filebasename_thread + "_" + str(k_time).zfill(3) + ".vtu")
+	assert ugrid.GetNumberOfPoints() == ugrid_sync.GetNumberOfPoints(), "Wrong number of points. Aborting."
+	U_values = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetPointData().GetArray("U"))
+	U_values_sync = vtk.util.numpy_support.vtk_to_numpy(ugrid_sync.GetPointData().GetArray("U"))
+	assert numpy.array_equal(U_values, U_values_sync), "Wrong U point data. Aborting."
+	P_values = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetCellData().GetArray("P"))
+	P_values_sync = vtk.util.numpy_support.vtk_to_numpy(ugrid_sync.GetCellData().GetArray("P"))
+	assert numpy.array_equal(P_values, P_values_sync), "Wrong P cell data. Aborting."
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,97 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests writing checkpoints with the TimeIntegrator, and restarting from them."""
+
+#################################################################### imports ###
+
+import json
+import os
+import shutil
+import sys
+
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def run(dim, integrator_params, res_basename, integrator_kwargs={}):
+	"""Runs a two-step Rivlin cube under surface force, and returns the final displacement and the time steps."""
+	displacement, measure = dmech.runs.RivlinCube_Hyperelasticity(
+		dim=dim,
+		cube_params={"mesh_filebasename": res_folder + "/" + "mesh"},
+		mat_params={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+		step_params={"n_steps": 2, "Deltat": 2.0, "dt_ini": 0.5, "dt_min": 0.02},
+		load_params={"type": "surf0"},
+		solver_params={"sol_tol": [1e-8]},
+		integrator_params=integrator_params,
+		integrator_kwargs={
+			"write_statistics": res_basename + "-statistics",
+			"write_statistics_formats": ["json"],
+			**integrator_kwargs,
+		},
+		get_results=1,
+		res_basename=res_basename,
+		verbose=0,
+	)
+	with open(res_basename + "-statistics.json") as file:
+		time_steps = [time_step for time_step in json.load(file)["time_steps"] if time_step["success"]]
+	return displacement.vector().get_local(), time_steps
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	# The predictor & error controller need the converged solutions of the step to be restored
+	for integrator_params in [{}, {"predictor": "quadratic"}, {"predictor": "linear", "dt_controller": "error"}]:
+		res_basename = res_folder + "/" + "run-" + "-".join([str(val) for val in integrator_params.values()])
+		U_ref, time_steps_ref = run(dim=dim, integrator_params=integrator_params, res_basename=res_basename)
+
+		# Restart from the middle of a step, and from the end of a step
+		for t_checkpoint in [0.5, 1.0]:
+			print("dim =", dim, "integrator_params =", integrator_params, "t_checkpoint =", t_checkpoint)
+
+			checkpoint_filebasename = res_basename + "-checkpoint-t=" + str(t_checkpoint)
+			run(
+				dim=dim,
+				integrator_params=integrator_params,
+				res_basename=checkpoint_filebasename,
+				integrator_kwargs={
+					"write_checkpoint": checkpoint_filebasename,
+					"write_checkpoint_schedule": {"times": [t_checkpoint], "at_step_end": False},
+				},
+			)
+			U, time_steps = run(
+				dim=dim,
+				integrator_params=integrator_params,
+				res_basename=checkpoint_filebasename + "-restart",
+				integrator_kwargs={"restart_from": checkpoint_filebasename + ".h5"},
+			)
+			assert min([time_step["t"] for time_step in time_steps]) > t_checkpoint, (
+				"Restarted run should start after the checkpoint. Aborting."
+			)
+			assert numpy.allclose(U, U_ref, rtol=1e-6, atol=1e-6 * numpy.max(numpy.abs(U_ref))), (
+				"Restarted run differs from the uninterrupted run. Aborting."
+			)
+			time_steps_ref_after = [time_step for time_step in time_steps_ref if time_step["t"] > t_checkpoint + 1e-9]
+			assert numpy.allclose(
+				[time_step["t"] for time_step in time_steps], [time_step["t"] for time_step in time_steps_ref_after]
+			), "Restarted run should take the same time steps as the uninterrupted run. Aborting."
+			assert [time_step["n_iter"] for time_step in time_steps] == [
+				time_step["n_iter"] for time_step in time_steps_ref_after
+			], "Restarted run should take the same iterations as the uninterrupted run. Aborting."
+
+shutil.rmtree(res_folder)
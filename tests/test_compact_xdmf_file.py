@@ -0,0 +1,96 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the CompactXDMFFile mesh, times & fields datasets, and the rewriting of its index."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+import xml.etree.ElementTree
+
+import dolfin
+import h5py
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def get_index_times(filename):
+	"""Returns the times referenced by an XDMF index."""
+	root = xml.etree.ElementTree.parse(filename).getroot()
+	return [float(time.get("Value")) for time in root.iter("Time")]
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	print("dim =", dim)
+
+	if dim == 2:
+		mesh = dolfin.UnitSquareMesh(3, 2)
+	elif dim == 3:
+		mesh = dolfin.UnitCubeMesh(2, 1, 2)
+
+	U = dolfin.Function(dolfin.VectorFunctionSpace(mesh, "CG", 1))
+	U.rename("U", "U")
+	P = dolfin.Function(dolfin.FunctionSpace(mesh, "DG", 0))
+	P.rename("P", "P")
+	Q = dolfin.Function(dolfin.FunctionSpace(mesh, "CG", 2))
+	Q.rename("Q", "Q")
+	functions = [U, P, Q]
+
+	filename = res_folder + "/" + "sol-dim=" + str(dim) + ".xdmf"
+	xdmf_file = dmech.core.CompactXDMFFile(filename=filename, functions=functions, index_interval=2)
+
+	times = [0.0, 0.5, 1.0]
+	U_values_lst = []
+	P_values_lst = []
+	Q_values_lst = []
+	for k_time, time in enumerate(times):
+		U.interpolate(dolfin.Expression(["t*x[0]", "t*x[1]", "t*x[0]*x[1]"][:dim], t=time, degree=2))
+		P.interpolate(dolfin.Expression("1 + t*x[0]", t=time, degree=1))
+		Q.interpolate(dolfin.Expression("t*x[0]*x[0]", t=time, degree=2))
+		U_values_lst += [U.compute_vertex_values(mesh).reshape((dim, -1)).T]
+		P_values_lst += [
+			numpy.array([P.vector()[P.function_space().dofmap().cell_dofs(k)[0]] for k in range(mesh.num_cells())])
+		]
+		Q_values_lst += [Q.compute_vertex_values(mesh)]
+		xdmf_file.write(time)
+
+		# The index is only rewritten every index_interval writes
+		if k_time == 0:
+			assert not (os.path.exists(filename)), "Index should not be written yet. Aborting."
+		else:
+			assert get_index_times(filename) == times[:2], "Wrong index times. Aborting."
+	xdmf_file.close()
+	assert get_index_times(filename) == times, "Wrong final index times. Aborting."
+
+	with h5py.File(os.path.splitext(filename)[0] + ".h5", "r") as h5_file:
+		assert numpy.allclose(h5_file["/times"][:], times), "Wrong times. Aborting."
+		assert numpy.allclose(h5_file["/mesh/geometry"][:, :dim], mesh.coordinates()), "Wrong geometry. Aborting."
+		assert numpy.array_equal(h5_file["/mesh/topology"][:], mesh.cells()), "Wrong topology. Aborting."
+		assert h5_file["/fields/U"].shape == (len(times), mesh.num_vertices(), 3), "Wrong U shape. Aborting."
+		assert h5_file["/fields/P"].shape == (len(times), mesh.num_cells(), 1), "Wrong P shape. Aborting."
+		for k_time in range(len(times)):
+			assert numpy.allclose(h5_file["/fields/U"][k_time, :, :dim], U_values_lst[k_time]), (
+				"Wrong U values. Aborting."
+			)
+			assert numpy.allclose(h5_file["/fields/P"][k_time, :, 0], P_values_lst[k_time]), "Wrong P values. Aborting."
+			assert numpy.allclose(h5_file["/fields/Q"][k_time, :, 0], Q_values_lst[k_time]), "Wrong Q values. Aborting."
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,86 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that FOIs updated by assembly, on diagonal mass spaces, match FOIs updated by local solver."""
+
+#################################################################### imports ###
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+form_compiler_parameters = {"quadrature_degree": 2, "quadrature_rule": "default"}
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	if dim == 2:
+		mesh = dolfin.UnitSquareMesh(4, 4)
+	elif dim == 3:
+		mesh = dolfin.UnitCubeMesh(2, 2, 2)
+
+	V = dolfin.VectorFunctionSpace(mesh, "CG", 2)
+	U = dolfin.Function(V)
+	U.interpolate(dolfin.Expression(["x[1]*x[1]", "x[0]*x[1]", "x[0]"][:dim], degree=2))
+	F = dolfin.Identity(dim) + dolfin.grad(U)
+
+	family_lst = []
+	family_lst += ["DG"]
+	family_lst += ["Quadrature"]
+	for family in family_lst:
+		print("dim =", dim, "family =", family)
+
+		if family == "DG":
+			fe_sca = dolfin.FiniteElement(family="DG", cell=mesh.ufl_cell(), degree=0)
+			fe_ten = dolfin.TensorElement(family="DG", cell=mesh.ufl_cell(), degree=0)
+		elif family == "Quadrature":
+			fe_sca = dolfin.FiniteElement(family="Quadrature", cell=mesh.ufl_cell(), degree=2, quad_scheme="default")
+			fe_ten = dolfin.TensorElement(family="Quadrature", cell=mesh.ufl_cell(), degree=2, quad_scheme="default")
+
+		for fe, expr in [(fe_sca, dolfin.det(F)), (fe_ten, F.T * F)]:
+			fs = dolfin.FunctionSpace(mesh, fe)
+			assert dmech.core.FOI.has_diagonal_mass(fs), "Mass should be diagonal. Aborting."
+
+			foi_ref = dmech.core.FOI(
+				expr=expr, fs=fs, form_compiler_parameters=form_compiler_parameters, update_type="local_solver"
+			)
+			foi_ref.update()
+
+			foi = dmech.core.FOI(
+				expr=expr, fs=fs, form_compiler_parameters=form_compiler_parameters, update_type="assemble"
+			)
+			foi.update()
+			assert numpy.allclose(foi.func.vector().get_local(), foi_ref.func.vector().get_local()), (
+				"FOI assemble update differs from local solver update. Aborting."
+			)
+
+			fois = [
+				dmech.core.FOI(
+					expr=expr, fs=fs, form_compiler_parameters=form_compiler_parameters, update_type="assemble"
+				)
+				for _ in range(2)
+			]
+			dmech.core.FOIBatch(fois, form_compiler_parameters=form_compiler_parameters).update()
+			for foi in fois:
+				assert numpy.allclose(foi.func.vector().get_local(), foi_ref.func.vector().get_local()), (
+					"FOIBatch assemble update differs from local solver update. Aborting."
+				)
+
+fs = dolfin.FunctionSpace(mesh, "DG", 1)
+rejected = False
+try:
+	dmech.core.FOI(expr=dolfin.Constant(1.0), fs=fs, update_type="assemble")
+except AssertionError:
+	rejected = True
+assert rejected, "FOI assemble update should be rejected on DG1. Aborting."
@@ -0,0 +1,62 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that FOIs updated by batch give the same values as FOIs updated separately."""
+
+#################################################################### imports ###
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	if dim == 2:
+		mesh = dolfin.UnitSquareMesh(4, 4)
+	elif dim == 3:
+		mesh = dolfin.UnitCubeMesh(2, 2, 2)
+	X = dolfin.SpatialCoordinate(mesh)
+
+	V = dolfin.VectorFunctionSpace(mesh, "CG", 2)
+	U = dolfin.Function(V)
+	U.interpolate(dolfin.Expression(["x[1]*x[1]", "x[0]*x[1]", "x[0]"][:dim], degree=2))
+	F = dolfin.Identity(dim) + dolfin.grad(U)
+
+	expr_lst = [dolfin.det(F), dolfin.tr(F.T * F), X[0] * dolfin.det(F)]
+
+	for degree in [0, 1]:
+		for shape in ["scalar", "tensor"]:
+			print("dim =", dim, "degree =", degree, "shape =", shape)
+
+			if shape == "scalar":
+				fe = dolfin.FiniteElement(family="DG", cell=mesh.ufl_cell(), degree=degree)
+				exprs = expr_lst
+			elif shape == "tensor":
+				fe = dolfin.TensorElement(family="DG", cell=mesh.ufl_cell(), degree=degree)
+				exprs = [F, F.T * F, dolfin.inv(F)]
+			fs = dolfin.FunctionSpace(mesh, fe)
+
+			fois_ref = [dmech.core.FOI(expr=expr, fs=fs, update_type="local_solver") for expr in exprs]
+			for foi in fois_ref:
+				foi.update()
+
+			fois = [dmech.core.FOI(expr=expr, fs=fs, update_type="local_solver") for expr in exprs]
+			foi_batch = dmech.core.FOIBatch(fois)
+			for _ in range(2):  # the second update reuses the factorization
+				foi_batch.update()
+				for foi, foi_ref in zip(fois, fois_ref):
+					assert numpy.allclose(foi.func.vector().get_local(), foi_ref.func.vector().get_local()), (
+						"FOIBatch update differs from individual FOI update. Aborting."
+					)
@@ -0,0 +1,86 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that lazily updated FOIs give the same QOIs & FOIs as FOIs updated at each time step."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def get_problem(read_foi):
+	"""Returns a clamped cube under volume force, with a QOI reading a FOI function, or not."""
+	mesh = dolfin.UnitCubeMesh(1, 1, 1)
+	problem = dmech.problems.Hyperelasticity(
+		mesh=mesh, displacement_degree=1, elastic_behavior={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}}
+	)
+	problem.add_constraint(V=problem.displacement_subsol.fs, sub_domain="near(x[0], 0.)", val=[0.0] * 3)
+	k_step = problem.add_step(Deltat=1.0, dt_ini=0.25, dt_min=0.25)
+	problem.add_volume_force0_loading_operator(
+		measure=problem.dV, F_ini=[0.0] * 3, F_fin=[0.2] + [0.0] * 2, k_step=k_step
+	)
+	problem.add_global_strain_qois()
+	if read_foi:
+		problem.add_qoi(name="J_foi", expr=problem.get_foi("J").func * problem.dV)
+	return problem
+
+
+for read_foi in [0, 1]:
+	print("read_foi =", read_foi)
+
+	qois_lst = []
+	J_foi_values_lst = []
+	# Without writing the solution, FOIs are only updated if read by a QOI; writing it updates them at each step
+	for write_sol in [0, 1]:
+		print("write_sol =", write_sol)
+
+		res_basename = res_folder + "/" + "read_foi=" + str(read_foi) + "-write_sol=" + str(write_sol)
+
+		problem = get_problem(read_foi)
+		solver = dmech.core.NonlinearSolver(
+			problem=problem, parameters={"sol_tol": [1e-6] * len(problem.subsols)}, print_out=0
+		)
+		integrator = dmech.core.TimeIntegrator(
+			problem=problem,
+			solver=solver,
+			parameters={},
+			print_out=0,
+			print_sta=0,
+			write_qois=res_basename + "-qois",
+			write_sol=res_basename * write_sol,
+		)
+		success = integrator.integrate()
+		assert success, "Integration failed. Aborting."
+		integrator.close()
+
+		if not (write_sol):
+			assert problem.fois_outdated == (not (read_foi)), "FOIs should only be updated if read. Aborting."
+
+		qois_lst += [numpy.loadtxt(res_basename + "-qois.dat")]
+		J_foi_values_lst += [problem.get_foi("J").func.vector().get_local()]
+
+	assert qois_lst[0].shape == qois_lst[1].shape, "Wrong number of QOIs. Aborting."
+	assert numpy.allclose(qois_lst[0], qois_lst[1]), "Lazy FOIs give different QOIs. Aborting."
+	assert numpy.allclose(J_foi_values_lst[0], J_foi_values_lst[1]), "Lazy FOIs give different FOIs. Aborting."
+	assert not (numpy.allclose(J_foi_values_lst[0], 1.0)), "FOIs were not updated. Aborting."
+
+shutil.rmtree(res_folder)
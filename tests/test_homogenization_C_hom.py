@@ -0,0 +1,102 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that the homogenized stiffness computed with a single factorization matches separate solves."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def get_C_hom_ref(homogenization):
+	"""Computes the homogenized stiffness matrix by solving each corrector problem separately."""
+	Ve = dolfin.VectorElement("CG", homogenization.mesh.ufl_cell(), 2)
+	Re = dolfin.VectorElement("R", homogenization.mesh.ufl_cell(), 0)
+	W = dolfin.FunctionSpace(
+		homogenization.mesh,
+		dolfin.MixedElement([Ve, Re]),
+		constrained_domain=dmech.core.get_PeriodicSubDomain(homogenization.dim, homogenization.bbox, pbc_type="python"),
+	)
+
+	v_test, lmbda_test = dolfin.TestFunctions(W)
+	v_tria, lmbda_tria = dolfin.TrialFunctions(W)
+
+	macro_strain = dolfin.Constant(numpy.zeros((homogenization.dim, homogenization.dim)))
+	F = dolfin.inner(homogenization.sigma(v_tria, macro_strain), homogenization.eps(v_test)) * homogenization.dV
+	a, b = dolfin.lhs(F), dolfin.rhs(F)
+	a += dolfin.inner(lmbda_test, v_tria) * homogenization.dV
+	a += dolfin.inner(lmbda_tria, v_test) * homogenization.dV
+
+	w = dolfin.Function(W)
+	(v, lmbda) = dolfin.split(w)
+
+	C_hom = numpy.zeros((homogenization.n_Voigt, homogenization.n_Voigt))
+	for j in range(homogenization.n_Voigt):
+		macro_strain.assign(dolfin.Constant(homogenization.get_macro_strain(j)))
+		dolfin.solve(a == b, w, solver_parameters={"linear_solver": "mumps"})
+		for k in range(homogenization.n_Voigt):
+			C_hom[j, k] = dolfin.assemble(
+				homogenization.stress2Voigt(homogenization.sigma(v, macro_strain))[k] * homogenization.dV
+			)
+			C_hom[j, k] /= homogenization.vol
+	return C_hom
+
+
+dim_lst = []
+dim_lst += [2]
+# dim_lst += [3]
+for dim in dim_lst:
+	mesh = dmech.runs.HollowBox_Mesh(
+		params={
+			"dim": dim,
+			"xmin": 0.0,
+			"ymin": 0.0,
+			"zmin": 0.0,
+			"xmax": 1.0,
+			"ymax": 1.0,
+			"zmax": 1.0,
+			"r0": 1 / 5,
+			"l": 1 / 10,
+			"mesh_filebasename": res_folder + "/" + "mesh",
+		}
+	)
+	bbox = dmech.core.get_mesh_geometry(mesh)["bbox"]
+
+	for nu in [0.0, 0.3, 0.49]:
+		print("dim =", dim, "nu =", nu)
+
+		homogenization = dmech.problems.Homogenization(
+			dim=dim, mesh=mesh, mat_params={"E": 2.0, "nu": nu}, vol=1.0, bbox=bbox
+		)
+		C_hom_ref = get_C_hom_ref(homogenization)
+
+		C_hom = homogenization.get_C_hom()
+		assert numpy.allclose(C_hom, C_hom_ref, rtol=1e-8, atol=1e-10 * numpy.max(numpy.abs(C_hom_ref))), (
+			"C_hom differs from separate corrector solves. Aborting."
+		)
+
+		lmbda_hom, mu_hom = homogenization.get_lambda_and_mu()
+		assert numpy.isclose(lmbda_hom, C_hom_ref[0, 1]) and numpy.isclose(
+			mu_hom, C_hom_ref[2, 2] if (dim == 2) else C_hom_ref[4, 4]
+		), "Wrong homogenized Lamé coefficients. Aborting."
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,83 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that batched homogenization problems match separate problems, sequentially and in parallel."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+# Worker processes are spawned, and re-import this script
+if __name__ == "__main__":
+	res_folder = sys.argv[0][:-3]
+	os.makedirs(res_folder, exist_ok=True)
+
+	mat_params_lst = [{"E": 1.0, "nu": 0.3}, {"E": 2.0, "nu": 0.2}, {"E": 3.0, "nu": 0.3}]
+
+	dim_lst = []
+	dim_lst += [2]
+	# dim_lst += [3]
+	for dim in dim_lst:
+		print("dim =", dim)
+
+		mesh_params_lst = [
+			{
+				"dim": dim,
+				"xmin": 0.0,
+				"ymin": 0.0,
+				"zmin": 0.0,
+				"xmax": 1.0,
+				"ymax": 1.0,
+				"zmax": 1.0,
+				"r0": r0,
+				"l": 1 / 10,
+				"mesh_filebasename": res_folder + "/" + "mesh",
+			}
+			for r0 in [1 / 5, 1 / 4]
+		]
+
+		# Batched materials match separate problems
+		C_hom_lst_ref = []
+		for k_mesh, mesh_params in enumerate(mesh_params_lst):
+			mesh_params = dict(mesh_params)
+			mesh_params["mesh_filebasename"] += "-ref-" + str(k_mesh)
+			mesh = dmech.runs.HollowBox_Mesh(params=mesh_params)
+			bbox = dmech.core.get_mesh_geometry(mesh)["bbox"]
+			C_hom_lst_ref += [
+				[
+					dmech.problems.Homogenization(
+						dim=dim, mesh=mesh, mat_params=mat_params, vol=1.0, bbox=bbox
+					).get_C_hom()
+					for mat_params in mat_params_lst
+				]
+			]
+
+		# Cells computed in parallel processes match cells computed sequentially
+		for n_procs in [1, 2]:
+			print("n_procs =", n_procs)
+
+			C_hom_lst = dmech.runs.HollowBox_Homogenization_Batch(
+				dim=dim, mesh_params_lst=mesh_params_lst, mat_params_lst=mat_params_lst, n_procs=n_procs
+			)
+			for C_hom_mat_lst, C_hom_mat_lst_ref in zip(C_hom_lst, C_hom_lst_ref):
+				for C_hom, C_hom_ref in zip(C_hom_mat_lst, C_hom_mat_lst_ref):
+					assert numpy.allclose(C_hom, C_hom_ref, rtol=1e-8, atol=1e-10 * numpy.max(numpy.abs(C_hom_ref))), (
+						"Batched C_hom differs from separate problems. Aborting."
+					)
+
+	shutil.rmtree(res_folder)
@@ -0,0 +1,89 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the VTK ordering of the quadratic cells built by mesh2ugrid, and its per-mesh cache."""
+
+#################################################################### imports ###
+
+import gc
+import importlib
+
+import dolfin
+import numpy
+import vtk.util.numpy_support
+
+import dolfin_mech as dmech
+
+mesh2ugrid_module = importlib.import_module("dolfin_mech.core.mesh2ugrid")
+
+####################################################################### test ###
+
+# VTK ordering of the edge midpoints of quadratic cells
+vtk_quadratic_edges = {2: [(0, 1), (1, 2), (2, 0)], 3: [(0, 1), (1, 2), (0, 2), (0, 3), (1, 3), (2, 3)]}
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	print("dim =", dim)
+
+	if dim == 2:
+		mesh = dolfin.UnitSquareMesh(3, 2, "crossed")
+		f_str = "1 + x[0] + 2*x[1] + 3*x[0]*x[1] + x[1]*x[1]"
+		g_str = "1 + x[0] - 2*x[1]"
+	elif dim == 3:
+		mesh = dolfin.UnitCubeMesh(2, 1, 2)
+		f_str = "1 + x[0] + 2*x[1] + 3*x[0]*x[2] + x[2]*x[2]"
+		g_str = "1 + x[0] - 2*x[1] + x[2]"
+	n_verts = dim + 1
+
+	ugrid = dmech.core.mesh2ugrid(mesh, degree=2)
+	points = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetPoints().GetData())[:, :dim]
+	assert ugrid.GetNumberOfCells() == mesh.num_cells(), "Wrong number of cells. Aborting."
+	for k_cell in range(ugrid.GetNumberOfCells()):
+		cell_ids = ugrid.GetCell(k_cell).GetPointIds()
+		cell_points = points[[cell_ids.GetId(k_node) for k_node in range(cell_ids.GetNumberOfIds())]]
+		assert numpy.allclose(cell_points[:n_verts], mesh.coordinates()[mesh.cells()[k_cell]]), (
+			"Quadratic cell vertices do not match mesh cell vertices. Aborting."
+		)
+		for k_edge, (k_vert, l_vert) in enumerate(vtk_quadratic_edges[dim]):
+			assert numpy.allclose(cell_points[n_verts + k_edge], (cell_points[k_vert] + cell_points[l_vert]) / 2), (
+				"Quadratic cell edge midpoints are not in VTK order. Aborting."
+			)
+
+	# CG2 functions are exact at all points, CG1 functions are linearly interpolated at the edge midpoints
+	for degree, expr_str in [(2, f_str), (1, g_str)]:
+		for shape in ["scalar", "vector"]:
+			if shape == "scalar":
+				fs = dolfin.FunctionSpace(mesh, "CG", degree)
+				expr = dolfin.Expression(expr_str, degree=degree)
+			elif shape == "vector":
+				fs = dolfin.VectorFunctionSpace(mesh, "CG", degree)
+				expr = dolfin.Expression([expr_str] * dim, degree=degree)
+			func = dolfin.interpolate(expr, fs)
+			func.rename("func", "func")
+
+			ugrid = dmech.core.mesh2ugrid(mesh, degree=2)
+			dmech.core.add_function_to_ugrid(func, ugrid, force_3d_field=0)
+			values = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetPointData().GetArray("func"))
+			values_ref = numpy.array([func(point) for point in points])
+			assert numpy.allclose(values, values_ref), "Point data do not match function values. Aborting."
+
+	# The cached points are rebuilt when the mesh moves
+	mesh.coordinates()[:] *= 2.0
+	ugrid = dmech.core.mesh2ugrid(mesh, degree=2)
+	points_moved = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetPoints().GetData())[:, :dim]
+	assert numpy.allclose(points_moved, 2 * points), "Cached points were not updated. Aborting."
+
+	# The cache is freed with the mesh
+	assert mesh in mesh2ugrid_module.mesh2ugrid_cache, "Mesh should be cached. Aborting."
+	del mesh, ugrid, fs, func
+	gc.collect()
+	assert len(mesh2ugrid_module.mesh2ugrid_cache) == 0, "Cache should be freed with the mesh. Aborting."
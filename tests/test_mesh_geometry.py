@@ -0,0 +1,118 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the mesh geometry quantities against assembled integrals, and their cache."""
+
+#################################################################### imports ###
+
+import gc
+import importlib
+import os
+import shutil
+import sys
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+meshgeometry_module = importlib.import_module("dolfin_mech.core.meshgeometry")
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def check_mesh_geometry(mesh, boundaries_mf):
+	"""Compares the geometric constants of a mesh to their assembled values."""
+	dim = mesh.geometry().dim()
+	dV = dolfin.Measure("dx", domain=mesh)
+	dS = dolfin.Measure("exterior_facet", domain=mesh, subdomain_data=boundaries_mf)
+	X = dolfin.SpatialCoordinate(mesh)
+
+	mesh_geometry = dmech.core.get_mesh_geometry(mesh, boundaries=boundaries_mf, force=True)
+
+	V0 = dolfin.assemble(dolfin.Constant(1) * dV)
+	assert numpy.isclose(mesh_geometry["V0"], V0), "Wrong volume. Aborting."
+	assert numpy.isclose(dmech.core.get_volume(dV), V0), "Wrong volume. Aborting."
+
+	X0 = [dolfin.assemble(X[k_dim] * dV) / V0 for k_dim in range(dim)]
+	assert numpy.allclose(mesh_geometry["X0"], X0), "Wrong centroid. Aborting."
+
+	bbox = [
+		val for k_dim in range(dim) for val in (min(mesh.coordinates()[:, k_dim]), max(mesh.coordinates()[:, k_dim]))
+	]
+	assert numpy.allclose(mesh_geometry["bbox"], bbox), "Wrong bounding box. Aborting."
+
+	S0 = dolfin.assemble(dolfin.Constant(1) * dS)
+	assert numpy.isclose(mesh_geometry["S0"], S0), "Wrong boundary area. Aborting."
+	assert numpy.isclose(dmech.core.get_boundary_area(dS), S0), "Wrong boundary area. Aborting."
+
+	for marker in set(boundaries_mf.array()):
+		S_marker = dolfin.assemble(dolfin.Constant(1) * dS(int(marker)))
+		assert numpy.isclose(mesh_geometry["boundary_areas"].get(int(marker), 0.0), S_marker), (
+			"Wrong boundary part area. Aborting."
+		)
+		assert numpy.isclose(dmech.core.get_boundary_area(dS(int(marker))), S_marker), (
+			"Wrong boundary part area. Aborting."
+		)
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	print("dim =", dim)
+
+	# Simplices
+	mesh, boundaries_mf = dmech.runs.RivlinCube_Mesh(
+		dim=dim, params={"X1": 2.0, "Y1": 0.5, "l": 0.25, "mesh_filebasename": res_folder + "/" + "mesh"}
+	)[:2]
+	U = dolfin.interpolate(
+		dolfin.Expression(["0.1*x[1]*x[1]", "0.2*x[0]", "0.1*x[0]*x[1]"][:dim], degree=2),
+		dolfin.VectorFunctionSpace(mesh, "CG", 1),
+	)
+	dolfin.ALE.move(mesh, U)
+	check_mesh_geometry(mesh, boundaries_mf)
+
+	# Cached values are reused until the mesh moves
+	mesh_geometry = dmech.core.get_mesh_geometry(mesh)
+	assert dmech.core.get_mesh_geometry(mesh) is mesh_geometry, "Values should be cached. Aborting."
+	for move in ["ALE", "coordinates"]:
+		if move == "ALE":
+			dolfin.ALE.move(mesh, U)
+		elif move == "coordinates":
+			mesh.coordinates()[:] *= 2.0
+		V0 = dolfin.assemble(dolfin.Constant(1) * dolfin.Measure("dx", domain=mesh))
+		assert numpy.isclose(dmech.core.get_mesh_geometry(mesh)["V0"], V0), "Values should be updated. Aborting."
+
+	# The cache is freed with the mesh
+	assert mesh in meshgeometry_module.mesh_geometry_cache, "Mesh should be cached. Aborting."
+	del mesh, boundaries_mf, U
+	gc.collect()
+	assert len(meshgeometry_module.mesh_geometry_cache) == 0, "Cache should be freed with the mesh. Aborting."
+
+	# Non-simplices
+	if dim == 2:
+		mesh = dolfin.RectangleMesh.create(
+			[dolfin.Point(0.0, 0.0), dolfin.Point(2.0, 1.0)], [4, 3], dolfin.CellType.Type.quadrilateral
+		)
+	elif dim == 3:
+		mesh = dolfin.BoxMesh.create(
+			[dolfin.Point(0.0, 0.0, 0.0), dolfin.Point(2.0, 1.0, 0.5)], [4, 3, 2], dolfin.CellType.Type.hexahedron
+		)
+	boundaries_mf = dolfin.MeshFunction("size_t", mesh, dim - 1)
+	boundaries_mf.set_all(0)
+	dolfin.CompiledSubDomain("near(x[0], 0.0) && on_boundary").mark(boundaries_mf, 1)
+	dolfin.CompiledSubDomain("near(x[1], 1.0) && on_boundary").mark(boundaries_mf, 2)
+	check_mesh_geometry(mesh, boundaries_mf)
+
+shutil.rmtree(res_folder)
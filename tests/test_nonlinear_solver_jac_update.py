@@ -0,0 +1,99 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the Jacobian update policies (modified Newton) of the NonlinearSolver."""
+
+#################################################################### imports ###
+
+import json
+import os
+import shutil
+import sys
+
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def run(dim, solver_params, res_basename):
+	"""Runs a Rivlin cube under surface force, and returns the final displacement and the iterations."""
+	displacement, measure = dmech.runs.RivlinCube_Hyperelasticity(
+		dim=dim,
+		cube_params={"mesh_filebasename": res_folder + "/" + "mesh"},
+		mat_params={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+		step_params={"dt_ini": 0.1, "dt_min": 0.001},
+		load_params={"type": "surf0"},
+		solver_params={"sol_tol": [1e-8], "n_iter_max": 64, **solver_params},
+		integrator_kwargs={
+			# Clipping the time steps to the output times changes dt during the step
+			"write_qois_schedule": {"dt": 0.25},
+			"write_statistics": res_basename + "-statistics",
+			"write_statistics_formats": ["json"],
+		},
+		get_results=1,
+		res_basename=res_basename,
+		verbose=0,
+	)
+	with open(res_basename + "-statistics.json") as file:
+		statistics = json.load(file)
+	assert len(set([time_step["dt"] for time_step in statistics["time_steps"]])) > 1, (
+		"dt should change during the run. Aborting."
+	)
+	return displacement.vector().get_local(), statistics["iterations"]
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	U_ref, iterations_ref = run(dim=dim, solver_params={}, res_basename=res_folder + "/" + "run-full")
+	assert all([iteration["jac_updated"] for iteration in iterations_ref]), (
+		"Full Newton should update the Jacobian at each iteration. Aborting."
+	)
+
+	# Modified Newton converges to the same solution, with fewer Jacobian updates
+	solver_params_lst = [
+		{"jac_update_n_iter": 3},
+		{"jac_update_n_iter": None, "jac_update_res_ratio_max": 0.1},
+		{"jac_update_n_iter": None, "jac_update_res_ratio_max": 0.1, "jac_update_carry_over": True},
+	]
+	for k_params, solver_params in enumerate(solver_params_lst):
+		print("dim =", dim, "solver_params =", solver_params)
+
+		U, iterations = run(
+			dim=dim, solver_params=solver_params, res_basename=res_folder + "/" + "run-" + str(k_params)
+		)
+		assert numpy.allclose(U, U_ref, rtol=1e-6, atol=1e-6 * numpy.max(numpy.abs(U_ref))), (
+			"Modified Newton differs from full Newton. Aborting."
+		)
+		assert not (all([iteration["jac_updated"] for iteration in iterations])), (
+			"Modified Newton should reuse the Jacobian. Aborting."
+		)
+
+		# The Jacobian is updated as soon as the residual of the current iterate contracts too slowly
+		if solver_params.get("jac_update_res_ratio_max") is not None:
+			for iteration_old, iteration in zip(iterations[:-1], iterations[1:]):
+				if (
+					(iteration["k_iter"] > 1)
+					and (iteration_old["k_iter"] == iteration["k_iter"] - 1)
+					and numpy.isfinite(iteration["res_norm"])
+					and (iteration_old["res_norm"] > 0.0)
+				):
+					res_ratio = iteration["res_norm"] / iteration_old["res_norm"]
+					assert (res_ratio <= solver_params["jac_update_res_ratio_max"]) or iteration["jac_updated"], (
+						"Jacobian should be updated after a slow residual contraction. Aborting."
+					)
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,68 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the Krylov backend of the NonlinearSolver, with field-split & near-nullspace preconditioning."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def run(dim, incomp, solver_params, res_basename):
+	"""Runs a Rivlin cube under surface force, and returns the final displacement."""
+	displacement, measure = dmech.runs.RivlinCube_Hyperelasticity(
+		dim=dim,
+		incomp=incomp,
+		cube_params={"mesh_filebasename": res_folder + "/" + "mesh"},
+		mat_params={
+			"model": "NHMR" if (incomp) else "CGNHMR",
+			"parameters": {"E": 1.0, "nu": 0.5 if (incomp) else 0.3},
+		},
+		step_params={"dt_ini": 0.25, "dt_min": 0.01},
+		load_params={"type": "surf0"},
+		solver_params={"sol_tol": [1e-8] * (1 + incomp), **solver_params},
+		get_results=1,
+		res_basename=res_basename,
+		verbose=0,
+	)
+	return displacement.vector().get_local()
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	# Single field, preconditioned with GAMG & the rigid body modes; two fields, with a Schur complement split
+	for incomp in [0, 1]:
+		print("dim =", dim, "incomp =", incomp)
+
+		U_ref = run(dim=dim, incomp=incomp, solver_params={}, res_basename=res_folder + "/" + "run-direct")
+		U = run(
+			dim=dim,
+			incomp=incomp,
+			solver_params={"linear_solver_type": "krylov", "linear_solver_rtol": 1e-12},
+			res_basename=res_folder + "/" + "run-krylov",
+		)
+		assert numpy.allclose(U, U_ref, rtol=1e-6, atol=1e-6 * numpy.max(numpy.abs(U_ref))), (
+			"Krylov solution differs from direct solution. Aborting."
+		)
+
+shutil.rmtree(res_folder)
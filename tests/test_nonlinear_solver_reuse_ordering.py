@@ -0,0 +1,86 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the reuse of the MUMPS ordering of the Jacobian across Newton iterations and time steps."""
+
+#################################################################### imports ###
+
+import json
+import os
+import shutil
+import sys
+
+import numpy
+import petsc4py.PETSc
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def run(dim, solver_params, res_basename):
+	"""Runs a Rivlin cube under surface force, and returns the final displacement and the time steps."""
+	displacement, measure = dmech.runs.RivlinCube_Hyperelasticity(
+		dim=dim,
+		cube_params={"mesh_filebasename": res_folder + "/" + "mesh"},
+		mat_params={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+		step_params={"n_steps": 2, "Deltat": 2.0, "dt_ini": 0.2, "dt_min": 0.002},
+		load_params={"type": "surf0"},
+		solver_params={"sol_tol": [1e-8], **solver_params},
+		integrator_kwargs={
+			"write_statistics": res_basename + "-statistics",
+			"write_statistics_formats": ["json"],
+		},
+		get_results=1,
+		res_basename=res_basename,
+		verbose=0,
+	)
+	with open(res_basename + "-statistics.json") as file:
+		time_steps = json.load(file)["time_steps"]
+	return displacement.vector().get_local(), time_steps
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	U_ref, time_steps_ref = run(dim=dim, solver_params={}, res_basename=res_folder + "/" + "run-ref")
+
+	# Reusing the ordering, with or without checking the pattern, does not change the solution
+	solver_params_lst = [
+		{"reuse_symbolic_factorization": True},
+		{"reuse_symbolic_factorization": True, "check_jac_mat_pattern": True},
+	]
+	for k_params, solver_params in enumerate(solver_params_lst):
+		print("dim =", dim, "solver_params =", solver_params)
+
+		U, time_steps = run(
+			dim=dim, solver_params=solver_params, res_basename=res_folder + "/" + "run-" + str(k_params)
+		)
+		assert petsc4py.PETSc.Options().getBool("pc_factor_reuse_ordering", default=False), (
+			"Ordering should be reused. Aborting."
+		)
+		assert numpy.allclose(U, U_ref, rtol=1e-6, atol=1e-6 * numpy.max(numpy.abs(U_ref))), (
+			"Reusing the ordering changed the solution. Aborting."
+		)
+		assert [time_step["n_iter"] for time_step in time_steps] == [
+			time_step["n_iter"] for time_step in time_steps_ref
+		], "Reusing the ordering changed the iterations. Aborting."
+
+	# The option does not leak to the next solvers
+	run(dim=dim, solver_params={}, res_basename=res_folder + "/" + "run-ref")
+	assert not (petsc4py.PETSc.Options().getBool("pc_factor_reuse_ordering", default=False)), (
+		"Ordering reuse should not leak to the next solvers. Aborting."
+	)
+
+shutil.rmtree(res_folder)
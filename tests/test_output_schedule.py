@@ -0,0 +1,92 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the OutputSchedule due times, and that the time integrator hits the output times."""
+
+#################################################################### imports ###
+
+import json
+import os
+import shutil
+import sys
+
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+
+def get_due_times(schedule, t_lst):
+	"""Returns the times at which a schedule is due, along a sequence of converged times."""
+	schedule.start(0.0)
+	return [t for k_t, t in enumerate(t_lst) if schedule.is_due(t, step_end=(k_t == len(t_lst) - 1))]
+
+
+t_lst = [0.1, 0.25, 0.3, 0.55, 0.7, 1.0]
+
+assert get_due_times(dmech.core.OutputSchedule(), t_lst) == t_lst, "Default schedule should always be due. Aborting."
+assert get_due_times(dmech.core.OutputSchedule.from_parameter(None), t_lst) == t_lst, (
+	"Default schedule should always be due. Aborting."
+)
+
+assert get_due_times(dmech.core.OutputSchedule(n_steps=2), t_lst) == [0.25, 0.55, 1.0], (
+	"Wrong n_steps schedule. Aborting."
+)
+assert get_due_times(dmech.core.OutputSchedule(n_steps=4, at_step_end=False), t_lst) == [0.55], (
+	"Wrong n_steps schedule. Aborting."
+)
+
+assert get_due_times(dmech.core.OutputSchedule.from_parameter({"times": [0.3, 0.6]}), t_lst) == [0.3, 0.7, 1.0], (
+	"Wrong times schedule. Aborting."
+)
+
+assert get_due_times(dmech.core.OutputSchedule(dt=0.25, at_step_end=False), t_lst) == [0.25, 0.55, 1.0], (
+	"Wrong dt schedule. Aborting."
+)
+
+schedule = dmech.core.OutputSchedule(times=[0.3, 0.6], dt=0.25)
+assert schedule.get_next_time(0.0) == 0.25, "Wrong next time. Aborting."
+assert schedule.get_next_time(0.25) == 0.3, "Wrong next time. Aborting."
+assert schedule.get_next_time(0.3) == 0.5, "Wrong next time. Aborting."
+assert schedule.get_next_time(0.5) == 0.6, "Wrong next time. Aborting."
+assert dmech.core.OutputSchedule(dt=0.25, clip_dt=False).get_next_time(0.0) is None, (
+	"Unclipped schedule should not constrain dt. Aborting."
+)
+
+# The time integrator hits the output times without taking time steps smaller than dt_min
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+dmech.runs.RivlinCube_Hyperelasticity(
+	dim=2,
+	cube_params={"mesh_filebasename": res_folder + "/" + "mesh"},
+	mat_params={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+	step_params={"dt_ini": 0.25, "dt_min": 0.1},
+	load_params={"type": "surf0"},
+	integrator_kwargs={
+		"write_qois_schedule": {"dt": 0.3},
+		"write_statistics": res_folder + "/" + "statistics",
+		"write_statistics_formats": ["json"],
+	},
+	res_basename=res_folder + "/" + "run",
+	verbose=0,
+)
+
+with open(res_folder + "/" + "statistics.json") as file:
+	time_steps = [time_step for time_step in json.load(file)["time_steps"] if time_step["success"]]
+assert numpy.allclose([time_step["t"] for time_step in time_steps], [0.3, 0.6, 0.9, 1.0]), (
+	"Time steps should hit the output times, without restarting from the clipped dt. Aborting."
+)
+assert min([time_step["dt"] for time_step in time_steps]) >= 0.1 - 1e-9, (
+	"Time steps should not be smaller than dt_min. Aborting."
+)
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,142 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the PeriodicDofMap, which imposes periodicity through a reduction of the assembled systems."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+dim_lst = []
+dim_lst += [2]
+# dim_lst += [3]
+for dim in dim_lst:
+	print("dim =", dim)
+
+	mesh = dmech.runs.HollowBox_Mesh(
+		params={
+			"dim": dim,
+			"xmin": 0.0,
+			"ymin": 0.0,
+			"zmin": 0.0,
+			"xmax": 1.0,
+			"ymax": 1.0,
+			"zmax": 1.0,
+			"r0": 1 / 5,
+			"l": 1 / 10,
+			"mesh_filebasename": res_folder + "/" + "mesh",
+		}
+	)
+	bbox = dmech.core.get_mesh_geometry(mesh)["bbox"]
+	vol = 1.0
+
+	# The reduced space matches the constrained space
+	for family, degree in [("CG", 1), ("CG", 2)]:
+		fs = dolfin.FunctionSpace(mesh, family, degree)
+		periodic_dof_map = dmech.core.PeriodicDofMap(fs, dim, bbox)
+		fs_per = dolfin.FunctionSpace(
+			mesh, family, degree, constrained_domain=dmech.core.get_PeriodicSubDomain(dim, bbox, pbc_type="python")
+		)
+		assert periodic_dof_map.n_reduced_dofs == fs_per.dim(), "Wrong number of reduced dofs. Aborting."
+
+	# The homogenized properties do not depend on the implementation of the periodicity
+	homogenizations = {}
+	results = {}
+	for pbc_type in ["python", "dofmap"]:
+		homogenizations[pbc_type] = dmech.problems.Homogenization(
+			dim=dim,
+			mesh=mesh,
+			mat_params={"E": 1.0, "nu": 0.3},
+			vol=vol,
+			bbox=bbox,
+			pbc_type=pbc_type,
+			pbc_filename=res_folder + "/" + "pbc.npz" if (pbc_type == "dofmap") else None,
+		)
+		results[pbc_type] = (homogenizations[pbc_type].get_C_hom(), homogenizations[pbc_type].get_kappa())
+	assert (
+		homogenizations["dofmap"].periodic_dof_maps["corrector"].n_reduced_dofs
+		== homogenizations["python"].corrector_system["W"].dim()
+	), "Wrong number of reduced dofs. Aborting."
+	assert numpy.allclose(results["dofmap"][0], results["python"][0], rtol=1e-6, atol=1e-9), (
+		"C_hom differs between dofmap & python periodicity. Aborting."
+	)
+	assert numpy.isclose(results["dofmap"][1], results["python"][1], rtol=1e-6), (
+		"kappa differs between dofmap & python periodicity. Aborting."
+	)
+
+	# The corrector and kappa pairings are cached separately, and reused
+	assert os.path.exists(res_folder + "/" + "pbc.npz"), "Corrector pairing not cached. Aborting."
+	assert os.path.exists(res_folder + "/" + "pbc-kappa.npz"), "Kappa pairing not cached. Aborting."
+	homogenization = dmech.problems.Homogenization(
+		dim=dim,
+		mesh=mesh,
+		mat_params={"E": 1.0, "nu": 0.3},
+		vol=vol,
+		bbox=bbox,
+		pbc_type="dofmap",
+		pbc_filename=res_folder + "/" + "pbc.npz",
+	)
+	assert numpy.allclose(homogenization.get_C_hom(), results["dofmap"][0]), "Cached pairing differs. Aborting."
+	assert numpy.isclose(homogenization.get_kappa(), results["dofmap"][1]), "Cached pairing differs. Aborting."
+
+	# A cached pairing is not reused for other periodicity vectors
+	fs = dolfin.FunctionSpace(mesh, "CG", 1)
+	periodic_dof_map = dmech.core.PeriodicDofMap(fs, dim, bbox, filename=res_folder + "/" + "pbc-cg1.npz")
+	bbox_shrunk = list(bbox)
+	bbox_shrunk[1] -= 1e-6
+	periodic_dof_map_shrunk = dmech.core.PeriodicDofMap(fs, dim, bbox_shrunk, filename=res_folder + "/" + "pbc-cg1.npz")
+	assert periodic_dof_map_shrunk.n_reduced_dofs == periodic_dof_map.n_reduced_dofs, (
+		"Pairing differs for shrunk periodicity vectors. Aborting."
+	)
+	checksum = numpy.load(res_folder + "/" + "pbc-cg1.npz")["checksum"]
+	assert numpy.isclose(checksum[-dim * dim], bbox_shrunk[1] - bbox_shrunk[0], rtol=1e-12, atol=0.0), (
+		"Cached pairing was not recomputed for new periodicity vectors. Aborting."
+	)
+
+	# Successive solves reuse the symbolic product and the solver, and match fresh solves
+	fs = dolfin.FunctionSpace(mesh, "CG", 1)
+	u = dolfin.TrialFunction(fs)
+	v = dolfin.TestFunction(fs)
+	b = dolfin.assemble(dolfin.Expression("sin(2*pi*x[0])", degree=2) * v * dolfin.dx)
+	periodic_dof_map = dmech.core.PeriodicDofMap(fs, dim, bbox)
+	A_r = None
+	ksp = None
+	for c in [1.0, 2.0, 5.0]:
+		A = dolfin.PETScMatrix()
+		dolfin.assemble(
+			(dolfin.inner(dolfin.grad(u), dolfin.grad(v)) + dolfin.Constant(c) * u * v) * dolfin.dx, tensor=A
+		)
+		x = dolfin.Function(fs).vector()
+		periodic_dof_map.solve(A, x, b)
+		if A_r is None:
+			A_r = periodic_dof_map.A_r
+			ksp = periodic_dof_map.ksp
+		assert periodic_dof_map.A_r is A_r, "Reduced matrix should be reused. Aborting."
+		assert periodic_dof_map.ksp is ksp, "Solver should be reused. Aborting."
+
+		x_fresh = dolfin.Function(fs).vector()
+		dmech.core.PeriodicDofMap(fs, dim, bbox).solve(A, x_fresh, b)
+		assert numpy.allclose(x.get_local(), x_fresh.get_local(), rtol=1e-10, atol=1e-12), (
+			"Solve with reused matrix differs from fresh solve. Aborting."
+		)
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,73 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that the compiled periodic SubDomain gives the same inside & map as the Python one."""
+
+#################################################################### imports ###
+
+import dolfin
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+case_lst = []
+case_lst += ["square"]
+case_lst += ["parallelogram"]
+case_lst += ["cube"]
+for case in case_lst:
+	print("case =", case)
+
+	if case == "square":
+		dim = 2
+		mesh = dolfin.RectangleMesh(dolfin.Point(0.0, 0.0), dolfin.Point(2.0, 1.0), 4, 2)
+		bbox = [0.0, 2.0, 0.0, 1.0]
+		vertices = None
+	elif case == "parallelogram":
+		dim = 2
+		mesh = dolfin.UnitSquareMesh(4, 4)
+		mesh.coordinates()[:, 0] += 0.5 * mesh.coordinates()[:, 1]
+		bbox = [0.0, 1.5, 0.0, 1.0]
+		vertices = numpy.array([[0.0, 0.0], [1.0, 0.0], [1.5, 1.0], [0.5, 1.0]])
+	elif case == "cube":
+		dim = 3
+		mesh = dolfin.UnitCubeMesh(2, 2, 2)
+		bbox = [0.0, 1.0, 0.0, 1.0, 0.0, 1.0]
+		vertices = None
+
+	sd_cpp = dmech.core.get_PeriodicSubDomain(dim, bbox, vertices, pbc_type="cpp")
+	sd_python = dmech.core.get_PeriodicSubDomain(dim, bbox, vertices, pbc_type="python")
+
+	# Boundary vertices, including corners & edges, and interior vertices
+	boundary_vertices = set(dolfin.BoundaryMesh(mesh, "exterior").entity_map(0).array())
+	for k_vertex, x in enumerate(mesh.coordinates()):
+		x = numpy.array(x, dtype=float)
+		on_boundary = k_vertex in boundary_vertices
+		assert sd_cpp.inside(x, on_boundary) == sd_python.inside(x, on_boundary), (
+			"Different inside at x = " + str(x) + ". Aborting."
+		)
+		if on_boundary:
+			y_cpp = numpy.zeros(dim)
+			sd_cpp.map(x, y_cpp)
+			y_python = numpy.zeros(dim)
+			sd_python.map(x, y_python)
+			assert numpy.allclose(y_cpp, y_python), "Different map at x = " + str(x) + ". Aborting."
+
+	# Same constrained function spaces
+	fs_cpp = dolfin.VectorFunctionSpace(mesh, "CG", 1, constrained_domain=sd_cpp)
+	fs_python = dolfin.VectorFunctionSpace(mesh, "CG", 1, constrained_domain=sd_python)
+	assert fs_cpp.dim() == fs_python.dim(), "Different function space dimensions. Aborting."
+	dof_coordinates_cpp = fs_cpp.tabulate_dof_coordinates()
+	dof_coordinates_python = fs_python.tabulate_dof_coordinates()
+	assert numpy.allclose(
+		dof_coordinates_cpp[numpy.lexsort(dof_coordinates_cpp.T)],
+		dof_coordinates_python[numpy.lexsort(dof_coordinates_python.T)],
+	), "Different function space dof coordinates. Aborting."
@@ -0,0 +1,77 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests that the dolfin_mech-precompile command compiles all the forms of a problem, then reported as cached."""
+
+#################################################################### imports ###
+
+import importlib
+import json
+import os
+import subprocess
+import sys
+
+import dolfin
+
+import dolfin_mech as dmech
+
+precompile_module = importlib.import_module("dolfin_mech.core.precompile")
+
+####################################################################### test ###
+
+
+def get_problem(n_cells=1):
+	"""Returns a clamped cube under volume force, with global strain QOIs."""
+	mesh = dolfin.UnitCubeMesh(n_cells, n_cells, n_cells)
+	problem = dmech.problems.Hyperelasticity(
+		mesh=mesh, displacement_degree=1, elastic_behavior={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}}
+	)
+	problem.add_constraint(V=problem.displacement_subsol.fs, sub_domain="near(x[0], 0.)", val=[0.0] * 3)
+	k_step = problem.add_step(Deltat=1.0, dt_ini=1.0, dt_min=1.0)
+	problem.add_volume_force0_loading_operator(
+		measure=problem.dV, F_ini=[0.0] * 3, F_fin=[0.1] + [0.0] * 2, k_step=k_step
+	)
+	problem.add_global_strain_qois()
+	return problem
+
+
+# Worker processes are spawned, and re-import this script
+if __name__ == "__main__":
+	problem_factory = "test_precompile:get_problem"
+	problem_kwargs = {"n_cells": 1}
+
+	names = [name for name, _, _ in precompile_module.get_problem_forms(get_problem(**problem_kwargs))]
+	assert len(names) > 0, "No form collected. Aborting."
+
+	# Forms are split over processes, each form being compiled once
+	report = dmech.core.precompile(problem_factory, problem_kwargs, n_procs=2, verbose=False)
+	assert sorted([name for name, _, _ in report]) == sorted(names), "Wrong compiled forms. Aborting."
+
+	# Once compiled, all forms are found in the cache, which checks the lookup against the FFC & dijitso internals
+	report = dmech.core.precompile(problem_factory, problem_kwargs, n_procs=1, verbose=False)
+	statuses = [status for _, status, _ in report]
+	assert statuses == ["hit"] * len(names), "Wrong cache statuses (" + str(statuses) + "). Aborting."
+
+	# Command line entry point; console scripts do not have the current directory in their path
+	env = dict(os.environ)
+	env["PYTHONPATH"] = os.pathsep.join(
+		[os.path.dirname(os.path.abspath(sys.argv[0]))] + ([env["PYTHONPATH"]] if ("PYTHONPATH" in env) else [])
+	)
+	output = subprocess.run(
+		["dolfin_mech-precompile", problem_factory, "--kwargs", json.dumps(problem_kwargs), "--n_procs", "1"],
+		env=env,
+		check=True,
+		stdout=subprocess.PIPE,
+		universal_newlines=True,
+	).stdout
+	print(output)
+	assert output.splitlines()[-1].startswith(str(len(names)) + " forms: " + str(len(names)) + " hits"), (
+		"Wrong command report. Aborting."
+	)
@@ -0,0 +1,75 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the SolverStatistics step summaries, and their CSV & JSON exports."""
+
+#################################################################### imports ###
+
+import csv
+import json
+import os
+import shutil
+import sys
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+statistics = dmech.core.SolverStatistics()
+for k_step, k_t, n_iter, success in [(1, 1, 3, True), (1, 2, 32, False), (1, 2, 5, True), (2, 1, 4, True)]:
+	for k_iter in range(1, n_iter + 1):
+		statistics.add_iteration(
+			k_step=k_step,
+			k_t=k_t,
+			k_iter=k_iter,
+			assembly_time=0.5,
+			solve_time=0.25,
+			res_norm=float("nan") if (k_iter == 1) else 1.0 / k_iter,
+		)
+	statistics.add_time_step(
+		k_step=k_step,
+		k_t=k_t,
+		t=0.5 * k_t,
+		dt=0.5,
+		n_iter=n_iter,
+		success=success,
+		solver_time=1.0,
+		write_time=0.1,
+	)
+
+summaries = statistics.get_step_summaries()
+assert [summary["k_step"] for summary in summaries] == [1, 2], "Wrong steps. Aborting."
+assert (summaries[0]["n_time_steps"], summaries[0]["n_failed_time_steps"]) == (2, 1), "Wrong time steps. Aborting."
+assert (summaries[0]["n_iter"], summaries[0]["n_iter_failed"]) == (8, 32), "Wrong iterations. Aborting."
+assert summaries[0]["n_iter_per_time_step"] == 4.0, "Wrong iterations per time step. Aborting."
+assert summaries[0]["assembly_time"] == 0.5 * 40, "Wrong assembly time. Aborting."
+assert summaries[1]["solve_time"] == 0.25 * 4, "Wrong solve time. Aborting."
+
+filebasename = res_folder + "/" + "statistics"
+statistics.write(filebasename=filebasename, formats=["csv", "json"])
+
+with open(filebasename + "-time_steps.csv", newline="") as file:
+	rows = list(csv.DictReader(file))
+assert len(rows) == len(statistics.time_steps), "Wrong number of CSV time steps. Aborting."
+assert [int(row["n_iter"]) for row in rows] == [3, 32, 5, 4], "Wrong CSV time steps. Aborting."
+
+with open(filebasename + ".json") as file:
+	tables = json.load(file)
+assert set(tables.keys()) == {"iterations", "time_steps", "steps"}, "Wrong JSON tables. Aborting."
+assert len(tables["iterations"]) == len(statistics.iterations), "Wrong number of JSON iterations. Aborting."
+assert tables["iterations"][0]["res_norm"] is None, "NaN should be exported as null. Aborting."
+assert tables["steps"] == [
+	{key: statistics.get_json_value(value) for key, value in summary.items()} for summary in summaries
+], "Wrong JSON steps. Aborting."
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,106 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the error-based time step controller of the TimeIntegrator."""
+
+#################################################################### imports ###
+
+import json
+import os
+import shutil
+import sys
+import types
+
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def run(dim, integrator_params, step_params={"dt_ini": 0.1, "dt_min": 0.001}):
+	"""Runs a Rivlin cube under surface force, and returns the final displacement and the time steps."""
+	res_basename = res_folder + "/" + "run"
+	displacement, measure = dmech.runs.RivlinCube_Hyperelasticity(
+		dim=dim,
+		cube_params={"mesh_filebasename": res_folder + "/" + "mesh"},
+		mat_params={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+		step_params=step_params,
+		load_params={"type": "surf0"},
+		solver_params={"sol_tol": [1e-8]},
+		integrator_params=integrator_params,
+		integrator_kwargs={
+			"write_statistics": res_basename + "-statistics",
+			"write_statistics_formats": ["json"],
+		},
+		get_results=1,
+		res_basename=res_basename,
+		verbose=0,
+	)
+	with open(res_basename + "-statistics.json") as file:
+		time_steps = json.load(file)["time_steps"]
+	return displacement.vector().get_local(), time_steps
+
+
+# Controller factors, with the default parameters
+integrator = types.SimpleNamespace(error_safety=0.9, error_fac_min=0.2, error_fac_max=5.0, err_old=None)
+get_error_dt_factor = dmech.core.TimeIntegrator.get_error_dt_factor
+assert numpy.isclose(get_error_dt_factor(integrator, 1.0), integrator.error_safety), "Wrong factor. Aborting."
+assert numpy.isclose(get_error_dt_factor(integrator, 1e-12), integrator.error_fac_max), "Wrong factor. Aborting."
+assert numpy.isclose(get_error_dt_factor(integrator, 1e12), integrator.error_fac_min), "Wrong factor. Aborting."
+integrator.err_old = 0.5
+assert numpy.isclose(get_error_dt_factor(integrator, 0.8), integrator.error_safety * 0.8 ** (-0.35) * 0.5**0.2), (
+	"Wrong factor. Aborting."
+)
+assert numpy.isclose(get_error_dt_factor(integrator, 2.0), integrator.error_safety * 2.0 ** (-0.5)), (
+	"Rejected steps should not use the proportional term. Aborting."
+)
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	U_ref, time_steps = run(dim=dim, integrator_params={})
+
+	# Tighter tolerances require more steps, but do not change the converged solution
+	n_steps_lst = []
+	for error_rtol in [1e-2, 1e-4]:
+		print("dim =", dim, "error_rtol =", error_rtol)
+
+		U, time_steps = run(
+			dim=dim, integrator_params={"predictor": "linear", "dt_controller": "error", "error_rtol": error_rtol}
+		)
+		assert numpy.allclose(U, U_ref, rtol=1e-6, atol=1e-6 * numpy.max(numpy.abs(U_ref))), (
+			"Error controller changed the converged solution. Aborting."
+		)
+		n_steps_lst += [len([time_step for time_step in time_steps if time_step["success"]])]
+	assert n_steps_lst[1] > n_steps_lst[0], "Tighter tolerance should require more steps. Aborting."
+
+	# Rejected steps are retried with a smaller dt, and accepted once at dt_min
+	print("dim =", dim, "error_rtol =", 1e-8)
+
+	U, time_steps = run(
+		dim=dim,
+		integrator_params={"dt_controller": "error", "error_rtol": 1e-8, "error_atol": 1e-12},
+		step_params={"dt_ini": 0.2, "dt_min": 0.05},
+	)
+	assert numpy.allclose(U, U_ref, rtol=1e-6, atol=1e-6 * numpy.max(numpy.abs(U_ref))), (
+		"Rejected steps changed the converged solution. Aborting."
+	)
+	rejected_dt_lst = [time_step["dt"] for time_step in time_steps if not (time_step["success"])]
+	accepted_dt_lst = [time_step["dt"] for time_step in time_steps if time_step["success"]]
+	assert len(rejected_dt_lst) > 0, "Steps should have been rejected by the error estimate. Aborting."
+	assert min(rejected_dt_lst) > 0.05 * (1 + 1e-9), "Steps at dt_min should not be rejected. Aborting."
+	assert numpy.allclose(accepted_dt_lst[1:], 0.05), "Steps should be accepted at dt_min. Aborting."
+
+shutil.rmtree(res_folder)
@@ -0,0 +1,71 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests the predictor extrapolation, and that predictors do not change the converged solution."""
+
+#################################################################### imports ###
+
+import os
+import shutil
+import sys
+
+import numpy
+
+import dolfin_mech as dmech
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+# Extrapolation is exact for polynomials of degree (number of states - 1)
+t_lst = [0.1, 0.3, 0.4]
+t = 0.7
+for n_states in [2, 3]:
+	coeffs = numpy.array([[1.0, -2.0], [0.5, 3.0], [-1.0, 2.0]])[:n_states]
+	states = [(t_k, sum([coeff * t_k**k for k, coeff in enumerate(coeffs)])) for t_k in t_lst[-n_states:]]
+	assert numpy.allclose(
+		dmech.core.TimeIntegrator.extrapolate(states, t), sum([coeff * t**k for k, coeff in enumerate(coeffs)])
+	), "Wrong extrapolation. Aborting."
+
+
+# The predictor changes the initial guess of the Newton iterations, not the converged solution
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	U_dict = {}
+	predictor_lst = []
+	predictor_lst += ["none"]
+	predictor_lst += ["linear"]
+	predictor_lst += ["quadratic"]
+	for predictor in predictor_lst:
+		print("dim =", dim, "predictor =", predictor)
+
+		U, _ = dmech.runs.RivlinCube_Hyperelasticity(
+			dim=dim,
+			cube_params={"mesh_filebasename": res_folder + "/" + "mesh"},
+			mat_params={"model": "CGNHMR", "parameters": {"E": 1.0, "nu": 0.3}},
+			step_params={"dt_ini": 0.1, "dt_min": 0.001},
+			load_params={"type": "surf0"},
+			solver_params={"sol_tol": [1e-8]},
+			integrator_params={"predictor": predictor},
+			get_results=1,
+			res_basename=res_folder + "/" + "predictor=" + predictor,
+			verbose=0,
+		)
+		U_dict[predictor] = U.vector().get_local()
+
+		U_ref = U_dict["none"]
+		assert numpy.allclose(U_dict[predictor], U_ref, rtol=1e-6, atol=1e-6 * numpy.max(numpy.abs(U_ref))), (
+			"Predictor changed the converged solution. Aborting."
+		)
+
+shutil.rmtree(res_folder)
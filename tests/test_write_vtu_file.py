@@ -0,0 +1,106 @@
+# coding=utf8
+
+################################################################################
+###                                                                          ###
+### Created by Martin Genet, 2018-2025                                       ###
+###                                                                          ###
+### École Polytechnique, Palaiseau, France                                   ###
+###                                                                          ###
+################################################################################
+
+"""Tests writing CG1, CG2, DG0 & DG1 functions to VTU files with preserved connectivity."""
+
+#################################################################### imports ###
+
+import importlib
+import os
+import shutil
+import sys
+
+import dolfin
+import numpy
+import vtk
+import vtk.util.numpy_support
+
+import dolfin_mech as dmech
+
+mesh2ugrid_module = importlib.import_module("dolfin_mech.core.mesh2ugrid")
+
+####################################################################### test ###
+
+res_folder = sys.argv[0][:-3]
+os.makedirs(res_folder, exist_ok=True)
+
+
+def read_ugrid(filename):
+	"""Reads a VTU file."""
+	reader = vtk.vtkXMLUnstructuredGridReader()
+	reader.SetFileName(filename)
+	reader.Update()
+	return reader.GetOutput()
+
+
+dim_lst = []
+dim_lst += [2]
+dim_lst += [3]
+for dim in dim_lst:
+	print("dim =", dim)
+
+	if dim == 2:
+		mesh = dolfin.UnitSquareMesh(3, 2)
+	elif dim == 3:
+		mesh = dolfin.UnitCubeMesh(2, 1, 2)
+	mesh.init(1)
+
+	U = dolfin.interpolate(
+		dolfin.Expression(["x[0]*x[1]", "x[1]*x[1]", "x[0]*x[0]"][:dim], degree=2),
+		dolfin.VectorFunctionSpace(mesh, "CG", 2),
+	)
+	U.rename("U", "U")
+	P = dolfin.interpolate(dolfin.Expression("1 + x[0]", degree=1), dolfin.FunctionSpace(mesh, "DG", 0))
+	P.rename("P", "P")
+	S = dolfin.interpolate(
+		dolfin.Expression([["x[0]"] * dim] * dim, degree=1), dolfin.TensorFunctionSpace(mesh, "DG", 1)
+	)
+	S.rename("S", "S")
+	fe_q = dolfin.FiniteElement(family="Quadrature", cell=mesh.ufl_cell(), degree=2, quad_scheme="default")
+	Q = dolfin.Function(dolfin.FunctionSpace(mesh, fe_q))
+	Q.rename("Q", "Q")
+
+	functions = [U, P, S, Q]
+	assert [mesh2ugrid_module.is_ugrid_function(function) for function in functions] == [True, True, True, False], (
+		"Wrong VTK convertibility of the functions. Aborting."
+	)
+	functions = [function for function in functions if mesh2ugrid_module.is_ugrid_function(function)]
+
+	filebasename = res_folder + "/" + "sol-dim=" + str(dim)
+	dmech.core.write_VTU_file(filebasename, time=1, preserve_connectivity=True, functions=functions)
+	ugrid = read_ugrid(filebasename + "_001.vtu")
+
+	assert ugrid.GetNumberOfPoints() == mesh.num_vertices() + mesh.num_edges(), "Wrong number of points. Aborting."
+	assert ugrid.GetNumberOfCells() == mesh.num_cells(), "Wrong number of cells. Aborting."
+	assert ugrid.GetCellType(0) == (vtk.VTK_QUADRATIC_TRIANGLE if (dim == 2) else vtk.VTK_QUADRATIC_TETRA), (
+		"Wrong cell type. Aborting."
+	)
+
+	points = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetPoints().GetData())[:, :dim]
+	U_values = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetPointData().GetArray("U"))[:, :dim]
+	assert numpy.allclose(U_values, [U(point) for point in points]), "Wrong U point data. Aborting."
+
+	P_values = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetCellData().GetArray("P"))
+	P_values_ref = [P.vector()[P.function_space().dofmap().cell_dofs(k_cell)[0]] for k_cell in range(mesh.num_cells())]
+	assert numpy.allclose(P_values, P_values_ref), "Wrong P cell data. Aborting."
+
+	S_values = vtk.util.numpy_support.vtk_to_numpy(ugrid.GetCellData().GetArray("S"))
+	S_values_ref = [numpy.mean(mesh.coordinates()[mesh.cells()[k_cell], 0]) for k_cell in range(mesh.num_cells())]
+	assert numpy.allclose(S_values[:, 0], S_values_ref), "Wrong S cell data. Aborting."
+
+	assert ugrid.GetPointData().GetArray("Q") is None, "Q should not be written. Aborting."
+
+	# Without CG2 functions, cells are linear
+	dmech.core.write_VTU_file(filebasename, time=2, preserve_connectivity=True, functions=[P])
+	ugrid = read_ugrid(filebasename + "_002.vtu")
+	assert ugrid.GetNumberOfPoints() == mesh.num_vertices(), "Wrong number of points. Aborting."
+	assert ugrid.GetCellType(0) == (vtk.VTK_TRIANGLE if (dim == 2) else vtk.VTK_TETRA), "Wrong cell type. Aborting."
+
+shutil.rmtree(res_folder)